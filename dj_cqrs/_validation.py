@@ -156,6 +156,7 @@ def _validate_replica(cqrs_settings):
     _validate_replica_max_retries(replica_settings)
     _validate_replica_retry_delay(replica_settings)
     _validate_replica_delay_queue_max_size(replica_settings)
+    _validate_replica_shard_router(replica_settings)
 
 
 def _validate_replica_max_retries(replica_settings):
@@ -209,3 +210,20 @@ def _validate_replica_delay_queue_max_size(replica_settings):
         max_qsize = DEFAULT_REPLICA_DELAY_QUEUE_MAX_SIZE
 
     replica_settings['delay_queue_max_size'] = max_qsize
+
+
+def _validate_replica_shard_router(replica_settings):
+    shard_router = replica_settings.get('CQRS_SHARD_ROUTER')
+    if not shard_router:
+        return
+
+    if isinstance(shard_router, str):
+        try:
+            shard_router = import_string(shard_router)
+        except ImportError:
+            raise AssertionError('CQRS replica CQRS_SHARD_ROUTER import error.')
+
+    if not callable(shard_router):
+        raise AssertionError('CQRS replica CQRS_SHARD_ROUTER must be callable.')
+
+    replica_settings['CQRS_SHARD_ROUTER'] = shard_router
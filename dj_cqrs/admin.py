@@ -41,7 +41,7 @@ class CQRSAdminMasterSyncMixin:
         """
         items_not_synced = []
         for item in self._cqrs_sync_queryset(queryset):
-            if not item.cqrs_sync():
+            if not item.cqrs_sync(refresh=False):
                 items_not_synced.append(item)
 
         total = len(queryset)
@@ -0,0 +1,282 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+
+from dj_cqrs.utils import get_read_cache_settings, get_revision_cache_size
+
+
+class RevisionCache:
+    """Bounded LRU of the last applied CQRS revisions of replica instances.
+
+    :param max_size: Maximum number of cached instance revisions.
+    :type max_size: int
+    """
+
+    def __init__(self, max_size):
+        assert max_size > 0, 'Revision cache max_size should be positive integer.'
+
+        self.max_size = max_size
+        self._revisions = OrderedDict()
+
+    def get(self, cqrs_id, pk):
+        """Returns last applied revision of the instance.
+
+        :param str cqrs_id: Replica model CQRS unique identifier.
+        :param pk: Primary key of the instance.
+        :return: Revision or None if it's unknown.
+        :rtype: int or None
+        """
+        key = (cqrs_id, pk)
+        revision = self._revisions.get(key)
+        if revision is not None:
+            self._revisions.move_to_end(key)
+
+        return revision
+
+    def set(self, cqrs_id, pk, revision):
+        """Saves last applied revision of the instance.
+
+        :param str cqrs_id: Replica model CQRS unique identifier.
+        :param pk: Primary key of the instance.
+        :param int revision: Applied revision.
+        """
+        key = (cqrs_id, pk)
+        self._revisions[key] = revision
+        self._revisions.move_to_end(key)
+
+        if len(self._revisions) > self.max_size:
+            self._revisions.popitem(last=False)
+
+    def invalidate(self, cqrs_id, pk):
+        """Removes instance revision from the cache.
+
+        :param str cqrs_id: Replica model CQRS unique identifier.
+        :param pk: Primary key of the instance.
+        """
+        self._revisions.pop((cqrs_id, pk), None)
+
+    def clear(self):
+        self._revisions.clear()
+
+    def __len__(self):
+        return len(self._revisions)
+
+
+_revision_cache = None
+
+
+def get_revision_cache():
+    """Returns process revision cache for replica instances.
+
+    :return: Revision cache or None if it's disabled.
+    :rtype: RevisionCache or None
+    """
+    global _revision_cache
+
+    max_size = get_revision_cache_size()
+    if not max_size:
+        return None
+
+    if _revision_cache is None or _revision_cache.max_size != max_size:
+        _revision_cache = RevisionCache(max_size)
+
+    return _revision_cache
+
+
+def _is_newer(cached_revision, revision):
+    # Revision of a deleted instance is None, it's newer than any revision
+    return cached_revision is None or cached_revision > revision
+
+
+class LocalReadCache:
+    """Process-local bounded LRU of replica instances with TTL.
+
+    Entries keep revisions of instances, and invalidated entries keep applied revisions,
+    so that instances, that were selected before the invalidation, are not cached again.
+
+    :param max_size: Maximum number of cached entries.
+    :type max_size: int
+    :param ttl: Seconds, during which cached instance can be used.
+    :type ttl: int
+    """
+
+    def __init__(self, max_size, ttl):
+        assert max_size > 0, 'Read cache max_size should be positive integer.'
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._instances = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, cqrs_id, pks):
+        """Returns cached instances.
+
+        :param str cqrs_id: Replica model CQRS unique identifier.
+        :param pks: Primary keys of the instances.
+        :return: Mapping of primary keys to cached instances.
+        :rtype: dict
+        """
+        now = time.monotonic()
+        instances = {}
+        with self._lock:
+            for pk in pks:
+                key = (cqrs_id, pk)
+                cached = self._instances.get(key)
+                if cached is None:
+                    continue
+
+                expires_at, _, instance = cached
+                if expires_at <= now:
+                    del self._instances[key]
+                    continue
+
+                if instance is not None:
+                    self._instances.move_to_end(key)
+                    instances[pk] = instance
+
+        return instances
+
+    def set_many(self, cqrs_id, instances):
+        """Caches instances, if their newer revisions are not applied yet.
+
+        :param str cqrs_id: Replica model CQRS unique identifier.
+        :param dict instances: Mapping of primary keys to instances.
+        """
+        now = time.monotonic()
+        expires_at = now + self.ttl
+        with self._lock:
+            for pk, instance in instances.items():
+                key = (cqrs_id, pk)
+                cached = self._instances.get(key)
+                if (
+                    cached is not None
+                    and cached[0] > now
+                    and _is_newer(cached[1], instance.cqrs_revision)
+                ):
+                    continue
+
+                self._instances[key] = (expires_at, instance.cqrs_revision, instance)
+                self._instances.move_to_end(key)
+
+            self._evict()
+
+    def invalidate_many(self, cqrs_id, revisions):
+        """Invalidates cached instances and keeps their applied revisions.
+
+        :param str cqrs_id: Replica model CQRS unique identifier.
+        :param dict revisions: Mapping of primary keys to applied revisions (None for deleted
+            instances).
+        """
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for pk, revision in revisions.items():
+                key = (cqrs_id, pk)
+                self._instances[key] = (expires_at, revision, None)
+                self._instances.move_to_end(key)
+
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._instances.clear()
+
+    def _evict(self):
+        while len(self._instances) > self.max_size:
+            self._instances.popitem(last=False)
+
+    def __len__(self):
+        return len(self._instances)
+
+
+class BackendReadCache:
+    """Read cache of replica instances, that is stored in the Django cache backend and can be
+    shared by all processes.
+
+    Entries keep revisions of instances, and invalidated entries keep applied revisions,
+    so that instances, that were selected before the invalidation, are not cached again.
+
+    :param alias: Django cache alias.
+    :type alias: str
+    :param ttl: Seconds, during which cached instance can be used.
+    :type ttl: int
+    """
+
+    KEY_PREFIX = 'cqrs_read'
+
+    def __init__(self, alias, ttl):
+        self.alias = alias
+        self.ttl = ttl
+
+    def get_many(self, cqrs_id, pks):
+        keys = {self._make_key(cqrs_id, pk): pk for pk in pks}
+        cached = caches[self.alias].get_many(list(keys))
+        return {
+            keys[key]: instance for key, (_, instance) in cached.items() if instance is not None
+        }
+
+    def set_many(self, cqrs_id, instances):
+        cache = caches[self.alias]
+        keys = {self._make_key(cqrs_id, pk): instance for pk, instance in instances.items()}
+        cached = cache.get_many(list(keys))
+
+        to_set = {}
+        for key, instance in keys.items():
+            value = (instance.cqrs_revision, instance)
+            if key not in cached:
+                # Invalidation can happen concurrently, so it's not overwritten
+                cache.add(key, value, timeout=self.ttl)
+            elif not _is_newer(cached[key][0], instance.cqrs_revision):
+                to_set[key] = value
+
+        if to_set:
+            cache.set_many(to_set, timeout=self.ttl)
+
+    def invalidate_many(self, cqrs_id, revisions):
+        caches[self.alias].set_many(
+            {
+                self._make_key(cqrs_id, pk): (revision, None)
+                for pk, revision in revisions.items()
+            },
+            timeout=self.ttl,
+        )
+
+    def clear(self):
+        caches[self.alias].clear()
+
+    def _make_key(self, cqrs_id, pk):
+        return '{0}:{1}:{2}'.format(self.KEY_PREFIX, cqrs_id, pk)
+
+
+_read_cache = None
+
+
+def get_read_cache():
+    """Returns read cache for replica instances.
+
+    :return: Read cache or None if it's disabled.
+    :rtype: LocalReadCache or BackendReadCache or None
+    """
+    global _read_cache
+
+    max_size, ttl, backend = get_read_cache_settings()
+    if not (max_size or backend):
+        return None
+
+    if backend:
+        if not (
+            isinstance(_read_cache, BackendReadCache)
+            and (_read_cache.alias, _read_cache.ttl) == (backend, ttl)
+        ):
+            _read_cache = BackendReadCache(backend, ttl)
+
+    elif not (
+        isinstance(_read_cache, LocalReadCache)
+        and (_read_cache.max_size, _read_cache.ttl) == (max_size, ttl)
+    ):
+        _read_cache = LocalReadCache(max_size, ttl)
+
+    return _read_cache
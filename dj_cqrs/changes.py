@@ -0,0 +1,58 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+import logging
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.dispatch import Signal
+
+from dj_cqrs.state import cqrs_state
+
+
+logger = logging.getLogger('django-cqrs')
+
+post_cqrs_apply = Signal()
+"""
+Signal sent by the replica consumer once for all changes, that were applied and committed
+while consuming a batch of packages. Receivers get `changes` keyword argument with the list of
+dj_cqrs.dataclasses.ReplicaChange. It's also available as dj_cqrs.signals.post_cqrs_apply.
+"""
+
+
+@contextmanager
+def collecting_applied_changes():
+    """Collects replica changes, that are applied within the context, and sends
+    `post_cqrs_apply` signal once for all of them. Nested contexts are merged into the outer one.
+    """
+    if getattr(cqrs_state, 'applied_changes', None) is not None:
+        yield
+        return
+
+    if not post_cqrs_apply.has_listeners():
+        yield
+        return
+
+    changes = cqrs_state.applied_changes = []
+    try:
+        yield
+    finally:
+        cqrs_state.applied_changes = None
+        if changes:
+            for receiver, response in post_cqrs_apply.send_robust(sender=None, changes=changes):
+                if isinstance(response, Exception):
+                    logger.error(
+                        'CQRS post apply receiver {0} error.'.format(receiver),
+                        exc_info=response,
+                    )
+
+
+def record_applied_change(change, using=None):
+    """Records replica change, if changes are collected. Changes are recorded only after
+    the transaction is committed.
+
+    :param dj_cqrs.dataclasses.ReplicaChange change: Applied change.
+    :param str using: DB alias of the transaction, that applies the change.
+    """
+    changes = getattr(cqrs_state, 'applied_changes', None)
+    if changes is not None:
+        transaction.on_commit(lambda: changes.append(change), using=using)
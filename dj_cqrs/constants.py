@@ -18,21 +18,43 @@ class SignalType:
     SYNC = 'SYNC'
     """The master model needs syncronization."""
 
+    RESYNC = 'RESYNC'
+    """The replica requests synchronization of the master model instances."""
+
 
 NO_QUEUE = 'None'
 
+RESYNC_ROUTING_KEY_PREFIX = 'cqrs_resync'
+
 DEFAULT_DEAD_MESSAGE_TTL = 864000  # 10 days
 
 DEFAULT_MASTER_AUTO_UPDATE_FIELDS = False
 DEFAULT_MASTER_MESSAGE_TTL = 86400  # 1 day
+DEFAULT_MASTER_RESYNC_WINDOW = 5  # seconds
+DEFAULT_MASTER_CHURN_STATS_SIZE = 0  # disabled
+MASTER_BULK_SERIALIZATION_BATCH = 1000
 
 DEFAULT_REPLICA_MAX_RETRIES = 30
 DEFAULT_REPLICA_RETRY_DELAY = 2  # seconds
 DEFAULT_REPLICA_DELAY_QUEUE_MAX_SIZE = 1000
+DEFAULT_REPLICA_REVISION_CACHE_SIZE = 0  # disabled
+DEFAULT_REPLICA_CONNECTION_CHECK_INTERVAL = 10  # seconds
+DEFAULT_REPLICA_CONNECTION_CHECK_MESSAGES = 100
+DEFAULT_REPLICA_REORDER_WINDOW = 0  # seconds, disabled
+DEFAULT_REPLICA_REORDER_BUFFER_SIZE = 100
+DEFAULT_REPLICA_RESYNC_WINDOW = 0  # seconds, disabled
+DEFAULT_REPLICA_ASYNC_CONCURRENCY = 10
+DEFAULT_REPLICA_READ_CACHE_SIZE = 0  # disabled
+DEFAULT_REPLICA_READ_CACHE_TTL = 60  # seconds
+DEFAULT_REPLICA_PREFETCH_TIME_BUDGET = 0  # static prefetch
 
 DB_VENDOR_PG = 'postgresql'
 DB_VENDOR_MYSQL = 'mysql'
+DB_VENDOR_SQLITE = 'sqlite'
 SUPPORTED_TIMEOUT_DB_VENDORS = {DB_VENDOR_MYSQL, DB_VENDOR_PG}
 
+# UPDATE ... RETURNING is available since SQLite 3.35, MariaDB doesn't support it for updates
+SQLITE_UPDATE_RETURNING_VERSION = (3, 35)
+
 PG_TIMEOUT_FLAG = 'statement timeout'
 MYSQL_TIMEOUT_ERROR_CODE = 3024
@@ -1,16 +1,22 @@
 #  Copyright © 2025 CloudBlue. All rights reserved.
 
+import asyncio
 import copy
+import inspect
 import logging
 from contextlib import ExitStack
 
 from django.conf import settings
-from django.db import Error, close_old_connections, transaction
+from django.db import Error, router, transaction
 
+from dj_cqrs.changes import collecting_applied_changes
 from dj_cqrs.constants import SignalType
 from dj_cqrs.logger import log_timed_out_queries
+from dj_cqrs.projections import collecting_projection_deltas
 from dj_cqrs.registries import ReplicaRegistry
-from dj_cqrs.utils import apply_query_timeouts
+from dj_cqrs.sharding import get_shard, group_by_shard, using_shard
+from dj_cqrs.state import cqrs_state
+from dj_cqrs.utils import apply_query_timeouts, connections_health_check, get_async_concurrency
 
 
 logger = logging.getLogger('django-cqrs')
@@ -19,9 +25,75 @@ logger = logging.getLogger('django-cqrs')
 def consume(payload):
     """Consumer controller.
 
+    Coroutine handlers of replica models are awaited on the worker event loop.
+
     :param dj_cqrs.dataclasses.TransportPayload payload: Consumed payload from master service.
     """
-    payload = copy.deepcopy(payload)
+    with collecting_applied_changes():
+        result = _route_payload(payload)
+
+    if inspect.isawaitable(result):
+        return _get_event_loop().run_until_complete(result)
+
+    return result
+
+
+def is_concurrently_consumable(cqrs_id, signal_type):
+    """Checks if signals for the replica model are consumed by coroutine handlers, that can be
+    run concurrently.
+
+    :param str cqrs_id: Replica model CQRS unique identifier.
+    :param dj_cqrs.constants.SignalType signal_type: Consumed signal type.
+    :rtype: bool
+    """
+    model_cls = ReplicaRegistry.get_model_by_cqrs_id(cqrs_id)
+    if not (model_cls and model_cls.CQRS_NO_DB_OPERATIONS):
+        return False
+
+    if signal_type == SignalType.DELETE:
+        return inspect.iscoroutinefunction(model_cls.cqrs_delete)
+
+    if signal_type in (SignalType.SAVE, SignalType.SYNC):
+        return inspect.iscoroutinefunction(model_cls.cqrs_save)
+
+    return False
+
+
+def consume_concurrently(payloads):
+    """Consumer controller for signals of replica models with coroutine handlers.
+
+    Handlers are run concurrently on the worker event loop within the configured limit.
+    Payloads must belong to different instances.
+
+    :param list payloads: Consumed payloads from master service.
+    :return: Result per payload: handler result on success or exception on failure.
+    :rtype: list
+    """
+    semaphore = asyncio.Semaphore(get_async_concurrency())
+
+    async def consume_payload(payload):
+        async with semaphore:
+            try:
+                result = _route_payload(payload)
+                if inspect.isawaitable(result):
+                    result = await result
+
+                return result
+            except Exception as e:
+                logger.error('CQRS service exception', exc_info=True)
+                return e
+
+    async def consume_payloads():
+        return await asyncio.gather(*(consume_payload(payload) for payload in payloads))
+
+    return _get_event_loop().run_until_complete(consume_payloads())
+
+
+def _route_payload(payload):
+    model_cls = ReplicaRegistry.get_model_by_cqrs_id(payload.cqrs_id)
+    if getattr(model_cls, 'CQRS_COPY_PAYLOAD', True):
+        payload = copy.deepcopy(payload)
+
     return route_signal_to_replica_model(
         payload.signal_type,
         payload.cqrs_id,
@@ -29,9 +101,176 @@ def consume(payload):
         previous_data=payload.previous_data,
         meta=payload.meta,
         queue=payload.queue,
+        pk=payload.pk,
+    )
+
+
+def _get_event_loop():
+    loop = getattr(cqrs_state, 'event_loop', None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        cqrs_state.event_loop = loop
+
+    return loop
+
+
+def is_batch_deletable(cqrs_id):
+    """Checks if DELETE signals for the replica model can be consumed in batches.
+
+    :param str cqrs_id: Replica model CQRS unique identifier.
+    :rtype: bool
+    """
+    from dj_cqrs.mixins import ReplicaMixin
+
+    model_cls = ReplicaRegistry.get_model_by_cqrs_id(cqrs_id)
+    return bool(
+        model_cls
+        and issubclass(model_cls, ReplicaMixin)
+        and (not model_cls.CQRS_NO_DB_OPERATIONS)
+        and model_cls.cqrs_delete.__func__ is ReplicaMixin.cqrs_delete.__func__,
+    )
+
+
+def consume_deletes(payloads):
+    """Consumer controller for a batch of DELETE signals of the same replica model.
+
+    Instances are deleted in a separate transaction per shard.
+
+    :param list payloads: Consumed DELETE payloads from master service.
+    :return: Flag, if all replica instances are deleted.
+    :rtype: bool
+    """
+    model_cls = ReplicaRegistry.get_model_by_cqrs_id(payloads[0].cqrs_id)
+    connections_health_check.check()
+
+    shards = group_by_shard(model_cls.CQRS_ID, [payload.pk for payload in payloads])
+    with collecting_applied_changes():
+        results = [
+            _delete_shard_instances(model_cls, shard, [payloads[index] for index in indexes])
+            for shard, indexes in shards.items()
+        ]
+
+    return all(results)
+
+
+def _delete_shard_instances(model_cls, shard, payloads):
+    with using_shard(shard):
+        try:
+            apply_query_timeouts(model_cls)
+
+            with (
+                transaction.atomic(using=router.db_for_write(model_cls), savepoint=False),
+                collecting_projection_deltas(),
+            ):
+                return model_cls.cqrs.delete_instances(
+                    [payload.instance_data for payload in payloads],
+                )
+
+        except Error as e:
+            logger.error(
+                '{0}\nCQRS {1} error: pks = {2} ({3}).'.format(
+                    str(e),
+                    SignalType.DELETE,
+                    [payload.pk for payload in payloads],
+                    model_cls.CQRS_ID,
+                ),
+            )
+
+            log_timed_out_queries(e, model_cls)
+            connections_health_check.invalidate()
+
+        except Exception:
+            logger.error(
+                'CQRS {0} batch error: pks = {1} ({2}).'.format(
+                    SignalType.DELETE,
+                    [payload.pk for payload in payloads],
+                    model_cls.CQRS_ID,
+                ),
+                exc_info=True,
+            )
+
+    return False
+
+
+def is_batch_consumable(cqrs_id, signal_type):
+    """Checks if signals for the replica model can be consumed by its batch handlers.
+
+    :param str cqrs_id: Replica model CQRS unique identifier.
+    :param dj_cqrs.constants.SignalType signal_type: Consumed signal type.
+    :rtype: bool
+    """
+    from dj_cqrs.mixins import RawReplicaMixin
+
+    model_cls = ReplicaRegistry.get_model_by_cqrs_id(cqrs_id)
+    if not (model_cls and model_cls.CQRS_NO_DB_OPERATIONS):
+        return False
+
+    if signal_type == SignalType.DELETE:
+        handler_name = 'cqrs_delete_batch'
+    elif signal_type in (SignalType.SAVE, SignalType.SYNC):
+        handler_name = 'cqrs_save_batch'
+    else:
+        return False
+
+    return (
+        getattr(model_cls, handler_name).__func__
+        is not getattr(RawReplicaMixin, handler_name).__func__
     )
 
 
+def consume_batch(payloads):
+    """Consumer controller for a batch of signals of the same replica model with batch handlers.
+
+    All payloads must be either DELETE or SAVE/SYNC signals.
+
+    :param list payloads: Consumed payloads from master service.
+    :return: Result per payload: truthy value on success, falsy value or exception on failure.
+    :rtype: list
+    """
+    model_cls = ReplicaRegistry.get_model_by_cqrs_id(payloads[0].cqrs_id)
+    if model_cls.CQRS_COPY_PAYLOAD:
+        payloads = copy.deepcopy(payloads)
+
+    results = [None] * len(payloads)
+    indexes, items = [], []
+    for index, payload in enumerate(payloads):
+        if (
+            payload.signal_type == SignalType.SYNC
+            and model_cls.CQRS_ONLY_DIRECT_SYNCS
+            and payload.queue != settings.CQRS['queue']
+        ):
+            results[index] = True
+        else:
+            indexes.append(index)
+            items.append(payload)
+
+    if not items:
+        return results
+
+    if items[0].signal_type == SignalType.DELETE:
+        handler = model_cls.cqrs_delete_batch
+    else:
+        handler = model_cls.cqrs_save_batch
+
+    try:
+        items_results = handler(items)
+        assert len(items_results) == len(items), 'Batch handler must return result per item.'
+    except Exception as e:
+        logger.error(
+            'CQRS batch error: pks = {0} ({1}).'.format(
+                [payload.pk for payload in items],
+                model_cls.CQRS_ID,
+            ),
+            exc_info=True,
+        )
+        items_results = [e] * len(items)
+
+    for index, result in zip(indexes, items_results):
+        results[index] = result
+
+    return results
+
+
 def route_signal_to_replica_model(
     signal_type,
     cqrs_id,
@@ -39,6 +278,7 @@ def route_signal_to_replica_model(
     previous_data=None,
     meta=None,
     queue=None,
+    pk=None,
 ):
     """Routes signal to model method to create/update/delete replica instance.
 
@@ -48,6 +288,7 @@ def route_signal_to_replica_model(
     :param dict or None previous_data: Previous model data for changed tracked fields, if exists.
     :param dict or None meta: Payload metadata, if exists.
     :param str or None queue: Synced queue.
+    :param pk: Primary key of the master instance, it's taken from the data, if it's not set.
     """
     if signal_type not in (SignalType.DELETE, SignalType.SAVE, SignalType.SYNC):
         logger.error('Bad signal type "{0}" for CQRS_ID "{1}".'.format(signal_type, cqrs_id))
@@ -57,20 +298,33 @@ def route_signal_to_replica_model(
     if not model_cls:
         return
 
-    this_queue = settings.CQRS['queue']
-    if signal_type == SignalType.SYNC and model_cls.CQRS_ONLY_DIRECT_SYNCS and queue != this_queue:
+    if (
+        signal_type == SignalType.SYNC
+        and model_cls.CQRS_ONLY_DIRECT_SYNCS
+        and queue != settings.CQRS['queue']
+    ):
         return True
 
+    shard = None
     db_is_needed = not model_cls.CQRS_NO_DB_OPERATIONS
     if db_is_needed:
-        close_old_connections()
+        if pk is None:
+            pk = instance_data.get(getattr(model_cls._meta.pk, 'name', 'id'))
+
+        shard = get_shard(cqrs_id, pk)
+        connections_health_check.check()
 
     is_meta_supported = model_cls.CQRS_META
     try:
-        if db_is_needed:
-            apply_query_timeouts(model_cls)
+        with ExitStack() as stack:
+            if db_is_needed:
+                stack.enter_context(using_shard(shard))
+                apply_query_timeouts(model_cls)
+                stack.enter_context(
+                    transaction.atomic(using=router.db_for_write(model_cls), savepoint=False),
+                )
+                stack.enter_context(collecting_projection_deltas())
 
-        with transaction.atomic(savepoint=False) if db_is_needed else ExitStack():
             if signal_type == SignalType.DELETE:
                 if is_meta_supported:
                     return model_cls.cqrs_delete(instance_data, meta=meta)
@@ -103,4 +357,6 @@ def route_signal_to_replica_model(
             ),
         )
 
-        log_timed_out_queries(e, model_cls)
+        with using_shard(shard):
+            log_timed_out_queries(e, model_cls)
+        connections_health_check.invalidate()
@@ -9,3 +9,11 @@ def produce(payload):
     :param dj_cqrs.dataclasses.TransportPayload payload: TransportPayload.
     """
     current_transport.produce(payload)
+
+
+def produce_batch(payloads):
+    """Producer controller for a batch of payloads.
+
+    :param list payloads: TransportPayloads.
+    """
+    current_transport.produce_batch(payloads)
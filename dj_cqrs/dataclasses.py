@@ -1,5 +1,13 @@
 #  Copyright © 2025 CloudBlue. All rights reserved.
 
+from datetime import datetime
+from typing import (
+    Any,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
 from dateutil.parser import parse as dateutil_parse
 from django.utils import timezone
 
@@ -7,6 +15,14 @@ from dj_cqrs.correlation import get_correlation_id
 from dj_cqrs.utils import get_json_valid_value, get_message_expiration_dt
 
 
+def _parse_expires(value):
+    # Expiration is always serialized in ISO-8601 format, so dateutil is only a fallback
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return dateutil_parse(value)
+
+
 class TransportPayload:
     """Transport message payload.
 
@@ -25,6 +41,22 @@ class TransportPayload:
         meta (dict): Payload metadata
     """
 
+    __slots__ = (
+        '__signal_type',
+        '__cqrs_id',
+        '__instance_data',
+        '__instance_pk',
+        '__queue',
+        '__previous_data',
+        '__meta',
+        '__correlation_id',
+        '__expires',
+        '__retries',
+        # Routing flags, that are set by transports for dead letter and requeued messages
+        'is_dead_letter',
+        'is_requeue',
+    )
+
     def __init__(
         self,
         signal_type,
@@ -66,8 +98,8 @@ class TransportPayload:
         """
         if 'expires' in dct:
             expires = dct['expires']
-            if dct['expires'] is not None:
-                expires = dateutil_parse(dct['expires'])
+            if expires is not None:
+                expires = _parse_expires(expires)
         else:
             # Backward compatibility for old messages otherwise they are infinite by default.
             expires = get_message_expiration_dt()
@@ -158,3 +190,47 @@ class TransportPayload:
             (bool): True if payload is expired, False otherwise.
         """
         return self.__expires is not None and self.__expires <= timezone.now()
+
+
+class ReplicaChange(NamedTuple):
+    """Change of the replica instance, that was applied by the consumer.
+
+    Args:
+        cqrs_id (str): The unique CQRS identifier of the replica model.
+        pk: Primary key of the instance.
+        old_revision (int): Revision of the instance before the change or None, if the instance
+            was created or it's unknown.
+        new_revision (int): Applied revision of the instance.
+        signal_type (dj_cqrs.constants.SignalType): Type of the applied signal.
+        changed_fields (tuple): Names of tracked fields, that were changed on master, or None,
+            if previous data isn't available.
+    """
+
+    cqrs_id: str
+    pk: Any
+    old_revision: Optional[int]
+    new_revision: int
+    signal_type: str
+    changed_fields: Optional[Tuple[str, ...]] = None
+
+
+class ProjectionDelta(NamedTuple):
+    """Change of the replica instance, that is passed to projections.
+
+    Args:
+        cqrs_id (str): The unique CQRS identifier of the replica model.
+        pk: Primary key of the instance.
+        signal_type (dj_cqrs.constants.SignalType): Type of the applied signal.
+        old_data (dict): Field values of the instance before the change or None, if the instance
+            was created.
+        new_data (dict): Field values of the instance after the change or None, if the instance
+            was deleted.
+        previous_data (dict): Previous mapped values for tracked fields from master, if exist.
+    """
+
+    cqrs_id: str
+    pk: Any
+    signal_type: str
+    old_data: Optional[dict]
+    new_data: Optional[dict]
+    previous_data: Optional[dict] = None
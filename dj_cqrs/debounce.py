@@ -0,0 +1,188 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+import atexit
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from dj_cqrs import metrics
+from dj_cqrs.controller import producer
+from dj_cqrs.utils import get_churn_stats_size
+
+
+logger = logging.getLogger('django-cqrs')
+
+
+class DebounceBuffer:
+    """Payloads of master instances, that are published not more often, than once
+    per the debounce window of their model.
+
+    The first change of an instance opens the window, later changes within the window replace
+    its payload, so only the latest revision is published when the window is passed.
+    Due payloads are published by a background timer in batches.
+    """
+
+    def __init__(self):
+        self._payloads = OrderedDict()
+        self._lock = threading.Lock()
+        self._timer = None
+        self._timer_due_at = None
+
+    def add(self, payload, window):
+        """
+        :param dj_cqrs.dataclasses.TransportPayload payload: Master payload.
+        :param float window: Debounce window in seconds.
+        """
+        key = (payload.cqrs_id, payload.pk, payload.queue)
+        with self._lock:
+            entry = self._payloads.get(key)
+            if entry is None:
+                due_at = time.monotonic() + window
+            else:
+                due_at = entry[1]
+                metrics.increment(metrics.MASTER_DEBOUNCED_CHANGES)
+
+            self._payloads[key] = (payload, due_at)
+            self._schedule()
+
+    def discard(self, cqrs_id, pk):
+        """Drops debounced payloads of the instance, f.e. when it's deleted.
+
+        :param str cqrs_id: Master model CQRS unique identifier.
+        :param pk: Primary key of the instance.
+        """
+        if not self._payloads:
+            return
+
+        with self._lock:
+            for key in [key for key in self._payloads if key[:2] == (cqrs_id, pk)]:
+                del self._payloads[key]
+                metrics.increment(metrics.MASTER_DEBOUNCED_CHANGES)
+
+    def pop_due(self, force=False):
+        """Returns and removes payloads, which debounce window is passed.
+
+        :param bool force: Flag, if all payloads are returned regardless of their windows.
+        :rtype: list
+        """
+        now = time.monotonic()
+        with self._lock:
+            due_keys = [
+                key for key, (_, due_at) in self._payloads.items() if force or due_at <= now
+            ]
+            return [self._payloads.pop(key)[0] for key in due_keys]
+
+    def flush(self, force=False):
+        """Publishes due payloads in a single batch.
+
+        :param bool force: Flag, if all payloads are published regardless of their windows.
+        :return: Number of published payloads.
+        :rtype: int
+        """
+        payloads = self.pop_due(force=force)
+        if payloads:
+            producer.produce_batch(payloads)
+
+        return len(payloads)
+
+    def _schedule(self):
+        if not self._payloads:
+            return
+
+        due_at = min(due_at for _, due_at in self._payloads.values())
+        if self._timer is not None:
+            if self._timer_due_at <= due_at:
+                return
+
+            # Windows differ per model, so the timer is moved to the earliest one
+            self._timer.cancel()
+
+        self._timer = threading.Timer(max(due_at - time.monotonic(), 0), self._on_timer)
+        self._timer.daemon = True
+        self._timer_due_at = due_at
+        self._timer.start()
+
+    def _on_timer(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error('CQRS debounced payloads publishing failed: {0}.'.format(e))
+        finally:
+            with self._lock:
+                if self._timer is threading.current_thread():
+                    self._timer = None
+                    self._schedule()
+
+    def __len__(self):
+        return len(self._payloads)
+
+
+debounce_buffer = DebounceBuffer()
+atexit.register(debounce_buffer.flush, force=True)
+
+
+class ChurnStats:
+    """Approximate numbers of published changes of the most frequently changed master instances.
+
+    Every CQRS ID tracks not more, than the configured number of instances. When it's full,
+    the least changed instance is replaced (Space-Saving algorithm), so the most changed
+    instances are kept with overestimated counts.
+    """
+
+    def __init__(self):
+        self._counts = {}
+        self._started_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, cqrs_id, pk):
+        """
+        :param str cqrs_id: Master model CQRS unique identifier.
+        :param pk: Primary key of the instance.
+        """
+        size = get_churn_stats_size()
+        if not size:
+            return
+
+        with self._lock:
+            counts = self._counts.setdefault(cqrs_id, {})
+            if pk in counts or len(counts) < size:
+                counts[pk] = counts.get(pk, 0) + 1
+                return
+
+            min_pk = min(counts, key=counts.get)
+            counts[pk] = counts.pop(min_pk) + 1
+
+    def get_top(self, cqrs_id, limit=10):
+        """Returns the most frequently changed instances of the model.
+
+        :param str cqrs_id: Master model CQRS unique identifier.
+        :param int limit: Max number of returned instances.
+        :return: Primary keys, numbers of changes and changes per minute in descending order.
+        :rtype: list[tuple]
+        """
+        with self._lock:
+            counts = dict(self._counts.get(cqrs_id, {}))
+            elapsed = max(time.monotonic() - self._started_at, 1)
+
+        top = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(pk, count, 60 * count / elapsed) for pk, count in top]
+
+    def get_stats(self, limit=10):
+        """
+        :param int limit: Max number of returned instances per CQRS ID.
+        :return: Mapping of CQRS IDs to their most frequently changed instances.
+        :rtype: dict
+        """
+        with self._lock:
+            cqrs_ids = list(self._counts)
+
+        return {cqrs_id: self.get_top(cqrs_id, limit=limit) for cqrs_id in cqrs_ids}
+
+    def reset(self):
+        with self._lock:
+            self._counts = {}
+            self._started_at = time.monotonic()
+
+
+churn_stats = ChurnStats()
@@ -1,5 +1,7 @@
 #  Copyright © 2025 CloudBlue. All rights reserved.
 
+import heapq
+from collections import defaultdict
 from queue import Full, PriorityQueue
 
 from django.utils import timezone
@@ -22,15 +24,156 @@ class DelayMessage:
         self.eta = eta
 
 
+class ParkingLot:
+    """Messages, that are parked behind the delayed message for the same instance.
+
+    Instances are identified by (cqrs_id, pk) keys. While the failed message for the key is
+    delayed, later messages for this key are parked instead of being consumed.
+    """
+
+    def __init__(self):
+        self._blocks = {}
+        self._parked = defaultdict(list)
+        self._dependants = defaultdict(set)
+
+    def block(self, key, delivery_tag, dependencies=()):
+        """Blocks consuming of messages for the key by the delayed message.
+
+        :param tuple key: (cqrs_id, pk) key of the instance.
+        :param int delivery_tag: Delivery tag of the delayed message.
+        :param dependencies: (cqrs_id, pk) keys of instances, that the message waits for.
+        :type dependencies: typing.Iterable[tuple]
+        """
+        dependencies = tuple(dependencies)
+        self._blocks[key] = (delivery_tag, dependencies)
+        for dependency in dependencies:
+            self._dependants[dependency].add(key)
+
+    def is_blocked(self, key):
+        """
+        :param tuple key: (cqrs_id, pk) key of the instance.
+        :rtype: bool
+        """
+        return key in self._blocks
+
+    def park(self, key, delivery_tag, payload):
+        """Parks message behind the delayed message for the same key.
+
+        :param tuple key: (cqrs_id, pk) key of the instance.
+        :param int delivery_tag: Delivery tag of the parked message.
+        :param dj_cqrs.dataclasses.TransportPayload payload: Transport payload.
+        """
+        assert self.is_blocked(key), 'Messages can be parked only for blocked keys.'
+        self._parked[key].append((delivery_tag, payload))
+
+    def unblock(self, key, delivery_tag):
+        """Removes the block, if it was set by the message, and returns parked messages.
+
+        :param tuple key: (cqrs_id, pk) key of the instance.
+        :param int delivery_tag: Delivery tag of the delayed message.
+        :return: (delivery_tag, payload) pairs of parked messages in the consumed order.
+        :rtype: list
+        """
+        block = self._blocks.get(key)
+        if (block is None) or (block[0] != delivery_tag):
+            return []
+
+        del self._blocks[key]
+        for dependency in block[1]:
+            dependants = self._dependants[dependency]
+            dependants.discard(key)
+            if not dependants:
+                del self._dependants[dependency]
+
+        return self._parked.pop(key, [])
+
+    def pop_dependants(self, dependency):
+        """Returns delivery tags of delayed messages, that don't wait for the dependency anymore.
+
+        :param tuple dependency: (cqrs_id, pk) key of the applied instance.
+        :rtype: set
+        """
+        keys = self._dependants.pop(dependency, ())
+        return {self._blocks[key][0] for key in keys if key in self._blocks}
+
+    def size(self):
+        return sum(len(messages) for messages in self._parked.values())
+
+
+class ReorderBuffer:
+    """Buffer for messages with revision gaps, that wait for the missing revisions.
+
+    :param max_size: Maximum number of buffered messages.
+    :type max_size: int or None
+    """
+
+    def __init__(self, max_size=None):
+        if max_size is not None:
+            assert max_size > 0, 'Reorder buffer max_size should be positive integer.'
+
+        self._max_size = max_size
+        self._messages = defaultdict(list)
+        self._size = 0
+
+    def put(self, key, delay_message):
+        """Buffers message till its ETA.
+
+        :param tuple key: (cqrs_id, pk) key of the instance.
+        :param DelayMessage delay_message: Buffered message.
+        """
+        assert isinstance(delay_message, DelayMessage)
+        if self.full():
+            raise Full('Reorder buffer is full')
+
+        self._messages[key].append(delay_message)
+        self._size += 1
+
+    def pop(self, key):
+        """Returns all buffered messages for the key in the revision order.
+
+        :param tuple key: (cqrs_id, pk) key of the instance.
+        :rtype: list[DelayMessage]
+        """
+        if not self._size:
+            return []
+
+        messages = self._messages.pop(key, [])
+        self._size -= len(messages)
+        return sorted(messages, key=lambda m: m.payload.instance_data.get('cqrs_revision', 0))
+
+    def get_expired(self):
+        """Returns messages for instances, that have at least one message with expired ETA.
+
+        :return: buffered messages generator
+        :rtype: typing.Generator[DelayMessage]
+        """
+        now = timezone.now()
+        expired_keys = [
+            key
+            for key, messages in self._messages.items()
+            if any(message.eta <= now for message in messages)
+        ]
+        for key in expired_keys:
+            yield from self.pop(key)
+
+    def qsize(self):
+        return self._size
+
+    def full(self):
+        return self._max_size is not None and self._size >= self._max_size
+
+
 class DelayQueue:
     """Queue for delay messages."""
 
-    def __init__(self, max_size=None):
+    def __init__(self, max_size=None, reorder_buffer_size=None):
         if max_size is not None:
             assert max_size > 0, 'Delay queue max_size should be positive integer.'
 
         self._max_size = max_size
         self._queue = PriorityQueue()
+        self.parking_lot = ParkingLot()
+        self.reorder_buffer = ReorderBuffer(max_size=reorder_buffer_size)
 
     def get(self):
         """
@@ -73,8 +216,34 @@ class DelayQueue:
             ),
         )
 
+    def release(self, delivery_tags):
+        """Makes delayed messages ready to be requeued without waiting for their ETA.
+
+        :param delivery_tags: Delivery tags of released messages.
+        :type delivery_tags: typing.Collection[int]
+        """
+        if not delivery_tags:
+            return
+
+        now = timezone.now()
+        with self._queue.mutex:
+            items = self._queue.queue
+            for index, (_, delivery_tag, delay_message) in enumerate(items):
+                if delivery_tag in delivery_tags:
+                    delay_message.eta = now
+                    items[index] = (now.timestamp(), delivery_tag, delay_message)
+
+            heapq.heapify(items)
+
     def qsize(self):
         return self._queue.qsize()
 
+    def held_size(self):
+        """Returns number of unacked messages, that are delayed, parked or buffered.
+
+        :rtype: int
+        """
+        return self.qsize() + self.parking_lot.size() + self.reorder_buffer.qsize()
+
     def full(self):
         return self._max_size is not None and self.qsize() >= self._max_size
@@ -4,6 +4,7 @@ import datetime
 import os
 import sys
 import time
+from functools import partial
 
 import ujson
 from django.core.management.base import BaseCommand, CommandError
@@ -73,17 +74,17 @@ class Command(BaseCommand):
             ):
                 ts = time.time()
                 cs = counter
-                for instance in qs:
+                for pk, serialize in self._get_serializers(model, qs):
                     counter += 1
                     try:
                         f.write(
-                            '\n' + ujson.dumps(instance.to_cqrs_dict()),
+                            '\n' + ujson.dumps(serialize()),
                         )
                         success_counter += 1
                     except Exception as e:
                         print(
                             '\nDump record failed for pk={0}: {1}: {2}'.format(
-                                instance.pk,
+                                pk,
                                 type(e).__name__,
                                 str(e),
                             ),
@@ -114,6 +115,21 @@ class Command(BaseCommand):
             file=sys.stderr,
         )
 
+    @staticmethod
+    def _get_serializers(model, qs):
+        """Yields primary keys and serialization callables for the batch.
+
+        Models without `CQRS_SERIALIZER` are serialized directly from selected values.
+        """
+        if model.CQRS_SERIALIZER is None:
+            plan = model._cqrs_serialization_plan
+            pk_attname = model._meta.pk.attname
+            for row in qs.values(*plan.attnames):
+                yield row[pk_attname], partial(plan.serialize_values, row)
+        else:
+            for instance in qs:
+                yield instance.pk, instance.to_cqrs_dict
+
     @staticmethod
     def _get_model(options):
         cqrs_id = options['cqrs_id']
@@ -2,6 +2,9 @@
 import logging
 import signal
 import threading
+import time
+from inspect import signature
+from multiprocessing import get_context
 from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
@@ -15,19 +18,32 @@ from dj_cqrs.registries import ReplicaRegistry
 logger = logging.getLogger('django-cqrs')
 
 
-def consume(**kwargs):
+def consume(ready_event=None, **kwargs):
     import django
 
     django.setup()
 
     from dj_cqrs.transport import current_transport
 
+    if ready_event is not None:
+        if 'ready_callback' in signature(current_transport.consume).parameters:
+            kwargs['ready_callback'] = ready_event.set
+        else:
+            # Transport can't report readiness, process start is the best we know
+            ready_event.set()
+
     try:
         current_transport.consume(**kwargs)
     except KeyboardInterrupt:
         pass
 
 
+def get_queue_depth():
+    from dj_cqrs.transport import current_transport
+
+    return current_transport.get_queue_depth()
+
+
 def _display_path(path):
     try:
         return f'"{path.relative_to(Path.cwd())}"'
@@ -35,6 +51,86 @@ def _display_path(path):
         return f'"{path}"'
 
 
+class WorkersAutoscaler:
+    """Calculates the number of consumer workers from the consumer queue depth.
+
+    Scaling up happens one worker at a time, when the backlog per worker exceeds
+    `scale_up_depth` and the measured drain rate is not enough to consume the backlog
+    within the cooldown period. Scaling down happens one worker at a time, when the backlog
+    per worker drops below `scale_down_depth`. No scaling is done during cooldown
+    after the previous scaling.
+
+    Args:
+        min_workers (int): Minimum number of workers.
+        max_workers (int): Maximum number of workers.
+        scale_up_depth (int): Queue depth per worker, that triggers scaling up.
+        scale_down_depth (int): Queue depth per worker, that triggers scaling down.
+        cooldown (int): Minimum number of seconds between two scalings.
+    """
+
+    def __init__(
+        self,
+        min_workers,
+        max_workers,
+        scale_up_depth=1000,
+        scale_down_depth=100,
+        cooldown=60,
+    ):
+        assert min_workers > 0, 'Min workers should be positive integer.'
+        assert max_workers >= min_workers, "Max workers can't be less than min workers."
+        assert (
+            scale_up_depth > scale_down_depth >= 0
+        ), 'Scale up depth should be greater than scale down depth.'
+
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.scale_up_depth = scale_up_depth
+        self.scale_down_depth = scale_down_depth
+        self.cooldown = cooldown
+
+        self._last_depth = None
+        self._last_check_ts = None
+        self._last_scale_ts = None
+
+    def get_workers_count(self, workers, depth, now=None):
+        """Returns desired number of workers.
+
+        Args:
+            workers (int): Current number of workers.
+            depth (int): Current number of messages in the consumer queue.
+            now (float): Monotonic timestamp of the check.
+
+        Returns:
+            (int): Desired number of workers.
+        """
+        now = time.monotonic() if now is None else now
+
+        drain_rate = None
+        if self._last_depth is not None and now > self._last_check_ts:
+            drain_rate = (self._last_depth - depth) / (now - self._last_check_ts)
+
+        self._last_depth = depth
+        self._last_check_ts = now
+
+        if self._last_scale_ts is not None and now - self._last_scale_ts < self.cooldown:
+            return workers
+
+        desired_workers = workers
+        depth_per_worker = depth / max(workers, 1)
+        if depth_per_worker > self.scale_up_depth and workers < self.max_workers:
+            # Backlog, that is drained fast enough, doesn't need more workers
+            if not drain_rate or drain_rate <= 0 or depth / drain_rate > self.cooldown:
+                desired_workers = workers + 1
+
+        elif depth_per_worker < self.scale_down_depth and workers > self.min_workers:
+            desired_workers = workers - 1
+
+        if desired_workers != workers:
+            self._last_scale_ts = now
+
+        return desired_workers
+
+
 class WorkersManager:
     def __init__(
         self,
@@ -44,6 +140,13 @@ class WorkersManager:
         ignore_paths=None,
         sigint_timeout=5,
         sigkill_timeout=1,
+        max_workers=None,
+        scale_up_depth=1000,
+        scale_down_depth=100,
+        scale_cooldown=60,
+        scale_interval=10,
+        restart_wave_size=1,
+        ready_timeout=30,
     ):
         self.pool = []
         self.workers = workers
@@ -52,6 +155,21 @@ class WorkersManager:
         self.stop_event = threading.Event()
         self.sigint_timeout = sigint_timeout
         self.sigkill_timeout = sigkill_timeout
+        self.restart_wave_size = restart_wave_size
+        self.ready_timeout = ready_timeout
+        self._ready_events = {}
+
+        self.autoscaler = None
+        self.scale_interval = scale_interval
+        self._last_autoscale_ts = None
+        if max_workers and max_workers > workers:
+            self.autoscaler = WorkersAutoscaler(
+                min_workers=workers,
+                max_workers=max_workers,
+                scale_up_depth=scale_up_depth,
+                scale_down_depth=scale_down_depth,
+                cooldown=scale_cooldown,
+            )
 
         if self.reload:
             self.watch_filter = PythonFilter(ignore_paths=ignore_paths)
@@ -81,31 +199,118 @@ class WorkersManager:
                         ', '.join(map(_display_path, files_changed)),
                     )
                     self.restart()
+
+                self.autoscale()
         else:
-            self.stop_event.wait()
+            timeout = self.scale_interval if self.autoscaler else None
+            while not self.stop_event.wait(timeout=timeout):
+                self.autoscale()
 
         self.terminate()
 
     def start(self):
         for _ in range(self.workers):
-            process = start_process(
-                consume,
-                'function',
-                (),
-                self.consume_kwargs,
+            self._start_process()
+
+    def autoscale(self):
+        """Scales the number of workers according to the consumer queue depth."""
+        if not self.autoscaler:
+            return
+
+        now = time.monotonic()
+        if self._last_autoscale_ts is not None and now - self._last_autoscale_ts < (
+            self.scale_interval
+        ):
+            return
+
+        self._last_autoscale_ts = now
+        try:
+            depth = get_queue_depth()
+        except NotImplementedError:
+            logger.warning('Queue depth is not supported by transport, autoscaling is disabled.')
+            self.autoscaler = None
+            return
+        except Exception:
+            logger.warning('Queue depth check failed, skipping autoscaling.', exc_info=True)
+            return
+
+        workers = self.autoscaler.get_workers_count(len(self.pool), depth, now=now)
+        if workers == len(self.pool):
+            return
+
+        logger.info(
+            'Queue depth is %s, scaling consumer workers from %s to %s.',
+            depth,
+            len(self.pool),
+            workers,
+        )
+        while len(self.pool) < workers:
+            self._start_process()
+
+        while len(self.pool) > workers:
+            self._stop_process(self.pool.pop())
+
+        self.workers = workers
+
+    def _start_process(self):
+        ready_event = get_context('spawn').Event()
+        process = start_process(
+            consume,
+            'function',
+            (),
+            dict(self.consume_kwargs, ready_event=ready_event),
+        )
+        self.pool.append(process)
+        self._ready_events[process.pid] = ready_event
+        logger.info(f'Consumer process with pid {process.pid} started')
+        return process
+
+    def _stop_process(self, process):
+        process.stop(sigint_timeout=self.sigint_timeout, sigkill_timeout=self.sigkill_timeout)
+        self._ready_events.pop(process.pid, None)
+        logger.info(f'Consumer process with pid {process.pid} stopped.')
+
+    def _wait_ready(self, processes):
+        deadline = time.monotonic() + self.ready_timeout
+        for process in processes:
+            ready_event = self._ready_events.get(process.pid)
+            timeout = max(deadline - time.monotonic(), 0)
+            if ready_event and ready_event.wait(timeout):
+                continue
+
+            logger.warning(
+                'Consumer process with pid %s is not ready after %s seconds.',
+                process.pid,
+                self.ready_timeout,
             )
-            self.pool.append(process)
-            logger.info(f'Consumer process with pid {process.pid} started')
 
     def terminate(self, *args, **kwargs):
         while self.pool:
-            process = self.pool.pop()
-            process.stop(sigint_timeout=self.sigint_timeout, sigkill_timeout=self.sigkill_timeout)
-            logger.info(f'Consumer process with pid {process.pid} stopped.')
+            self._stop_process(self.pool.pop())
 
     def restart(self, *args, **kwargs):
-        self.terminate()
-        self.start()
+        """Replaces all workers with the new ones.
+
+        Workers are replaced in waves of `restart_wave_size` processes: old workers of the wave
+        are stopped only after the new ones are connected and consuming (or `ready_timeout`
+        is over), so consumption never stops. Zero wave size stops all workers at once.
+        """
+        if not self.restart_wave_size:
+            self.terminate()
+            self.start()
+            return
+
+        old_pool, self.pool = self.pool, []
+        while old_pool:
+            wave_size = self.restart_wave_size
+            wave, old_pool = old_pool[:wave_size], old_pool[wave_size:]
+
+            self._wait_ready([self._start_process() for _ in wave])
+            for process in wave:
+                self._stop_process(process)
+
+        while len(self.pool) < self.workers:
+            self._start_process()
 
     def __iter__(self):
         return self
@@ -166,6 +371,54 @@ class Command(BaseCommand):
             default=1,
             help='How long to wait for the sigkill timeout before issuing a timeout exception.',
         )
+        parser.add_argument(
+            '--max-workers',
+            type=int,
+            default=None,
+            help=(
+                'Maximum number of workers. Enables autoscaling between --workers and '
+                '--max-workers by the consumer queue depth.'
+            ),
+        )
+        parser.add_argument(
+            '--scale-up-depth',
+            type=int,
+            default=1000,
+            help='Queue depth per worker, that triggers adding of a worker.',
+        )
+        parser.add_argument(
+            '--scale-down-depth',
+            type=int,
+            default=100,
+            help='Queue depth per worker, that triggers removing of a worker.',
+        )
+        parser.add_argument(
+            '--scale-cooldown',
+            type=int,
+            default=60,
+            help='Minimum number of seconds between two autoscaling actions.',
+        )
+        parser.add_argument(
+            '--scale-interval',
+            type=int,
+            default=10,
+            help='How often (in seconds) to check the queue depth for autoscaling.',
+        )
+        parser.add_argument(
+            '--restart-wave-size',
+            type=int,
+            default=1,
+            help=(
+                'Number of workers, that are replaced at once on reload. '
+                'Use 0 to stop all workers before starting the new ones.'
+            ),
+        )
+        parser.add_argument(
+            '--ready-timeout',
+            type=int,
+            default=30,
+            help='How long to wait for new workers readiness on reload before stopping old ones.',
+        )
 
     def handle(
         self,
@@ -176,8 +429,21 @@ class Command(BaseCommand):
         ignore_paths=None,
         sigint_timeout=5,
         sigkill_timeout=1,
+        max_workers=None,
+        scale_up_depth=1000,
+        scale_down_depth=100,
+        scale_cooldown=60,
+        scale_interval=10,
+        restart_wave_size=1,
+        ready_timeout=30,
         **options,
     ):
+        if max_workers is not None and max_workers < workers:
+            raise CommandError('Max workers number should be greater or equal to workers number.')
+
+        if max_workers is not None and scale_up_depth <= scale_down_depth:
+            raise CommandError('Scale up depth should be greater than scale down depth.')
+
         paths_to_ignore = None
         if ignore_paths:
             paths_to_ignore = [Path(p).resolve() for p in ignore_paths.split(',')]
@@ -189,6 +455,13 @@ class Command(BaseCommand):
             ignore_paths=paths_to_ignore,
             sigint_timeout=sigint_timeout,
             sigkill_timeout=sigkill_timeout,
+            max_workers=max_workers,
+            scale_up_depth=scale_up_depth,
+            scale_down_depth=scale_down_depth,
+            scale_cooldown=scale_cooldown,
+            scale_interval=scale_interval,
+            restart_wave_size=restart_wave_size,
+            ready_timeout=ready_timeout,
         )
 
         workers_manager.run()
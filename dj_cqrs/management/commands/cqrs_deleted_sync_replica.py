@@ -23,9 +23,7 @@ class Command(BaseCommand):
 
             for pks_line in f:
                 try:
-                    model._default_manager.filter(
-                        pk__in=self.deserialize_in(pks_line.strip()),
-                    ).delete()
+                    model.cqrs.delete_by_pks(self.deserialize_in(pks_line.strip()))
                 except DatabaseError as e:
                     print(str(e), file=sys.stderr)
 
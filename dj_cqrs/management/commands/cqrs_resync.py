@@ -0,0 +1,195 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+import time
+from collections import defaultdict
+
+import ujson
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from dj_cqrs.constants import DEFAULT_MASTER_RESYNC_WINDOW, RESYNC_ROUTING_KEY_PREFIX, SignalType
+from dj_cqrs.controller import producer
+from dj_cqrs.management.utils import batch_qs
+from dj_cqrs.registries import MasterRegistry
+from dj_cqrs.signals import MasterSignals
+from dj_cqrs.transport import current_transport
+from dj_cqrs.transport.rabbit_mq import RabbitMQTransport
+
+
+DEFAULT_BATCH = 1000
+
+
+class RabbitMQTransportService(RabbitMQTransport):
+    @classmethod
+    def get_common_settings(cls):
+        return cls._get_common_settings()
+
+    @classmethod
+    def create_connection(cls, host, port, creds, exchange):
+        return cls._create_connection(host, port, creds, exchange)
+
+
+class Command(BaseCommand):
+    help = 'Answer replica resync requests with direct synchronization of requested rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queue',
+            '-q',
+            help='Name of the master queue for resync requests',
+            type=str,
+            default=None,
+        )
+        parser.add_argument(
+            '--window',
+            '-w',
+            help='Seconds, during which resync requests are aggregated',
+            type=int,
+            default=DEFAULT_MASTER_RESYNC_WINDOW,
+        )
+        parser.add_argument(
+            '--batch',
+            '-b',
+            help='Batch size',
+            type=int,
+            default=DEFAULT_BATCH,
+        )
+
+    def handle(self, *args, **options):
+        self.check_transport()
+        queue_name = self._get_queue_name(options)
+        window = options['window']
+        batch_size = options['batch']
+        if window < 0 or batch_size < 1:
+            raise CommandError('Window must be non-negative and batch size must be positive!')
+
+        channel, connection = self.init_broker(queue_name)
+        consumer_generator = channel.consume(
+            queue=queue_name,
+            auto_ack=False,
+            exclusive=False,
+            inactivity_timeout=min(window, 1) or None,
+        )
+
+        requests = defaultdict(set)
+        started_at, delivery_tag = None, None
+        for method_frame, _, body in consumer_generator:
+            if method_frame is not None:
+                delivery_tag = method_frame.delivery_tag
+                if self.add_request(requests, body) and started_at is None:
+                    started_at = time.monotonic()
+
+            if delivery_tag is None:
+                continue
+
+            if started_at is None or time.monotonic() - started_at >= window:
+                self.handle_requests(requests, batch_size)
+                channel.basic_ack(delivery_tag, multiple=True)
+                requests = defaultdict(set)
+                started_at, delivery_tag = None, None
+
+        if delivery_tag is not None:
+            self.handle_requests(requests, batch_size)
+            channel.basic_ack(delivery_tag, multiple=True)
+
+        if not connection.is_closed:
+            connection.close()
+
+    def check_transport(self):
+        if not issubclass(current_transport, RabbitMQTransport):
+            raise CommandError('Resync command is available only for RabbitMQTransport.')
+
+    def init_broker(self, queue_name):
+        host, port, creds, exchange = RabbitMQTransportService.get_common_settings()
+        connection, channel = RabbitMQTransportService.create_connection(
+            host,
+            port,
+            creds,
+            exchange,
+        )
+
+        channel.queue_declare(queue_name, durable=True, exclusive=False)
+        for cqrs_id in MasterRegistry.models:
+            channel.queue_bind(
+                exchange=exchange,
+                queue=queue_name,
+                routing_key='{0}.{1}'.format(RESYNC_ROUTING_KEY_PREFIX, cqrs_id),
+            )
+
+        return channel, connection
+
+    def add_request(self, requests, body):
+        try:
+            dct = ujson.loads(body)
+            assert dct['signal_type'] == SignalType.RESYNC
+            key = (dct['cqrs_id'], dct['queue'])
+            pks = dct['instance_data']['pks']
+        except (ValueError, TypeError, KeyError, AssertionError):
+            self.stderr.write('Bad resync request: {0}'.format(body))
+            return False
+
+        requests[key].update(pks)
+        return True
+
+    def handle_requests(self, requests, batch_size):
+        for (cqrs_id, queue), pks in requests.items():
+            model = MasterRegistry.get_model_by_cqrs_id(cqrs_id)
+            if not model:
+                self.stderr.write('Wrong CQRS ID: {0}!'.format(cqrs_id))
+                continue
+
+            qs = model._default_manager.filter(pk__in=pks).order_by('pk')
+            counter = 0
+            if model.CQRS_PRODUCE:
+                for qs_ in batch_qs(model.relate_cqrs_serialization(qs), batch_size=batch_size):
+                    instances = [instance for instance in qs_ if instance.is_sync_instance()]
+                    if instances:
+                        counter += self.sync_instances(model, instances, queue)
+
+            self.stdout.write(
+                '{0} of {1} requested instance(s) synced to {2} ({3}).'.format(
+                    counter,
+                    len(pks),
+                    queue,
+                    cqrs_id,
+                ),
+            )
+
+    def sync_instances(self, model, instances, queue):
+        try:
+            payloads = MasterSignals.get_save_payloads(
+                model,
+                instances,
+                None,
+                sync=True,
+                queue=queue,
+            )
+        except Exception as e:
+            close_old_connections()
+            if len(instances) > 1:
+                # Failed batches are synced one by one to skip only failed records
+                return sum(self.sync_instances(model, [instance], queue) for instance in instances)
+
+            self.stderr.write(
+                'Sync record failed for pk={0}: {1}: {2}'.format(
+                    instances[0].pk,
+                    type(e).__name__,
+                    str(e),
+                ),
+            )
+            return 0
+
+        payloads = [payload for payload in payloads if payload is not None]
+        if payloads:
+            producer.produce_batch(payloads)
+
+        return len(payloads)
+
+    @staticmethod
+    def _get_queue_name(options):
+        queue_name = options['queue'] or settings.CQRS.get('master', {}).get('resync_queue')
+        if not queue_name:
+            raise CommandError('Resync queue name is not set!')
+
+        return queue_name
@@ -82,7 +82,7 @@ class Command(BaseCommand):
             for instance in qs_:
                 counter += 1
                 try:
-                    instance.cqrs_sync(queue=options['queue'])
+                    instance.cqrs_sync(queue=options['queue'], refresh=False)
                     success_counter += 1
                 except Exception as e:
                     print(
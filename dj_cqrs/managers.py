@@ -2,12 +2,21 @@
 
 import logging
 
+from django.apps import apps
 from django.core.exceptions import ValidationError
-from django.db import Error, transaction
+from django.db import Error, router, transaction
 from django.db.models import F, Manager
+from django.db.models.deletion import Collector
 from django.utils import timezone
 
-from dj_cqrs.constants import FIELDS_TRACKER_FIELD_NAME, TRACKED_FIELDS_ATTR_NAME
+from dj_cqrs import metrics
+from dj_cqrs.cache import get_read_cache, get_revision_cache
+from dj_cqrs.changes import record_applied_change
+from dj_cqrs.constants import FIELDS_TRACKER_FIELD_NAME, TRACKED_FIELDS_ATTR_NAME, SignalType
+from dj_cqrs.dataclasses import ProjectionDelta, ReplicaChange
+from dj_cqrs.projections import has_projections, record_projection_delta
+from dj_cqrs.reorder import RevisionGapError, is_buffering_revision_gaps
+from dj_cqrs.resync import request_resync
 
 
 logger = logging.getLogger('django-cqrs')
@@ -94,13 +103,18 @@ class ReplicaManager(Manager):
             meta (dict): Payload metadata, if exists.
 
         Returns:
-            (django.db.models.Model): Model instance.
+            (django.db.models.Model): Model instance or True, if the package is skipped
+                as already applied by the revision cache.
         """
         mapped_data = self._map_save_data(master_data)
         mapped_previous_data = self._map_previous_data(previous_data) if previous_data else None
-        if mapped_data:
+        nested_data = self._map_nested_data(master_data) if self.model.CQRS_NESTED else {}
+        if mapped_data and nested_data is not None:
             pk_name = self._get_model_pk_name()
             pk_value = mapped_data[pk_name]
+            if self._is_applied_by_revision_cache(pk_value, mapped_data['cqrs_revision'], sync):
+                return True
+
             f_kwargs = {pk_name: pk_value}
 
             qs = self.model._default_manager.filter(**f_kwargs).order_by()
@@ -110,20 +124,29 @@ class ReplicaManager(Manager):
             instance = qs.first()
 
             if instance:
-                return self.update_instance(
+                instance = self.update_instance(
                     instance,
                     mapped_data,
                     previous_data=mapped_previous_data,
                     sync=sync,
                     meta=meta,
                 )
+            else:
+                instance = self.create_instance(
+                    mapped_data,
+                    previous_data=mapped_previous_data,
+                    sync=sync,
+                    meta=meta,
+                )
 
-            return self.create_instance(
-                mapped_data,
-                previous_data=mapped_previous_data,
-                sync=sync,
-                meta=meta,
-            )
+            if (
+                nested_data
+                and instance
+                and getattr(instance, 'cqrs_revision', None) == mapped_data['cqrs_revision']
+            ):
+                self.save_nested_instances(instance, nested_data)
+
+            return instance
 
     def create_instance(
         self,
@@ -148,7 +171,13 @@ class ReplicaManager(Manager):
             f_kw['meta'] = meta
 
         try:
-            return self.model.cqrs_create(sync, mapped_data, **f_kw)
+            instance = self.model.cqrs_create(sync, mapped_data, **f_kw)
+            if instance:
+                self._cache_revision(mapped_data)
+                self._record_change(mapped_data, None, sync, previous_data)
+                self._record_projection_delta(mapped_data, None, instance, sync, previous_data)
+
+            return instance
         except (Error, ValidationError) as e:
             pk_value = mapped_data[self._get_model_pk_name()]
 
@@ -200,40 +229,22 @@ class ReplicaManager(Manager):
                 )
 
         else:
-            if existing_cqrs_revision > current_cqrs_revision:
-                e_tpl = (
-                    'Wrong CQRS sync order: pk = {0}, '
-                    'cqrs_revision = new {1} / existing {2} ({3}).'
-                )
-                logger.error(
-                    e_tpl.format(
-                        pk_value,
-                        current_cqrs_revision,
-                        existing_cqrs_revision,
-                        self.model.CQRS_ID,
-                    ),
-                )
+            if existing_cqrs_revision >= current_cqrs_revision:
+                metrics.increment(metrics.REPLICA_OUTDATED_REVISIONS)
+                self._log_outdated_revision(pk_value, current_cqrs_revision, existing_cqrs_revision)
+                self._cache_revision({'cqrs_revision': existing_cqrs_revision}, pk_value)
                 return instance
 
-            if existing_cqrs_revision == current_cqrs_revision:
-                logger.error(
-                    'Received duplicate CQRS data: pk = {0}, cqrs_revision = {1} ({2}).'.format(
+            if current_cqrs_revision != instance.cqrs_revision + 1:
+                if is_buffering_revision_gaps():
+                    raise RevisionGapError(
+                        self.model.CQRS_ID,
                         pk_value,
                         current_cqrs_revision,
-                        self.model.CQRS_ID,
-                    ),
-                )
-                if current_cqrs_revision == 0:
-                    logger.warning(
-                        'CQRS potential creation race condition: pk = {0} ({1}).'.format(
-                            pk_value,
-                            self.model.CQRS_ID,
-                        ),
+                        existing_cqrs_revision + 1,
                     )
 
-                return instance
-
-            if current_cqrs_revision != instance.cqrs_revision + 1:
+                metrics.increment(metrics.REPLICA_REVISION_GAPS)
                 w_tpl = (
                     'Lost or filtered out {0} CQRS packages: pk = {1}, cqrs_revision = {2} ({3})'
                 )
@@ -245,13 +256,28 @@ class ReplicaManager(Manager):
                         self.model.CQRS_ID,
                     ),
                 )
+                request_resync(
+                    self.model.CQRS_ID,
+                    pk_value,
+                    using=router.db_for_write(self.model),
+                )
 
         f_kw = {'previous_data': previous_data}
         if self.model.CQRS_META:
             f_kw['meta'] = meta
 
+        old_data = None
+        if has_projections(self.model.CQRS_ID):
+            old_data = self._get_projection_data(instance)
+
         try:
-            return instance.cqrs_update(sync, mapped_data, **f_kw)
+            instance = instance.cqrs_update(sync, mapped_data, **f_kw)
+            if instance:
+                self._cache_revision(mapped_data)
+                self._record_change(mapped_data, existing_cqrs_revision, sync, previous_data)
+                self._record_projection_delta(mapped_data, old_data, instance, sync, previous_data)
+
+            return instance
         except (Error, ValidationError) as e:
             logger.error(
                 '{0}\nCQRS update error: pk = {1}, cqrs_revision = {2} ({3}).'.format(
@@ -262,6 +288,67 @@ class ReplicaManager(Manager):
                 ),
             )
 
+    def save_nested_instances(self, instance, nested_data: dict):
+        """This method synchronizes rows of nested models with CQRS master instance data
+        by a few set-based queries: rows are bulk created, bulk updated and deleted.
+
+        Args:
+            instance (django.db.models.Model): Saved ReplicaMixin instance.
+            nested_data (dict): Mapping of `CQRS_NESTED` master names to lists of row data.
+        """
+        for master_name, rows in nested_data.items():
+            model_label, fk_name = self.model.CQRS_NESTED[master_name]
+            nested_model = apps.get_model(model_label)
+            opts = nested_model._meta
+            fk_attname = opts.get_field(fk_name).attname
+            pk_attname = opts.pk.attname
+
+            # Rows are stored in the DB of the instance, f.e. in its replica shard
+            manager = nested_model._default_manager.db_manager(instance._state.db)
+            existing = {
+                getattr(obj, pk_attname): obj
+                for obj in manager.filter(**{fk_attname: instance.pk})
+            }
+
+            to_create, to_update, update_fields = [], [], set()
+            for row in rows:
+                row_data = {}
+                for field in opts.concrete_fields:
+                    if field.name in row:
+                        row_data[field.attname] = row[field.name]
+                    elif field.attname in row:
+                        row_data[field.attname] = row[field.attname]
+
+                row_data[fk_attname] = instance.pk
+                obj = existing.pop(opts.pk.to_python(row_data[pk_attname]), None)
+                if obj is None:
+                    to_create.append(nested_model(**row_data))
+                    continue
+
+                changed_fields = [
+                    attname
+                    for attname, value in row_data.items()
+                    if opts.get_field(attname).to_python(value) != getattr(obj, attname)
+                ]
+                if changed_fields:
+                    for attname in changed_fields:
+                        setattr(obj, attname, row_data[attname])
+
+                    to_update.append(obj)
+                    update_fields.update(changed_fields)
+
+            if existing:
+                manager.filter(pk__in=list(existing)).delete()
+
+            if to_update:
+                manager.bulk_update(
+                    to_update,
+                    [opts.get_field(attname).name for attname in sorted(update_fields)],
+                )
+
+            if to_create:
+                manager.bulk_create(to_create)
+
     def delete_instance(self, master_data: dict) -> bool:
         """This method deletes model instance from mapped CQRS master instance data.
 
@@ -274,10 +361,13 @@ class ReplicaManager(Manager):
         mapped_data = self._map_delete_data(master_data)
 
         if mapped_data:
-            pk_name = self._get_model_pk_name()
-            pk_value = mapped_data[pk_name]
+            pk_value = mapped_data[self._get_model_pk_name()]
+
             try:
-                self.model._default_manager.filter(**{pk_name: pk_value}).delete()
+                old_data = self._select_projection_data([pk_value])
+                self.delete_by_pks([pk_value])
+                self._record_change(mapped_data, None, signal_type=SignalType.DELETE)
+                self._record_projection_deletes(old_data)
                 return True
             except Error as e:
                 logger.error(
@@ -290,19 +380,302 @@ class ReplicaManager(Manager):
 
         return False
 
+    def delete_instances(self, master_data_list: list) -> bool:
+        """This method deletes model instances from a batch of CQRS master instance data
+        with a single query.
+
+        Args:
+            master_data_list (list): CQRS master instances data.
+
+        Returns:
+            Flag, if delete operation is successful (even if nothing was deleted).
+        """
+        pk_name = self._get_model_pk_name()
+        mapped_data_list = []
+        for master_data in master_data_list:
+            mapped_data = self._map_delete_data(master_data)
+            if not mapped_data:
+                return False
+
+            mapped_data_list.append(mapped_data)
+
+        pk_values = [mapped_data[pk_name] for mapped_data in mapped_data_list]
+        try:
+            old_data = self._select_projection_data(pk_values)
+            self.delete_by_pks(pk_values)
+            for mapped_data in mapped_data_list:
+                self._record_change(mapped_data, None, signal_type=SignalType.DELETE)
+            self._record_projection_deletes(old_data)
+
+            return True
+        except Error as e:
+            logger.error(
+                '{0}\nCQRS delete error: pks = {1} ({2}).'.format(
+                    str(e),
+                    pk_values,
+                    self.model.CQRS_ID,
+                ),
+            )
+
+        return False
+
+    def cached_get(self, pk_value):
+        """This method returns model instance by primary key through the read cache.
+        Cached instances must be treated as read-only.
+
+        Args:
+            pk_value: Primary key of the instance.
+
+        Returns:
+            Model instance.
+
+        Raises:
+            DoesNotExist: Instance doesn't exist.
+        """
+        instances = self.cached_filter_by_pks([pk_value])
+        if not instances:
+            raise self.model.DoesNotExist(
+                '{0} matching query does not exist.'.format(self.model._meta.object_name),
+            )
+
+        return instances[0]
+
+    def cached_filter_by_pks(self, pk_values) -> list:
+        """This method returns model instances by primary keys through the read cache.
+        Only missing instances are selected from the database. Cached instances must be treated
+        as read-only.
+
+        Args:
+            pk_values (list): Primary keys of the instances.
+
+        Returns:
+            List of existing instances in the order of primary keys.
+        """
+        read_cache = self._get_read_cache()
+        if read_cache is None:
+            instances = self.model._default_manager.in_bulk(pk_values)
+            return [instances[pk] for pk in pk_values if pk in instances]
+
+        cqrs_id = self.model.CQRS_ID
+        instances = read_cache.get_many(cqrs_id, pk_values)
+        missing_pks = [pk for pk in pk_values if pk not in instances]
+        metrics.increment(metrics.REPLICA_READ_CACHE_HITS, len(instances))
+        if missing_pks:
+            metrics.increment(metrics.REPLICA_READ_CACHE_MISSES, len(missing_pks))
+
+            # Misses are not cached: instances can appear with the next consumed package
+            selected = self.model._default_manager.in_bulk(missing_pks)
+            if selected:
+                read_cache.set_many(cqrs_id, selected)
+                instances.update(selected)
+
+        return [instances[pk] for pk in pk_values if pk in instances]
+
+    def delete_by_pks(self, pk_values) -> int:
+        """This method deletes model instances by primary keys. Models without delete signal
+        receivers and cascades are deleted with a single raw DELETE query.
+
+        Args:
+            pk_values (list): Primary keys of deleted instances.
+
+        Returns:
+            Number of deleted instances.
+        """
+        revision_cache = get_revision_cache()
+        if revision_cache is not None:
+            for pk_value in pk_values:
+                revision_cache.invalidate(self.model.CQRS_ID, pk_value)
+        self._invalidate_cached_instances(dict.fromkeys(pk_values))
+
+        queryset = self.model._default_manager.filter(pk__in=pk_values)
+        db = router.db_for_write(self.model)
+        if Collector(using=db).can_fast_delete(self.model):
+            return queryset._raw_delete(db)
+
+        return queryset.delete()[0]
+
+    def _is_applied_by_revision_cache(self, pk_value, current_cqrs_revision, sync):
+        revision_cache = get_revision_cache()
+        if revision_cache is None:
+            return False
+
+        # The cache isn't shared between competing consumers, so it may miss deletes and sync
+        # downgrades applied by other workers. Only exact duplicates are skipped, syncs and lower
+        # revisions (f.e. recreated instances) are checked in the database.
+        if sync:
+            return False
+
+        cached_cqrs_revision = revision_cache.get(self.model.CQRS_ID, pk_value)
+        if cached_cqrs_revision != current_cqrs_revision:
+            return False
+
+        self._log_outdated_revision(pk_value, current_cqrs_revision, cached_cqrs_revision)
+        return True
+
+    def _cache_revision(self, mapped_data, pk_value=None):
+        revision_cache = get_revision_cache()
+        if revision_cache is None:
+            return
+
+        if pk_value is None:
+            pk_value = mapped_data[self._get_model_pk_name()]
+        cqrs_id = self.model.CQRS_ID
+        cqrs_revision = mapped_data['cqrs_revision']
+
+        # Revision must not be cached, if local transaction is rolled back
+        transaction.on_commit(
+            lambda: revision_cache.set(cqrs_id, pk_value, cqrs_revision),
+            using=router.db_for_write(self.model),
+        )
+
+    def _record_change(
+        self,
+        mapped_data,
+        old_revision,
+        sync=False,
+        previous_data=None,
+        signal_type=None,
+    ):
+        if signal_type is None:
+            signal_type = SignalType.SYNC if sync else SignalType.SAVE
+
+        pk_value = mapped_data[self._get_model_pk_name()]
+        self._invalidate_cached_instances(
+            {
+                pk_value: (
+                    None if signal_type == SignalType.DELETE else mapped_data['cqrs_revision']
+                ),
+            },
+        )
+        record_applied_change(
+            ReplicaChange(
+                self.model.CQRS_ID,
+                pk_value,
+                old_revision,
+                mapped_data['cqrs_revision'],
+                signal_type,
+                tuple(previous_data) if previous_data else None,
+            ),
+            using=router.db_for_write(self.model),
+        )
+
+    def _record_projection_delta(self, mapped_data, old_data, instance, sync, previous_data):
+        if not has_projections(self.model.CQRS_ID):
+            return
+
+        new_data = self._get_projection_data(instance) if isinstance(instance, self.model) else None
+        record_projection_delta(
+            ProjectionDelta(
+                self.model.CQRS_ID,
+                mapped_data[self._get_model_pk_name()],
+                SignalType.SYNC if sync else SignalType.SAVE,
+                old_data,
+                new_data,
+                previous_data,
+            ),
+        )
+
+    def _record_projection_deletes(self, old_data):
+        for pk_value, data in old_data.items():
+            record_projection_delta(
+                ProjectionDelta(self.model.CQRS_ID, pk_value, SignalType.DELETE, data, None),
+            )
+
+    def _select_projection_data(self, pk_values):
+        # Deleted instances are selected only for projections, that need their old values
+        if not has_projections(self.model.CQRS_ID):
+            return {}
+
+        instances = self.model._default_manager.in_bulk(pk_values)
+        return {pk: self._get_projection_data(instance) for pk, instance in instances.items()}
+
+    def _get_projection_data(self, instance):
+        return {
+            field.attname: getattr(instance, field.attname)
+            for field in self.model._meta.concrete_fields
+        }
+
+    def _get_read_cache(self):
+        if not self.model.CQRS_READ_CACHE:
+            return None
+
+        return get_read_cache()
+
+    def _invalidate_cached_instances(self, revisions):
+        read_cache = self._get_read_cache()
+        if read_cache is None:
+            return
+
+        cqrs_id = self.model.CQRS_ID
+
+        # Instances, that are read concurrently before the commit, must not stay cached
+        read_cache.invalidate_many(cqrs_id, revisions)
+        transaction.on_commit(
+            lambda: read_cache.invalidate_many(cqrs_id, revisions),
+            using=router.db_for_write(self.model),
+        )
+
+    def _log_outdated_revision(self, pk_value, current_cqrs_revision, existing_cqrs_revision):
+        if existing_cqrs_revision > current_cqrs_revision:
+            e_tpl = 'Wrong CQRS sync order: pk = {0}, cqrs_revision = new {1} / existing {2} ({3}).'
+            logger.error(
+                e_tpl.format(
+                    pk_value,
+                    current_cqrs_revision,
+                    existing_cqrs_revision,
+                    self.model.CQRS_ID,
+                ),
+            )
+            return
+
+        logger.error(
+            'Received duplicate CQRS data: pk = {0}, cqrs_revision = {1} ({2}).'.format(
+                pk_value,
+                current_cqrs_revision,
+                self.model.CQRS_ID,
+            ),
+        )
+        if current_cqrs_revision == 0:
+            logger.warning(
+                'CQRS potential creation race condition: pk = {0} ({1}).'.format(
+                    pk_value,
+                    self.model.CQRS_ID,
+                ),
+            )
+
     def _map_previous_data(self, previous_data):
-        if self.model.CQRS_MAPPING is None:
+        mapping = self.model._cqrs_ingest_plan.mapping
+        if mapping is None:
             return previous_data
 
-        mapped_previous_data = {}
+        mapped_previous_data = {
+            replica_name: previous_data[master_name]
+            for master_name, replica_name in mapping
+            if master_name in previous_data
+        }
+        mapped_previous_data = self._remove_excessive_data(mapped_previous_data)
+        return mapped_previous_data
 
-        for master_name, replica_name in self.model.CQRS_MAPPING.items():
-            if master_name not in previous_data:
+    def _map_nested_data(self, master_data):
+        nested_data = {}
+        for master_name, (model_label, _) in self.model.CQRS_NESTED.items():
+            if master_name not in master_data:
                 continue
 
-            mapped_previous_data[replica_name] = previous_data[master_name]
-        mapped_previous_data = self._remove_excessive_data(mapped_previous_data)
-        return mapped_previous_data
+            rows = master_data[master_name] or []
+            pk_field = apps.get_model(model_label)._meta.pk
+            if not all(pk_field.name in row or pk_field.attname in row for row in rows):
+                logger.error(
+                    'CQRS PK is not provided in nested {0} data ({1}).'.format(
+                        master_name,
+                        self.model.CQRS_ID,
+                    ),
+                )
+                return
+
+            nested_data[master_name] = rows
+
+        return nested_data
 
     def _map_save_data(self, master_data):
         if not self._cqrs_fields_are_filled(master_data):
@@ -312,7 +685,8 @@ class ReplicaManager(Manager):
         if not mapped_data:
             return
 
-        if self._get_model_pk_name() not in mapped_data:
+        plan = self.model._cqrs_ingest_plan
+        if plan.pk_name not in mapped_data:
             self._log_pk_data_error()
             return
 
@@ -325,14 +699,15 @@ class ReplicaManager(Manager):
             return mapped_data
 
     def _make_initial_mapping(self, master_data):
-        if self.model.CQRS_MAPPING is None:
+        mapping = self.model._cqrs_ingest_plan.mapping
+        if mapping is None:
             return master_data
 
         mapped_data = {
             'cqrs_revision': master_data['cqrs_revision'],
             'cqrs_updated': master_data['cqrs_updated'],
         }
-        for master_name, replica_name in self.model.CQRS_MAPPING.items():
+        for master_name, replica_name in mapping:
             if master_name not in master_data:
                 logger.error(
                     'Bad master-replica mapping for {0} ({1}).'.format(
@@ -346,15 +721,11 @@ class ReplicaManager(Manager):
         return mapped_data
 
     def _remove_excessive_data(self, data):
-        opts = self.model._meta
-        possible_field_names = {f.name for f in opts.fields}
-        return {k: v for k, v in data.items() if k in possible_field_names}
+        field_names = self.model._cqrs_ingest_plan.field_names
+        return {k: v for k, v in data.items() if k in field_names}
 
     def _all_required_fields_are_filled(self, mapped_data):
-        opts = self.model._meta
-
-        required_field_names = {f.name for f in opts.fields if not f.null}
-        if not (required_field_names - set(mapped_data.keys())):
+        if self.model._cqrs_ingest_plan.required_field_names <= mapped_data.keys():
             return True
 
         logger.error(
@@ -387,4 +758,4 @@ class ReplicaManager(Manager):
         logger.error('CQRS PK is not provided in data ({0}).'.format(self.model.CQRS_ID))
 
     def _get_model_pk_name(self):
-        return self.model._meta.pk.name
+        return self.model._cqrs_ingest_plan.pk_name
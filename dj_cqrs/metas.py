@@ -3,6 +3,7 @@
 from django.db.models import base
 
 from dj_cqrs.constants import ALL_BASIC_FIELDS
+from dj_cqrs.plans import build_master_serialization_plan, build_replica_ingest_plan
 from dj_cqrs.registries import MasterRegistry, ReplicaRegistry
 from dj_cqrs.signals import MasterSignals
 from dj_cqrs.tracker import CQRSTracker
@@ -28,6 +29,7 @@ class MasterMeta(base.ModelBase):
 
         if model_cls.CQRS_SERIALIZER is None:
             MasterMeta._check_cqrs_fields(model_cls)
+            model_cls._cqrs_serialization_plan = build_master_serialization_plan(model_cls)
 
         MasterRegistry.register_model(model_cls)
         MasterSignals.register_model(model_cls)
@@ -66,6 +68,13 @@ class MasterMeta(base.ModelBase):
             )
             assert model_cls.CQRS_SERIALIZER is None, e
 
+        if model_cls.CQRS_SKIP_UNCHANGED and model_cls.CQRS_SERIALIZER:
+            e = (
+                'Model {0}: CQRS_SKIP_UNCHANGED requires CQRS_TRACKED_FIELDS '
+                'for models with CQRS_SERIALIZER.'
+            ).format(model_cls.__name__)
+            assert model_cls.CQRS_TRACKED_FIELDS is not None, e
+
     @staticmethod
     def _check_cqrs_fields(model_cls):
         """Check that model has correct CQRS fields configuration.
@@ -91,6 +100,9 @@ class ReplicaMeta(base.ModelBase):
     def register(model_cls):
         _MetaUtils.check_cqrs_id(model_cls)
         ReplicaMeta._check_cqrs_mapping(model_cls)
+        ReplicaMeta._check_cqrs_nested(model_cls)
+        if isinstance(model_cls, base.ModelBase):
+            model_cls._cqrs_ingest_plan = build_replica_ingest_plan(model_cls)
         ReplicaRegistry.register_model(model_cls)
 
     @staticmethod
@@ -105,6 +117,22 @@ class ReplicaMeta(base.ModelBase):
             cqrs_field_names = list(cqrs_mapping.values())
             _MetaUtils.check_cqrs_field_setting(model_cls, cqrs_field_names, 'CQRS_MAPPING')
 
+    @staticmethod
+    def _check_cqrs_nested(model_cls):
+        """Check that model has correct CQRS nested models configuration.
+
+        :param dj_cqrs.mixins.ReplicaMixin model_cls: CQRS Replica Model.
+        :raises: AssertionError
+        """
+        cqrs_nested = getattr(model_cls, 'CQRS_NESTED', None)
+        if cqrs_nested is not None:
+            e = 'CQRS_NESTED is not correctly set for model {0}.'.format(model_cls.__name__)
+            assert isinstance(cqrs_nested, dict), e
+            for master_name, nested in cqrs_nested.items():
+                assert isinstance(master_name, str), e
+                assert isinstance(nested, (tuple, list)) and len(nested) == 2, e
+                assert all(isinstance(v, str) for v in nested), e
+
 
 class _MetaUtils:
     @classmethod
@@ -0,0 +1,73 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+import threading
+from collections import Counter
+
+
+REPLICA_SKIPPED_WRITES = 'replica_skipped_writes'
+"""Number of replica updates, that didn't change any data columns."""
+
+REPLICA_REVISION_GAPS = 'replica_revision_gaps'
+"""Number of replica updates, that were applied with lost or filtered out previous revisions."""
+
+REPLICA_OUTDATED_REVISIONS = 'replica_outdated_revisions'
+"""Number of replica updates, that were dropped as already applied or outdated."""
+
+REPLICA_REORDER_BUFFERED = 'replica_reorder_buffered'
+"""Number of packages with revision gaps, that were buffered to wait for missing revisions."""
+
+REPLICA_REORDER_EXPIRED = 'replica_reorder_expired'
+"""Number of buffered packages, that were consumed after the reorder window had expired."""
+
+REPLICA_RESYNC_REQUESTS = 'replica_resync_requests'
+"""Number of instances, that were requested from the master for resynchronization."""
+
+REPLICA_READ_CACHE_HITS = 'replica_read_cache_hits'
+"""Number of replica instances, that were read from the read cache."""
+
+REPLICA_READ_CACHE_MISSES = 'replica_read_cache_misses'
+"""Number of replica instances, that were not found in the read cache."""
+
+MASTER_DEBOUNCED_CHANGES = 'master_debounced_changes'
+"""Number of master payloads, that were replaced by later changes within the debounce window."""
+
+MASTER_SUPPRESSED_SAVES = 'master_suppressed_saves'
+"""Number of master saves, that didn't change CQRS fields and were not published."""
+
+_counters = Counter()
+_lock = threading.Lock()
+
+
+def increment(name, value=1):
+    """Increments process-local CQRS counter.
+
+    :param str name: Counter name.
+    :param int value: Increment value.
+    """
+    with _lock:
+        _counters[name] += value
+
+
+def get_counter(name):
+    """Returns current value of process-local CQRS counter.
+
+    :param str name: Counter name.
+    :return: Counter value.
+    :rtype: int
+    """
+    return _counters[name]
+
+
+def get_counters():
+    """Returns snapshot of all process-local CQRS counters.
+
+    :return: Mapping of counter names to values.
+    :rtype: dict
+    """
+    with _lock:
+        return dict(_counters)
+
+
+def reset_counters():
+    with _lock:
+        _counters.clear()
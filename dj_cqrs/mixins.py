@@ -1,26 +1,33 @@
 #  Copyright © 2025 CloudBlue. All rights reserved.
 
 import logging
+from copy import deepcopy
 
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import router, transaction
 from django.db.models import (
-    DateField,
     DateTimeField,
     F,
     IntegerField,
     Manager,
     Model,
-    UUIDField,
 )
 from django.db.models.expressions import CombinedExpression
 from django.utils.module_loading import import_string
 
-from dj_cqrs.constants import ALL_BASIC_FIELDS, FIELDS_TRACKER_FIELD_NAME, TRACKED_FIELDS_ATTR_NAME
+from dj_cqrs import metrics
+from dj_cqrs.constants import (
+    ALL_BASIC_FIELDS,
+    FIELDS_TRACKER_FIELD_NAME,
+    MASTER_BULK_SERIALIZATION_BATCH,
+    TRACKED_FIELDS_ATTR_NAME,
+)
 from dj_cqrs.managers import MasterManager, ReplicaManager
 from dj_cqrs.metas import MasterMeta, ReplicaMeta
 from dj_cqrs.signals import MasterSignals, post_bulk_create, post_update
 from dj_cqrs.state import cqrs_state
+from dj_cqrs.utils import supports_update_returning, update_returning
 
 
 logger = logging.getLogger('django-cqrs')
@@ -58,6 +65,19 @@ class RawMasterMixin(Model):
     the model must be used.
     """
 
+    CQRS_DEBOUNCE_MS = 0
+    """
+    Debounce window in milliseconds. If set, saved instances are published not more often,
+    than once per window, and only their latest revision is sent.
+    """
+
+    CQRS_SKIP_UNCHANGED = False
+    """
+    If true, saves of existing instances, that don't change CQRS fields, don't increment
+    the revision and are not published. Models with `CQRS_SERIALIZER` detect changes only
+    in `CQRS_TRACKED_FIELDS`.
+    """
+
     objects = Manager()
 
     cqrs = MasterManager()
@@ -109,17 +129,132 @@ class RawMasterMixin(Model):
             self.reset_cqrs_saves_count()
 
         if (not update_fields) and self.is_initial_cqrs_save and (not self._state.adding):
-            self.cqrs_revision = F('cqrs_revision') + 1
+            if self._is_cqrs_unchanged():
+                update_fields = self._get_non_cqrs_field_names()
+                self._rollback_cqrs_saves_count(connection)
+            else:
+                self.cqrs_revision = F('cqrs_revision') + 1
         elif update_fields and update_cqrs_fields:
-            self.cqrs_revision = F('cqrs_revision') + 1
-            update_fields = set(update_fields)
-            update_fields.update({'cqrs_revision', 'cqrs_updated'})
+            if self._is_cqrs_unchanged():
+                self._rollback_cqrs_saves_count(connection)
+            else:
+                self.cqrs_revision = F('cqrs_revision') + 1
+                update_fields = set(update_fields)
+                update_fields.update({'cqrs_revision', 'cqrs_updated'})
 
         kwargs['update_fields'] = update_fields
 
         self.save_tracked_fields()
 
-        return super(RawMasterMixin, self).save(*args, **kwargs)
+        result = super(RawMasterMixin, self).save(*args, **kwargs)
+        if self.CQRS_SKIP_UNCHANGED:
+            self._cqrs_snapshot = self._get_cqrs_snapshot()
+
+        return result
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(RawMasterMixin, cls).from_db(db, field_names, values)
+        if cls.CQRS_SKIP_UNCHANGED:
+            instance._cqrs_snapshot = instance._get_cqrs_snapshot()
+
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super(RawMasterMixin, self).refresh_from_db(using=using, fields=fields, **kwargs)
+        if self.CQRS_SKIP_UNCHANGED:
+            self._refresh_cqrs_snapshot(fields)
+
+    def _refresh_cqrs_snapshot(self, fields):
+        snapshot = self._get_cqrs_snapshot()
+        if fields is not None and snapshot is not None:
+            # Not refreshed fields can have local changes, so their snapshot values are kept
+            previous_snapshot = getattr(self, '_cqrs_snapshot', None)
+            if previous_snapshot is None:
+                return
+
+            opts = self._meta
+            refreshed_attnames = {getattr(opts.get_field(f), 'attname', None) for f in fields}
+            snapshot = {
+                **previous_snapshot,
+                **{k: v for k, v in snapshot.items() if k in refreshed_attnames},
+            }
+
+        self._cqrs_snapshot = snapshot
+
+    def _is_cqrs_unchanged(self):
+        if (not self.CQRS_SKIP_UNCHANGED) or self._state.adding:
+            return False
+
+        if self.CQRS_SERIALIZER:
+            unchanged = not getattr(self, FIELDS_TRACKER_FIELD_NAME).changed()
+        else:
+            snapshot = self._get_cqrs_snapshot()
+            unchanged = snapshot is not None and snapshot == getattr(self, '_cqrs_snapshot', None)
+
+        if unchanged:
+            metrics.increment(metrics.MASTER_SUPPRESSED_SAVES)
+
+        return unchanged
+
+    def _get_cqrs_snapshot(self):
+        """Copies of CQRS field values, that are compared to detect changes. Mutable values
+        can be changed in place, so they are copied. Deferred fields aren't loaded for it,
+        and values with expressions can't be compared, so None is returned.
+        """
+        if self.CQRS_SERIALIZER:
+            return None
+
+        values = {
+            attname: self.__dict__[attname]
+            for name, attname, _ in self._cqrs_serialization_plan.fields
+            if name not in ('cqrs_revision', 'cqrs_updated') and attname in self.__dict__
+        }
+        if any(hasattr(value, 'resolve_expression') for value in values.values()):
+            return None
+
+        return deepcopy(values)
+
+    def _get_non_cqrs_field_names(self):
+        return [
+            f.name
+            for f in self._meta.concrete_fields
+            if not (f.primary_key or f.name in ('cqrs_revision', 'cqrs_updated'))
+        ]
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        # Expression values are read back with UPDATE ... RETURNING, so that serialization
+        # doesn't need to refresh them from the DB with an additional query
+        returning_fields = [
+            field for field, _, value in values if isinstance(value, CombinedExpression)
+        ]
+        if (
+            (not returning_fields)
+            or self._meta.select_on_save
+            or (not supports_update_returning(transaction.get_connection(using)))
+        ):
+            return super(RawMasterMixin, self)._do_update(
+                base_qs,
+                using,
+                pk_val,
+                values,
+                update_fields,
+                forced_update,
+            )
+
+        row = update_returning(base_qs.filter(pk=pk_val), values, returning_fields)
+        if row is None:
+            return False
+
+        for field, value in zip(returning_fields, row):
+            setattr(self, field.attname, value)
+
+        return True
+
+    def _rollback_cqrs_saves_count(self, connection):
+        # Suppressed saves aren't published, so the next changed save must still be the initial one
+        if connection.in_atomic_block:
+            self._cqrs_saves_count -= 1
 
     def save_tracked_fields(self):
         if hasattr(self, FIELDS_TRACKER_FIELD_NAME):
@@ -153,6 +288,39 @@ class RawMasterMixin(Model):
             data = self._common_serialization(using)
         return data
 
+    @classmethod
+    def to_cqrs_dicts(cls, instances: list, using: str = None) -> list:
+        """Bulk CQRS serialization for transport payloads.
+
+        Instances of models with `CQRS_SERIALIZER` are loaded with a single related query
+        and serialized with a single serializer call per batch.
+
+        Args:
+            instances (list): Model instances.
+            using (str): The using argument can be used to force the database to use,
+                defaults to None.
+
+        Returns:
+            (list): The serialized data per instance or None, if the instance doesn't exist.
+        """
+        if not cls.CQRS_SERIALIZER:
+            data_list = []
+            for instance in instances:
+                try:
+                    data_list.append(instance.to_cqrs_dict(using))
+                except cls.DoesNotExist:
+                    data_list.append(None)
+
+            return data_list
+
+        data_list = []
+        for start in range(0, len(instances), MASTER_BULK_SERIALIZATION_BATCH):
+            end = start + MASTER_BULK_SERIALIZATION_BATCH
+            batch = instances[start:end]
+            data_list.extend(cls._bulk_class_serialization(batch, using))
+
+        return data_list
+
     def get_tracked_fields_data(self) -> dict:
         """CQRS serialization for tracked fields to include
         in the transport payload.
@@ -162,7 +330,7 @@ class RawMasterMixin(Model):
         """
         return getattr(self, TRACKED_FIELDS_ATTR_NAME, None)
 
-    def cqrs_sync(self, using: str = None, queue: str = None) -> bool:
+    def cqrs_sync(self, using: str = None, queue: str = None, refresh: bool = True) -> bool:
         """Manual instance synchronization.
 
         Args:
@@ -170,6 +338,9 @@ class RawMasterMixin(Model):
                 to use, defaults to None.
             queue (str): Syncing can be executed just for a single queue, defaults to None
                  (all queues).
+            refresh (bool): If False, the instance is not refreshed from the DB before
+                syncing. Can be used for instances, that are just loaded from the DB,
+                defaults to True.
 
         Returns:
             (bool): True if instance can be synced, False otherwise.
@@ -177,7 +348,7 @@ class RawMasterMixin(Model):
         if self._state.adding:
             return False
 
-        if not self.CQRS_SERIALIZER:
+        if refresh and (not self.CQRS_SERIALIZER):
             try:
                 self.refresh_from_db()
             except self._meta.model.DoesNotExist:
@@ -265,29 +436,7 @@ class RawMasterMixin(Model):
         post_update.send(cls, instances=instances, using=using)
 
     def _common_serialization(self, using):
-        opts = self._meta
-
-        if isinstance(self.CQRS_FIELDS, str) and self.CQRS_FIELDS == ALL_BASIC_FIELDS:
-            included_fields = None
-        else:
-            included_fields = self.CQRS_FIELDS
-
-        data = {}
-        for f in opts.fields:
-            if included_fields and (f.name not in included_fields):
-                continue
-
-            value = f.value_from_object(self)
-            if value is not None and isinstance(f, (DateField, DateTimeField, UUIDField)):
-                value = str(value)
-
-            data[f.name] = value
-
-        # We need to include additional fields for synchronisation, f.e. to prevent de-duplication
-        data['cqrs_revision'] = self.cqrs_revision
-        data['cqrs_updated'] = str(self.cqrs_updated)
-
-        return data
+        return self._cqrs_serialization_plan.serialize(self)
 
     def _class_serialization(self, using, sync=False):
         if sync:
@@ -310,26 +459,48 @@ class RawMasterMixin(Model):
 
         return data
 
-    def _refresh_f_expr_values(self, using):
-        opts = self._meta
-        fields_to_refresh = []
-        if isinstance(self.cqrs_revision, CombinedExpression):
-            fields_to_refresh.append('cqrs_revision')
-
-        if isinstance(self.CQRS_FIELDS, str) and self.CQRS_FIELDS == ALL_BASIC_FIELDS:
-            included_fields = None
+    @classmethod
+    def _bulk_class_serialization(cls, instances, using):
+        db = using if using is not None else instances[0]._state.db
+        qs = cls._default_manager.using(db)
+        related_instances = cls.relate_cqrs_serialization(qs).filter(
+            pk__in=[instance.pk for instance in instances],
+        )
+        related_instances = {instance.pk: instance for instance in related_instances.order_by()}
+        existing_instances = [
+            related_instances[instance.pk]
+            for instance in instances
+            if instance.pk in related_instances
+        ]
+
+        serializer_cls = instances[0]._cqrs_serializer_cls
+        if hasattr(serializer_cls, 'many_init'):
+            # DRF serializers
+            serialized = serializer_cls(existing_instances, many=True).data
         else:
-            included_fields = self.CQRS_FIELDS
-
-        for f in opts.fields:
-            if included_fields and (f.name not in included_fields):
+            serialized = [serializer_cls(instance).data for instance in existing_instances]
+
+        data_list = []
+        serialized = iter(serialized)
+        for instance in instances:
+            related_instance = related_instances.get(instance.pk)
+            if related_instance is None:
+                data_list.append(None)
                 continue
 
-            value = f.value_from_object(self)
+            data = next(serialized)
+            data['cqrs_revision'] = related_instance.cqrs_revision
+            data['cqrs_updated'] = str(related_instance.cqrs_updated)
+            data_list.append(data)
 
-            if value is not None and isinstance(value, CombinedExpression):
-                fields_to_refresh.append(f.name)
+        return data_list
 
+    def _refresh_f_expr_values(self, using):
+        fields_to_refresh = [
+            name
+            for name, attname, _ in self._cqrs_serialization_plan.fields
+            if isinstance(getattr(self, attname), CombinedExpression)
+        ]
         if fields_to_refresh:
             self.refresh_from_db(fields=fields_to_refresh)
 
@@ -363,13 +534,67 @@ class RawReplicaMixin:
     CQRS_NO_DB_OPERATIONS = True
     CQRS_META = False
     CQRS_ONLY_DIRECT_SYNCS = False
+    CQRS_COPY_PAYLOAD = True
+    CQRS_DEPENDENCIES = None
 
     @classmethod
     def cqrs_save(cls, master_data, **kwargs):
+        """Saves master instance data.
+
+        Models without DB operations can implement it as a coroutine. Coroutines for different
+        instances are run concurrently by `RabbitMQTransport` workers.
+
+        Args:
+            master_data (dict): CQRS master instance data.
+
+        Returns:
+            Truthy value on success.
+        """
         raise NotImplementedError
 
     @classmethod
     def cqrs_delete(cls, master_data, **kwargs):
+        """Deletes instance by master instance data.
+
+        Models without DB operations can implement it as a coroutine.
+
+        Args:
+            master_data (dict): CQRS master instance data.
+
+        Returns:
+            Truthy value on success.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def cqrs_save_batch(cls, items: list) -> list:
+        """Optional handler for a batch of SAVE and SYNC packages of models without DB operations.
+
+        If it's implemented, packages delivered together within the prefetch window
+        are passed to it instead of calling `cqrs_save` one by one.
+
+        Args:
+            items (list[dj_cqrs.dataclasses.TransportPayload]): Packages in the consumed order.
+                Each instance is contained in the batch at most once.
+
+        Returns:
+            (list): Result per item: truthy value on success, falsy value or exception
+                instance on failure. Failed items are retried separately.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def cqrs_delete_batch(cls, items: list) -> list:
+        """Optional handler for a batch of DELETE packages of models without DB operations.
+
+        Args:
+            items (list[dj_cqrs.dataclasses.TransportPayload]): Packages in the consumed order.
+                Each instance is contained in the batch at most once.
+
+        Returns:
+            (list): Result per item: truthy value on success, falsy value or exception
+                instance on failure. Failed items are retried separately.
+        """
         raise NotImplementedError
 
     @staticmethod
@@ -402,6 +627,25 @@ class RawReplicaMixin:
         """
         return settings.CQRS['replica']['CQRS_RETRY_DELAY']
 
+    @classmethod
+    def get_cqrs_dependencies(cls, master_data: dict) -> list:
+        """Returns instances, that must be applied before the failed package can be applied.
+
+        Args:
+            master_data (dict): CQRS master instance data.
+
+        Returns:
+            (list): (CQRS_ID, pk) pairs of dependencies.
+        """
+        if not cls.CQRS_DEPENDENCIES:
+            return []
+
+        return [
+            (cqrs_id, master_data[master_name])
+            for master_name, cqrs_id in cls.CQRS_DEPENDENCIES.items()
+            if master_data.get(master_name) is not None
+        ]
+
 
 class ReplicaMixin(RawReplicaMixin, Model, metaclass=ReplicaMeta):
     """
@@ -430,6 +674,24 @@ class ReplicaMixin(RawReplicaMixin, Model, metaclass=ReplicaMeta):
     CQRS_ONLY_DIRECT_SYNCS = False
     """Set it to True to ignore broadcast sync packages and to receive only direct queue syncs."""
 
+    CQRS_DEPENDENCIES = None
+    """Mapping of master data field name to CQRS_ID of the replica model, that the instance
+    depends on (f.e. FK parent). Delayed packages are retried as soon as the dependency is applied.
+    """
+
+    CQRS_COPY_PAYLOAD = True
+    """Set it to False to pass consumed data to the model without copying. Consumed data must
+    not be modified by the model in this case, as it's reused on retries."""
+
+    CQRS_NESTED = None
+    """Mapping of master data field name with nested rows to the (app_label.ModelName, FK field
+    name) pair of the model, that stores them. Nested rows are synchronized in bulk together with
+    the instance."""
+
+    CQRS_READ_CACHE = False
+    """Set it to True to cache instances, that are read with `cqrs.cached_get()` and
+    `cqrs.cached_filter_by_pks()`. Cached instances are invalidated, when changes are consumed."""
+
     objects = Manager()
     cqrs = ReplicaManager()
     """Manager that adds needed CQRS queryset methods."""
@@ -485,7 +747,7 @@ class ReplicaMixin(RawReplicaMixin, Model, metaclass=ReplicaMeta):
         Returns:
             (django.db.models.Model): Model instance.
         """
-        return cls._default_manager.create(**mapped_data)
+        return cls._default_manager.create(**cls._cqrs_ingest_plan.convert(mapped_data))
 
     def cqrs_update(
         self,
@@ -506,11 +768,57 @@ class ReplicaMixin(RawReplicaMixin, Model, metaclass=ReplicaMeta):
         Returns:
             (django.db.models.Model): Model instance.
         """
+        update_fields = self._assign_cqrs_fields(mapped_data)
+        if update_fields is None:
+            self.save()
+            return self
+
+        if not (set(update_fields) - {'cqrs_revision', 'cqrs_updated'}):
+            metrics.increment(metrics.REPLICA_SKIPPED_WRITES)
+
+        if update_fields:
+            self.save(
+                update_fields=update_fields + list(self._cqrs_ingest_plan.auto_now_field_names),
+            )
+
+        return self
+
+    def _assign_cqrs_fields(self, mapped_data):
+        """Assigns mapped data to the instance and collects fields, which values have changed.
+
+        Each value is converted once and the converted value is both compared and assigned.
+
+        Args:
+            mapped_data (dict): CQRS mapped instance data.
+
+        Returns:
+            (list): Changed field names or None, if the whole instance must be saved.
+        """
+        plan = self._cqrs_ingest_plan
+        opts = self._meta
+        changed_fields = []
 
         for key, value in mapped_data.items():
+            if key in plan.field_names:
+                field = opts.get_field(key)
+                try:
+                    value = field.to_python(value)
+                except ValidationError:
+                    changed_fields = None
+                    value = plan.convert_value(key, value)
+                else:
+                    is_changed = value != getattr(self, field.attname)
+                    if is_changed and key == plan.pk_name:
+                        changed_fields = None
+                    elif is_changed and (changed_fields is not None):
+                        changed_fields.append(key)
+            else:
+                changed_fields = None
+                value = plan.convert_value(key, value)
+
             setattr(self, key, value)
-        self.save()
-        return self
+
+        return changed_fields
 
     @classmethod
     def cqrs_delete(cls, master_data: dict, meta: dict = None) -> bool:
@@ -0,0 +1,189 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+from typing import (
+    Callable,
+    FrozenSet,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from django.db.models import DateField, DateTimeField, UUIDField
+from django.utils.dateparse import parse_datetime
+
+from dj_cqrs.constants import ALL_BASIC_FIELDS
+
+
+def _parse_datetime(value):
+    if isinstance(value, str):
+        return parse_datetime(value) or value
+
+    return value
+
+
+class MasterSerializationPlan(NamedTuple):
+    """Immutable data, that is needed to serialize master model instances without a serializer.
+
+    Args:
+        fields (tuple): Triples of payload field names, model attribute names and value
+            converters or None, if values are serialized as is.
+    """
+
+    fields: Tuple[Tuple[str, str, Optional[Callable]], ...]
+
+    @property
+    def attnames(self):
+        """Model attribute names, that can be used to select values of the serialized fields."""
+        return tuple(attname for _, attname, _ in self.fields)
+
+    def serialize(self, instance):
+        """Serializes the model instance.
+
+        Args:
+            instance (dj_cqrs.mixins.MasterMixin): Model instance.
+
+        Returns:
+            (dict): The serialized instance data.
+        """
+        data = {}
+        for name, attname, converter in self.fields:
+            value = getattr(instance, attname)
+            if converter is not None and value is not None:
+                value = converter(value)
+
+            data[name] = value
+
+        return data
+
+    def serialize_values(self, row):
+        """Serializes the row, selected with `values(*plan.attnames)`.
+
+        Args:
+            row (dict): Selected row values.
+
+        Returns:
+            (dict): The serialized instance data.
+        """
+        data = {}
+        for name, attname, converter in self.fields:
+            value = row[attname]
+            if converter is not None and value is not None:
+                value = converter(value)
+
+            data[name] = value
+
+        return data
+
+
+def build_master_serialization_plan(model_cls):
+    """Precompiles serialization plan for the master model without a serializer.
+
+    Args:
+        model_cls (dj_cqrs.mixins.MasterMixin): CQRS Master Model.
+
+    Returns:
+        (dj_cqrs.plans.MasterSerializationPlan): Master serialization plan.
+    """
+    cqrs_fields = model_cls.CQRS_FIELDS
+    if isinstance(cqrs_fields, str) and cqrs_fields == ALL_BASIC_FIELDS:
+        included_fields = None
+    else:
+        included_fields = set(cqrs_fields)
+
+    fields = [
+        (
+            f.name,
+            f.attname,
+            str if isinstance(f, (DateField, DateTimeField, UUIDField)) else None,
+        )
+        for f in model_cls._meta.fields
+        if (not included_fields) or (f.name in included_fields)
+    ]
+
+    # Additional fields are always included for synchronisation, f.e. to prevent de-duplication
+    field_names = {name for name, _, _ in fields}
+    for name, converter in (('cqrs_revision', None), ('cqrs_updated', str)):
+        if name not in field_names:
+            fields.append((name, name, converter))
+
+    return MasterSerializationPlan(fields=tuple(fields))
+
+
+class ReplicaIngestPlan(NamedTuple):
+    """Immutable data, that is needed to map master data to the replica model.
+
+    Args:
+        pk_name (str): Name of the replica model primary key.
+        field_names (frozenset): Names of all concrete replica model fields.
+        required_field_names (frozenset): Names of replica model fields, that can't be null.
+        auto_now_field_names (frozenset): Names of replica model fields, that are updated on
+            every save.
+        mapping (tuple): Pairs of master and replica field names or None, if there is no mapping.
+        converters (tuple): Pairs of replica field names and their value converters.
+    """
+
+    pk_name: str
+    field_names: FrozenSet[str]
+    required_field_names: FrozenSet[str]
+    auto_now_field_names: FrozenSet[str]
+    mapping: Optional[Tuple[Tuple[str, str], ...]]
+    converters: Tuple[Tuple[str, Callable], ...]
+
+    def convert(self, mapped_data):
+        """Converts serialized values to python values.
+
+        Mapped data is passed to replica hooks as is, so it's converted only when it's
+        assigned to the instance.
+
+        Args:
+            mapped_data (dict): Data, mapped to replica model fields.
+
+        Returns:
+            (dict): Copy of mapped data with converted values.
+        """
+        converted_data = dict(mapped_data)
+        for field_name, converter in self.converters:
+            if field_name in converted_data:
+                converted_data[field_name] = converter(converted_data[field_name])
+
+        return converted_data
+
+    def convert_value(self, field_name, value):
+        """Converts a single serialized value to python value.
+
+        Args:
+            field_name (str): Replica model field name.
+            value: Serialized value.
+
+        Returns:
+            Converted value or the value as is, if there is no converter for the field.
+        """
+        for converter_field_name, converter in self.converters:
+            if converter_field_name == field_name:
+                return converter(value)
+
+        return value
+
+
+def build_replica_ingest_plan(model_cls):
+    """Precompiles ingest plan for the replica model.
+
+    Args:
+        model_cls (dj_cqrs.mixins.ReplicaMixin): CQRS Replica Model.
+
+    Returns:
+        (dj_cqrs.plans.ReplicaIngestPlan): Replica ingest plan.
+    """
+    opts = model_cls._meta
+    cqrs_mapping = model_cls.CQRS_MAPPING
+
+    return ReplicaIngestPlan(
+        pk_name=opts.pk.name if opts.pk is not None else None,
+        field_names=frozenset(f.name for f in opts.fields),
+        required_field_names=frozenset(f.name for f in opts.fields if not f.null),
+        auto_now_field_names=frozenset(
+            f.name for f in opts.fields if getattr(f, 'auto_now', False)
+        ),
+        mapping=tuple(cqrs_mapping.items()) if cqrs_mapping is not None else None,
+        converters=(('cqrs_updated', _parse_datetime),),
+    )
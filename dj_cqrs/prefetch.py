@@ -0,0 +1,99 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+import logging
+
+
+logger = logging.getLogger('django-cqrs')
+
+
+class PrefetchController:
+    """Adaptive prefetch count of the consumer channel.
+
+    Prefetch count is kept at the number of unacked messages, that are held by the worker
+    (delayed, parked and buffered), plus the number of messages, that can be processed within
+    the time budget by the measured per-message latency. So slow models don't hoard messages,
+    that can be processed by other workers, and fast models are not throttled.
+
+    :param max_count: Static prefetch count, that is never exceeded (0 if infinite).
+    :type max_count: int
+    :param time_budget: Seconds of processing for prefetched messages.
+    :type time_budget: float
+    """
+
+    MIN_COUNT = 1
+    """Minimum number of prefetched messages for processing."""
+
+    SMOOTHING = 0.2
+    """Weight of the last measurement in the moving average of the latency."""
+
+    HYSTERESIS = 0.25
+    """Relative change of the prefetch count, that is needed to update channel QoS."""
+
+    def __init__(self, max_count, time_budget):
+        assert time_budget > 0, 'Prefetch time budget should be positive.'
+
+        self.max_count = max_count
+        self.time_budget = time_budget
+        self.latency = None
+        self.prefetch_count = self._limit(self.MIN_COUNT)
+
+    def observe(self, processed, elapsed):
+        """Updates moving average of the per-message processing latency.
+
+        :param int processed: Number of processed messages.
+        :param float elapsed: Seconds, that processing took.
+        """
+        if not processed:
+            return
+
+        latency = elapsed / processed
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.SMOOTHING * (latency - self.latency)
+
+    def get_prefetch_count(self, held_count):
+        """
+        :param int held_count: Number of unacked messages, that are held by the worker.
+        :return: Target prefetch count.
+        :rtype: int
+        """
+        if self.latency is None:
+            processing_count = self.MIN_COUNT
+        elif self.latency > 0:
+            processing_count = max(self.MIN_COUNT, int(self.time_budget / self.latency))
+        else:
+            processing_count = self.max_count or self.MIN_COUNT
+
+        return self._limit(held_count + processing_count)
+
+    def adjust(self, channel, held_count):
+        """Updates channel QoS, if the target prefetch count is changed significantly or
+        held messages don't leave room for processing.
+
+        :param channel: Consumer channel.
+        :param int held_count: Number of unacked messages, that are held by the worker.
+        :return: Current prefetch count.
+        :rtype: int
+        """
+        prefetch_count = self.get_prefetch_count(held_count)
+        change = abs(prefetch_count - self.prefetch_count)
+        if change and (
+            change >= self.prefetch_count * self.HYSTERESIS or held_count >= self.prefetch_count
+        ):
+            channel.basic_qos(prefetch_count=prefetch_count)
+            logger.debug(
+                'CQRS prefetch count is changed: {0} -> {1}.'.format(
+                    self.prefetch_count,
+                    prefetch_count,
+                ),
+            )
+            self.prefetch_count = prefetch_count
+
+        return self.prefetch_count
+
+    def _limit(self, count):
+        if self.max_count:
+            return min(count, self.max_count)
+
+        return count
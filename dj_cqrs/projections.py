@@ -0,0 +1,83 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+from contextlib import contextmanager
+
+from dj_cqrs.registries import ProjectionRegistry
+from dj_cqrs.state import cqrs_state
+
+
+class Projection:
+    """Base class of incremental projections, that maintain derived aggregates (counts, sums,
+    etc.) of replica models.
+
+    Projections are registered with `ProjectionRegistry.register_projection` and are applied
+    by the consumer in the same transaction as the replica changes, so aggregates are updated
+    at the cost of changes instead of recomputation over replica tables.
+    """
+
+    CQRS_IDS = ()
+    """CQRS identifiers of replica models, which changes are applied to the projection."""
+
+    @classmethod
+    def apply(cls, deltas: list):
+        """Applies replica changes to the aggregates.
+
+        Args:
+            deltas (list[dj_cqrs.dataclasses.ProjectionDelta]): Changes in the applied order.
+        """
+        raise NotImplementedError
+
+
+def has_projections(cqrs_id):
+    """
+    :param str cqrs_id: Replica model CQRS unique identifier.
+    :rtype: bool
+    """
+    return bool(ProjectionRegistry.get_projections(cqrs_id))
+
+
+@contextmanager
+def collecting_projection_deltas():
+    """Collects projection deltas, that are recorded within the context, and applies them
+    in a batch on exit. It must be entered within the transaction of replica changes, so that
+    failed projections roll them back. Nested contexts are merged into the outer one.
+    """
+    if getattr(cqrs_state, 'projection_deltas', None) is not None:
+        yield
+        return
+
+    deltas = cqrs_state.projection_deltas = []
+    try:
+        yield
+    finally:
+        cqrs_state.projection_deltas = None
+
+    if deltas:
+        apply_projection_deltas(deltas)
+
+
+def record_projection_delta(delta):
+    """Records projection delta to be applied on exit of the collecting context.
+    Outside of the context it's applied immediately.
+
+    :param dj_cqrs.dataclasses.ProjectionDelta delta: Replica change.
+    """
+    deltas = getattr(cqrs_state, 'projection_deltas', None)
+    if deltas is None:
+        apply_projection_deltas([delta])
+    else:
+        deltas.append(delta)
+
+
+def apply_projection_deltas(deltas):
+    """Applies deltas to the projections, that listen to their replica models.
+
+    :param list deltas: Projection deltas in the applied order.
+    """
+    projection_deltas = {}
+    for delta in deltas:
+        for projection_cls in ProjectionRegistry.get_projections(delta.cqrs_id):
+            projection_deltas.setdefault(projection_cls, []).append(delta)
+
+    for projection_cls, deltas_ in projection_deltas.items():
+        projection_cls.apply(deltas_)
@@ -0,0 +1,116 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from dj_cqrs.constants import SignalType
+from dj_cqrs.controller import producer
+from dj_cqrs.debounce import debounce_buffer
+from dj_cqrs.signals import MasterSignals
+from dj_cqrs.state import cqrs_state
+
+
+class PublishingBatch:
+    """Master changes, that are committed within the batching context.
+
+    Changes are collapsed to the final state per instance and queue, and are published
+    together, when the batch is flushed.
+    """
+
+    def __init__(self):
+        self._changes = OrderedDict()
+
+    def add_save(self, sender, instance, using, sync=False, queue=None):
+        """
+        :param dj_cqrs.mixins.MasterMixin sender: Master model.
+        :param dj_cqrs.mixins.MasterMixin instance: Saved instance.
+        :param str using: DB alias.
+        :param bool sync: Flag, if the instance is synced.
+        :param str queue: Queue to sync the instance to or None for all queues.
+        """
+        # The batch publishes the latest state, so older debounced payloads must not follow it
+        debounce_buffer.discard(sender.CQRS_ID, instance.pk)
+
+        signal_type = SignalType.SYNC if sync else SignalType.SAVE
+        self._add(
+            (sender.CQRS_ID, instance.pk, queue),
+            (signal_type, sender, instance, using, queue),
+        )
+
+    def add_delete(self, payload):
+        """
+        :param dj_cqrs.dataclasses.TransportPayload payload: DELETE payload.
+        """
+        debounce_buffer.discard(payload.cqrs_id, payload.pk)
+        self._add((payload.cqrs_id, payload.pk, payload.queue), (SignalType.DELETE, payload))
+
+    def flush(self):
+        """Serializes saved instances in bulk and publishes all changes in a single batch.
+
+        :return: Number of published changes.
+        :rtype: int
+        """
+        changes, self._changes = self._changes, OrderedDict()
+
+        saves = defaultdict(list)
+        for key, change in changes.items():
+            if change[0] != SignalType.DELETE:
+                signal_type, sender, instance, using, queue = change
+                saves[(sender, using, signal_type == SignalType.SYNC, queue)].append(
+                    (key, instance),
+                )
+
+        save_payloads = {}
+        for (sender, using, sync, queue), instances in saves.items():
+            payloads = MasterSignals.get_save_payloads(
+                sender,
+                [instance for _, instance in instances],
+                using,
+                sync=sync,
+                queue=queue,
+            )
+            for (key, _), payload in zip(instances, payloads):
+                save_payloads[key] = payload
+
+        payloads = []
+        for key, change in changes.items():
+            payload = change[1] if change[0] == SignalType.DELETE else save_payloads[key]
+            if payload is not None:
+                payloads.append(payload)
+
+        if payloads:
+            producer.produce_batch(payloads)
+
+        return len(payloads)
+
+    def _add(self, key, change):
+        self._changes.pop(key, None)
+        self._changes[key] = change
+
+    def __len__(self):
+        return len(self._changes)
+
+
+@contextmanager
+def batch_cqrs_publishing():
+    """Collects master changes, that are committed within the context, and publishes them
+    in a single batch.
+
+    If the context is entered within a transaction, changes are published on its commit,
+    otherwise on exit. Changes from rolled back transactions and savepoints are not published.
+    Nested contexts are merged into the outer one.
+    """
+    if getattr(cqrs_state, 'publishing_batch', None) is not None:
+        yield cqrs_state.publishing_batch
+        return
+
+    batch = cqrs_state.publishing_batch = PublishingBatch()
+    try:
+        yield batch
+    finally:
+        cqrs_state.publishing_batch = None
+
+        # Changes are added on commit, so the flush is scheduled after all of them
+        transaction.on_commit(batch.flush)
@@ -49,3 +49,35 @@ class ReplicaRegistry(RegistryMixin):
         assert getattr(settings, 'CQRS', {}).get('queue') is not None, e
 
         super(ReplicaRegistry, cls).register_model(model_cls)
+
+
+class ProjectionRegistry:
+    projections = {}
+
+    @classmethod
+    def register_projection(cls, projection_cls):
+        """Registration of projection for replica models with its CQRS_IDS.
+        It can be used as a class decorator.
+        """
+        e = 'CQRS_IDS must be set for projection {0}.'.format(projection_cls.__name__)
+        assert projection_cls.CQRS_IDS, e
+
+        for cqrs_id in projection_cls.CQRS_IDS:
+            projections = cls.projections.setdefault(cqrs_id, [])
+            if projection_cls not in projections:
+                projections.append(projection_cls)
+
+        return projection_cls
+
+    @classmethod
+    def get_projections(cls, cqrs_id):
+        """
+        Returns projections, that listen to changes of the replica model.
+
+        Args:
+            cqrs_id (str): The CQRS_ID of the replica model.
+
+        Returns:
+            (list): Projection classes.
+        """
+        return cls.projections.get(cqrs_id, [])
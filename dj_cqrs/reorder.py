@@ -0,0 +1,51 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+from contextlib import contextmanager
+
+from dj_cqrs.state import cqrs_state
+
+
+class RevisionGapError(Exception):
+    """Raised for packages with revision gaps, that can be buffered by the transport.
+
+    :param str cqrs_id: Replica model CQRS unique identifier.
+    :param pk: Primary key of the instance.
+    :param int revision: Revision of the package.
+    :param int expected_revision: Next revision of the replica instance.
+    """
+
+    def __init__(self, cqrs_id, pk, revision, expected_revision):
+        super().__init__(cqrs_id, pk, revision, expected_revision)
+        self.cqrs_id = cqrs_id
+        self.pk = pk
+        self.revision = revision
+        self.expected_revision = expected_revision
+
+    def __str__(self):
+        return 'CQRS revision gap: pk = {0}, cqrs_revision = {1}, expected = {2} ({3}).'.format(
+            self.pk,
+            self.revision,
+            self.expected_revision,
+            self.cqrs_id,
+        )
+
+
+@contextmanager
+def buffering_revision_gaps(enabled=True):
+    """Allows replica managers to raise RevisionGapError instead of applying packages with
+    revision gaps.
+
+    :param bool enabled: Flag, if revision gaps can be buffered.
+    """
+    cqrs_state.buffer_revision_gaps = enabled
+    try:
+        yield
+    finally:
+        cqrs_state.buffer_revision_gaps = False
+
+
+def is_buffering_revision_gaps():
+    """
+    :rtype: bool
+    """
+    return bool(getattr(cqrs_state, 'buffer_revision_gaps', False))
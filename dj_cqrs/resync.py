@@ -0,0 +1,115 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from dj_cqrs import metrics
+from dj_cqrs.constants import SignalType
+from dj_cqrs.dataclasses import TransportPayload
+from dj_cqrs.utils import get_resync_window
+
+
+logger = logging.getLogger('django-cqrs')
+
+
+class ResyncRequests:
+    """Replica instances, that are requested from the master for resynchronization.
+
+    Requests are aggregated per CQRS ID within the resync window, so that drifted instances
+    are repaired by a few compact messages instead of a message per instance.
+    """
+
+    def __init__(self):
+        self._pks = defaultdict(set)
+        self._started_at = None
+        self._lock = threading.Lock()
+
+    def add(self, cqrs_id, pk):
+        """
+        :param str cqrs_id: Replica model CQRS unique identifier.
+        :param pk: Primary key of the instance.
+        """
+        with self._lock:
+            if self._started_at is None:
+                self._started_at = time.monotonic()
+
+            self._pks[cqrs_id].add(pk)
+
+    def is_due(self, window):
+        """
+        :param int window: Aggregation window in seconds.
+        :rtype: bool
+        """
+        return self._started_at is not None and time.monotonic() - self._started_at >= window
+
+    def pop_all(self):
+        """Returns and clears aggregated requests.
+
+        :return: Mapping of CQRS IDs to the requested primary keys.
+        :rtype: dict
+        """
+        with self._lock:
+            pks, self._pks = self._pks, defaultdict(set)
+            self._started_at = None
+
+        return pks
+
+    def __len__(self):
+        return sum(len(pks) for pks in self._pks.values())
+
+
+resync_requests = ResyncRequests()
+
+
+def request_resync(cqrs_id, pk, using=None):
+    """Requests resynchronization of the replica instance from the master, if it's enabled.
+
+    :param str cqrs_id: Replica model CQRS unique identifier.
+    :param pk: Primary key of the instance.
+    :param str using: DB alias of the transaction, after which requests are sent.
+    """
+    window = get_resync_window()
+    if not window:
+        return
+
+    resync_requests.add(cqrs_id, pk)
+    if resync_requests.is_due(window):
+        transaction.on_commit(flush_resync_requests, using=using)
+
+
+def flush_resync_requests(force=False):
+    """Sends aggregated resync requests to the master, if the resync window is passed.
+
+    :param bool force: Flag, if requests are sent without waiting for the window.
+    :return: Number of requested instances.
+    :rtype: int
+    """
+    if not (force or resync_requests.is_due(get_resync_window())):
+        return 0
+
+    from dj_cqrs.controller.producer import produce
+
+    queue = settings.CQRS.get('queue')
+    requested = 0
+    for cqrs_id, pks in resync_requests.pop_all().items():
+        produce(
+            TransportPayload(
+                SignalType.RESYNC,
+                cqrs_id,
+                {'pks': list(pks)},
+                None,
+                queue=queue,
+            ),
+        )
+        logger.info(
+            'CQRS resync is requested: {0} instance(s) ({1}).'.format(len(pks), cqrs_id),
+        )
+        requested += len(pks)
+
+    metrics.increment(metrics.REPLICA_RESYNC_REQUESTS, requested)
+    return requested
@@ -0,0 +1,86 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+from contextlib import contextmanager
+
+from dj_cqrs.state import cqrs_state
+from dj_cqrs.utils import get_shard_router
+
+
+class ReplicaShardRouter:
+    """Django database router, that routes queries of consumed replica packages to the shard,
+    that is selected by `CQRS_SHARD_ROUTER` replica setting.
+
+    It must be the first one in `DATABASE_ROUTERS` setting. Queries of non-replica models
+    and queries outside of the consumer are passed to the next routers.
+    """
+
+    def db_for_read(self, model, **hints):
+        return self._get_shard(model)
+
+    def db_for_write(self, model, **hints):
+        return self._get_shard(model)
+
+    @staticmethod
+    def _get_shard(model):
+        from dj_cqrs.mixins import ReplicaMixin
+
+        shard = get_current_shard()
+        if shard is not None and issubclass(model, ReplicaMixin):
+            return shard
+
+
+def get_shard(cqrs_id, pk):
+    """Returns DB alias of the shard, that stores replica instance.
+
+    :param str cqrs_id: Replica model CQRS unique identifier.
+    :param pk: Primary key of the instance.
+    :return: DB alias or None, if sharding isn't used.
+    :rtype: str or None
+    """
+    shard_router = get_shard_router()
+    if shard_router is None:
+        return None
+
+    return shard_router(cqrs_id, pk)
+
+
+def get_current_shard():
+    """
+    :return: DB alias of the shard, that is used by the consumer, or None.
+    :rtype: str or None
+    """
+    return getattr(cqrs_state, 'shard', None)
+
+
+@contextmanager
+def using_shard(db):
+    """Routes all queries within the context to the shard by `ReplicaShardRouter`.
+
+    :param db: DB alias of the shard or None to use default routing.
+    :type db: str or None
+    """
+    if db is None:
+        yield
+        return
+
+    previous_db = get_current_shard()
+    cqrs_state.shard = db
+    try:
+        yield
+    finally:
+        cqrs_state.shard = previous_db
+
+
+def group_by_shard(cqrs_id, pks):
+    """Groups primary keys of replica instances by shards.
+
+    :param str cqrs_id: Replica model CQRS unique identifier.
+    :param list pks: Primary keys of the instances.
+    :return: Mapping of DB aliases (None, if sharding isn't used) to primary key indexes.
+    :rtype: dict
+    """
+    groups = {}
+    for index, pk in enumerate(pks):
+        groups.setdefault(get_shard(cqrs_id, pk), []).append(index)
+
+    return groups
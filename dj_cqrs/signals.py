@@ -6,9 +6,11 @@ from django.db import models, transaction
 from django.dispatch import Signal
 from django.utils.timezone import now
 
+from dj_cqrs.changes import post_cqrs_apply  # noqa: F401
 from dj_cqrs.constants import SignalType
 from dj_cqrs.controller import producer
 from dj_cqrs.dataclasses import TransportPayload
+from dj_cqrs.debounce import churn_stats, debounce_buffer
 from dj_cqrs.state import cqrs_state
 from dj_cqrs.utils import get_message_expiration_dt
 
@@ -74,6 +76,13 @@ class MasterSignals:
 
         connection = transaction.get_connection(using)
         if not connection.in_atomic_block or instance.is_initial_cqrs_save:
+            publishing_batch = getattr(cqrs_state, 'publishing_batch', None)
+            if publishing_batch is not None:
+                transaction.on_commit(
+                    lambda: publishing_batch.add_save(sender, instance, using, sync, queue),
+                )
+                return
+
             transaction.on_commit(
                 lambda: cls._post_save_produce(sender, instance, using, sync, queue),
             )
@@ -109,7 +118,11 @@ class MasterSignals:
             expires=get_message_expiration_dt(),
             meta=meta,
         )
-        producer.produce(payload)
+        churn_stats.add(sender.CQRS_ID, instance.pk)
+        if sender.CQRS_DEBOUNCE_MS:
+            debounce_buffer.add(payload, sender.CQRS_DEBOUNCE_MS / 1000)
+        else:
+            producer.produce(payload)
 
     @classmethod
     def post_delete(cls, sender, **kwargs):
@@ -150,7 +163,19 @@ class MasterSignals:
             meta=meta,
         )
         # Delete is always in transaction!
-        transaction.on_commit(lambda: producer.produce(payload))
+        publishing_batch = getattr(cqrs_state, 'publishing_batch', None)
+        if publishing_batch is not None:
+            transaction.on_commit(lambda: publishing_batch.add_delete(payload))
+        elif sender.CQRS_DEBOUNCE_MS:
+            transaction.on_commit(lambda: cls._post_delete_produce_debounced(payload))
+        else:
+            transaction.on_commit(lambda: producer.produce(payload))
+
+    @classmethod
+    def _post_delete_produce_debounced(cls, payload):
+        # Debounced saves of the deleted instance would recreate it on replicas
+        debounce_buffer.discard(payload.cqrs_id, payload.pk)
+        producer.produce(payload)
 
     @classmethod
     def post_bulk_create(cls, sender, **kwargs):
@@ -170,5 +195,78 @@ class MasterSignals:
 
     @classmethod
     def _post_bulk(cls, sender, **kwargs):
-        for instance in kwargs['instances']:
-            cls.post_save(sender, instance=instance, using=kwargs['using'])
+        if not sender.CQRS_PRODUCE:
+            return
+
+        instances = [instance for instance in kwargs['instances'] if instance.is_sync_instance()]
+        if not instances:
+            return
+
+        # All instances are serialized and published together
+        using = kwargs['using']
+        transaction.on_commit(
+            lambda: cls._post_bulk_produce(sender, instances, using),
+            using=using,
+        )
+
+    @classmethod
+    def _post_bulk_produce(cls, sender, instances, using):
+        payloads = [
+            payload
+            for payload in cls.get_save_payloads(sender, instances, using)
+            if payload is not None
+        ]
+        if sender.CQRS_DEBOUNCE_MS:
+            for payload in payloads:
+                debounce_buffer.add(payload, sender.CQRS_DEBOUNCE_MS / 1000)
+        elif payloads:
+            producer.produce_batch(payloads)
+
+    @classmethod
+    def get_save_payloads(cls, sender, instances, using, sync=False, queue=None):
+        """Serializes saved instances in bulk.
+
+        Args:
+            sender (dj_cqrs.mixins.MasterMixin): Class inherited from CQRS MasterMixin.
+            instances (list): Saved instances.
+            using (str): DB alias.
+            sync (bool): Flag, if instances are synced.
+            queue (str): Queue to sync instances to or None for all queues.
+
+        Returns:
+            (list): Transport payloads per instance or None, if the instance doesn't exist.
+        """
+        signal_type = SignalType.SYNC if sync else SignalType.SAVE
+        expires = get_message_expiration_dt()
+        payloads = []
+        for instance, instance_data in zip(instances, sender.to_cqrs_dicts(instances, using)):
+            instance.reset_cqrs_saves_count()
+            if instance_data is None:
+                logger.error(
+                    f"Can't produce message from master model '{sender.__name__}': "
+                    f"The instance doesn't exist (pk={instance.pk})",
+                )
+                payloads.append(None)
+                continue
+
+            churn_stats.add(sender.CQRS_ID, instance.pk)
+            previous_data = instance.get_tracked_fields_data()
+            meta = instance.get_cqrs_meta(
+                instance_data=instance_data,
+                previous_data=previous_data,
+                signal_type=signal_type,
+            )
+            payloads.append(
+                TransportPayload(
+                    signal_type,
+                    sender.CQRS_ID,
+                    instance_data,
+                    instance.pk,
+                    queue,
+                    previous_data,
+                    expires=expires,
+                    meta=meta,
+                ),
+            )
+
+        return payloads
@@ -5,3 +5,9 @@ import threading
 
 cqrs_state = threading.local()
 cqrs_state.bulk_relate_cm = None
+cqrs_state.buffer_revision_gaps = False
+cqrs_state.event_loop = None
+cqrs_state.applied_changes = None
+cqrs_state.projection_deltas = None
+cqrs_state.shard = None
+cqrs_state.publishing_batch = None
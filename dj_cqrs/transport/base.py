@@ -27,11 +27,28 @@ class BaseTransport:
         """
         raise NotImplementedError
 
+    @classmethod
+    def produce_batch(cls, payloads):
+        """
+        Send a batch of data from master models to replicas. Transports can override it
+        to publish the batch over a single connection.
+
+        Args:
+            payloads (list): Transport payloads from master models.
+        """
+        for payload in payloads:
+            cls.produce(payload)
+
     @staticmethod
     def consume(*args, **kwargs):
         """Receive data from master model."""
         raise NotImplementedError
 
+    @staticmethod
+    def get_queue_depth(*args, **kwargs):
+        """Returns number of messages, that are waiting in the consumer queue."""
+        raise NotImplementedError
+
     @staticmethod
     def clean_connection(*args, **kwargs):
         """Clean transport connection. Here you can close all connections that you have"""
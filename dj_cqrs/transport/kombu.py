@@ -13,10 +13,11 @@ from kombu import (
 from kombu.exceptions import KombuError
 from kombu.mixins import ConsumerMixin
 
-from dj_cqrs.constants import SignalType
+from dj_cqrs.constants import RESYNC_ROUTING_KEY_PREFIX, SignalType
 from dj_cqrs.controller import consumer
 from dj_cqrs.dataclasses import TransportPayload
 from dj_cqrs.registries import ReplicaRegistry
+from dj_cqrs.resync import flush_resync_requests
 from dj_cqrs.transport import BaseTransport
 from dj_cqrs.transport.mixins import LoggingMixin
 
@@ -25,7 +26,16 @@ logger = logging.getLogger('django-cqrs')
 
 
 class _KombuConsumer(ConsumerMixin):
-    def __init__(self, url, exchange_name, queue_name, prefetch_count, callback, cqrs_ids=None):
+    def __init__(
+        self,
+        url,
+        exchange_name,
+        queue_name,
+        prefetch_count,
+        callback,
+        cqrs_ids=None,
+        ready_callback=None,
+    ):
         self.connection = Connection(url)
         self.exchange = Exchange(
             exchange_name,
@@ -37,6 +47,7 @@ class _KombuConsumer(ConsumerMixin):
         self.callback = callback
         self.queues = []
         self.cqrs_ids = cqrs_ids
+        self.ready_callback = ready_callback
 
         self._init_queues()
 
@@ -72,6 +83,14 @@ class _KombuConsumer(ConsumerMixin):
             ),
         ]
 
+    def on_consume_ready(self, connection, channel, consumers, **kwargs):
+        if self.ready_callback:
+            self.ready_callback()
+
+    def on_iteration(self):
+        # Resync requests are sent, even if there are no more messages to consume
+        flush_resync_requests()
+
 
 class KombuTransport(LoggingMixin, BaseTransport):
     """Transport class for Kombu."""
@@ -84,11 +103,12 @@ class KombuTransport(LoggingMixin, BaseTransport):
         pass
 
     @classmethod
-    def consume(cls, cqrs_ids=None):
+    def consume(cls, cqrs_ids=None, ready_callback=None):
         """Receive data from master model.
 
         Args:
             cqrs_ids (str): cqrs ids.
+            ready_callback (callable): Called, when consumer is connected and starts consuming.
         """
         queue_name, prefetch_count = cls._get_consumer_settings()
         url, exchange_name = cls._get_common_settings()
@@ -100,6 +120,7 @@ class KombuTransport(LoggingMixin, BaseTransport):
             prefetch_count,
             cls._consume_message,
             cqrs_ids=cqrs_ids,
+            ready_callback=ready_callback,
         )
         consumer.run()
 
@@ -131,6 +152,40 @@ class KombuTransport(LoggingMixin, BaseTransport):
             if connection:
                 connection.close()
 
+    @classmethod
+    def produce_batch(cls, payloads):
+        """
+        Send a batch of data from master models to replicas over a single connection.
+
+        Args:
+            payloads (list): Transport payloads from master models.
+        """
+        url, exchange_name = cls._get_common_settings()
+
+        connection = None
+        produced = 0
+        try:
+            connection, channel = cls._get_producer_kombu_objects(url, exchange_name)
+            exchange = cls._create_exchange(exchange_name)
+            for payload in payloads:
+                cls._produce_message(channel, exchange, payload)
+                cls.log_produced(payload)
+                produced += 1
+        except KombuError:
+            logger.warning(
+                "CQRS batch couldn't be published: {0} of {1} payload(s) are left.".format(
+                    len(payloads) - produced,
+                    len(payloads),
+                ),
+            )
+        finally:
+            if connection:
+                connection.close()
+
+        # Remaining payloads are published one by one
+        for payload in payloads[produced:]:
+            cls.produce(payload)
+
     @classmethod
     def _consume_message(cls, body, message):
         try:
@@ -189,6 +244,8 @@ class KombuTransport(LoggingMixin, BaseTransport):
 
         if payload.signal_type == SignalType.SYNC and payload.queue:
             routing_key = 'cqrs.{0}.{1}'.format(payload.queue, routing_key)
+        elif payload.signal_type == SignalType.RESYNC:
+            routing_key = '{0}.{1}'.format(RESYNC_ROUTING_KEY_PREFIX, routing_key)
 
         return routing_key
 
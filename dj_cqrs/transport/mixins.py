@@ -78,6 +78,43 @@ class LoggingMixin:
             eta,
         )
 
+    @staticmethod
+    def log_buffered(payload, eta):
+        """
+        Args:
+            payload (dj_cqrs.dataclasses.TransportPayload): Transport payload from master model.
+            eta (datetime): Time, till which the message waits for missing revisions.
+        """
+        msg = 'CQRS is buffered: pk = %s (%s), correlation_id = %s, eta = %s.'
+        logger.info(msg, payload.pk, payload.cqrs_id, payload.correlation_id, eta)
+
+    @staticmethod
+    def log_superseded(payload):
+        """
+        Args:
+            payload (dj_cqrs.dataclasses.TransportPayload): Transport payload from master model.
+        """
+        msg = 'CQRS is superseded by delete: pk = %s (%s), correlation_id = %s.'
+        logger.info(msg, payload.pk, payload.cqrs_id, payload.correlation_id)
+
+    @staticmethod
+    def log_parked(payload):
+        """
+        Args:
+            payload (dj_cqrs.dataclasses.TransportPayload): Transport payload from master model.
+        """
+        msg = 'CQRS is parked: pk = %s (%s), correlation_id = %s.'
+        logger.info(msg, payload.pk, payload.cqrs_id, payload.correlation_id)
+
+    @staticmethod
+    def log_unparked(payload):
+        """
+        Args:
+            payload (dj_cqrs.dataclasses.TransportPayload): Transport payload from master model.
+        """
+        msg = 'CQRS is unparked: pk = %s (%s), correlation_id = %s.'
+        logger.info(msg, payload.pk, payload.cqrs_id, payload.correlation_id)
+
     @staticmethod
     def log_requeued(payload):
         """
@@ -18,14 +18,25 @@ from pika import (
 )
 from pika.adapters.utils.connection_workflow import AMQPConnectorException
 
-from dj_cqrs.constants import DEFAULT_DEAD_MESSAGE_TTL, SignalType
+from dj_cqrs import metrics
+from dj_cqrs.changes import collecting_applied_changes
+from dj_cqrs.constants import DEFAULT_DEAD_MESSAGE_TTL, RESYNC_ROUTING_KEY_PREFIX, SignalType
 from dj_cqrs.controller import consumer
 from dj_cqrs.dataclasses import TransportPayload
 from dj_cqrs.delay import DelayMessage, DelayQueue
+from dj_cqrs.prefetch import PrefetchController
 from dj_cqrs.registries import ReplicaRegistry
+from dj_cqrs.reorder import RevisionGapError, buffering_revision_gaps
+from dj_cqrs.resync import flush_resync_requests
 from dj_cqrs.transport import BaseTransport
 from dj_cqrs.transport.mixins import LoggingMixin
-from dj_cqrs.utils import get_delay_queue_max_size, get_messages_prefetch_count_per_worker
+from dj_cqrs.utils import (
+    get_delay_queue_max_size,
+    get_messages_prefetch_count_per_worker,
+    get_prefetch_time_budget,
+    get_reorder_buffer_size,
+    get_reorder_window,
+)
 
 
 logger = logging.getLogger('django-cqrs')
@@ -54,11 +65,12 @@ class RabbitMQTransport(LoggingMixin, BaseTransport):
         cls._producer_channel = None
 
     @classmethod
-    def consume(cls, cqrs_ids=None):
+    def consume(cls, cqrs_ids=None, ready_callback=None):
         """Receive data from master model.
 
         Args:
             cqrs_ids (str): cqrs ids.
+            ready_callback (callable): Called, when consumer is connected and starts consuming.
         """
         consumer_rabbit_settings = cls._get_consumer_settings()
         common_rabbit_settings = cls._get_common_settings()
@@ -66,22 +78,60 @@ class RabbitMQTransport(LoggingMixin, BaseTransport):
         while True:
             connection = None
             try:
-                delay_queue = DelayQueue(max_size=get_delay_queue_max_size())
+                delay_queue = DelayQueue(
+                    max_size=get_delay_queue_max_size(),
+                    reorder_buffer_size=get_reorder_buffer_size(),
+                )
+                prefetch_count = consumer_rabbit_settings[-1]
+                prefetch_controller = cls._get_prefetch_controller(prefetch_count)
+                if prefetch_controller:
+                    prefetch_count = prefetch_controller.prefetch_count
+
                 connection, channel, consumer_generator = cls._get_consumer_rmq_objects(
-                    *(common_rabbit_settings + consumer_rabbit_settings),
+                    *(common_rabbit_settings + consumer_rabbit_settings[:-1]),
+                    prefetch_count,
                     cqrs_ids=cqrs_ids,
                 )
 
+                is_consuming = False
+                messages = []
                 for method_frame, properties, body in consumer_generator:
+                    # Consumer is registered by the first iteration of the lazy generator
+                    if not is_consuming:
+                        is_consuming = True
+                        if ready_callback:
+                            ready_callback()
+
                     if method_frame is not None:
-                        cls._consume_message(
+                        messages.append((method_frame, properties, body))
+
+                        # Messages, that are already delivered within the prefetch window,
+                        # are consumed together to batch consecutive deletes
+                        if (
+                            (not prefetch_count or len(messages) < prefetch_count)
+                            and channel.get_waiting_message_count()
+                        ):
+                            continue
+
+                    if messages:
+                        started_at = time.monotonic()
+                        cls._consume_messages(channel, messages, delay_queue)
+                        if prefetch_controller:
+                            prefetch_controller.observe(
+                                len(messages),
+                                time.monotonic() - started_at,
+                            )
+
+                        messages = []
+
+                    cls._process_delay_messages(channel, delay_queue)
+                    flush_resync_requests()
+
+                    if prefetch_controller:
+                        prefetch_count = prefetch_controller.adjust(
                             channel,
-                            method_frame,
-                            properties,
-                            body,
-                            delay_queue,
+                            delay_queue.held_size(),
                         )
-                    cls._process_delay_messages(channel, delay_queue)
             except (
                 exceptions.AMQPError,
                 exceptions.ChannelError,
@@ -94,6 +144,26 @@ class RabbitMQTransport(LoggingMixin, BaseTransport):
                 if connection and not connection.is_closed:
                     connection.close()
 
+    @classmethod
+    def get_queue_depth(cls):
+        """Returns number of messages, that are waiting in the consumer queue.
+
+        Returns:
+            (int): Number of ready messages in the queue.
+        """
+        host, port, creds, _ = cls._get_common_settings()
+        queue_name = cls._get_consumer_settings()[0]
+
+        connection = BlockingConnection(
+            ConnectionParameters(host=host, port=port, credentials=creds),
+        )
+        try:
+            queue = connection.channel().queue_declare(queue_name, passive=True)
+            return queue.method.message_count
+        finally:
+            if not connection.is_closed:
+                connection.close()
+
     @classmethod
     def produce(cls, payload):
         """
@@ -104,6 +174,47 @@ class RabbitMQTransport(LoggingMixin, BaseTransport):
         """
         cls._produce_with_retries(payload, retries=cls.PRODUCER_RETRIES)
 
+    @classmethod
+    def produce_batch(cls, payloads):
+        """
+        Send a batch of data from master models to replicas over a single connection.
+
+        Args:
+            payloads (list): Transport payloads from master models.
+        """
+        connection = None
+        produced = 0
+        try:
+            rmq_settings = cls._get_common_settings()
+            exchange = rmq_settings[-1]
+            connection, channel = cls._create_connection(*rmq_settings)
+
+            for payload in payloads:
+                cls._produce_message(channel, exchange, payload)
+                cls.log_produced(payload)
+                produced += 1
+        except (
+            exceptions.AMQPError,
+            exceptions.ChannelError,
+            exceptions.ReentrancyError,
+            AMQPConnectorException,
+            AssertionError,
+        ) as e:
+            logger.warning(
+                "CQRS batch couldn't be published: {0} of {1} payload(s) are left. "
+                'Error: {2}.'.format(len(payloads) - produced, len(payloads), e.__class__.__name__),
+            )
+        finally:
+            if connection and not connection.is_closed:
+                try:
+                    connection.close()
+                except (exceptions.AMQPError, ConnectionError):
+                    logger.warning('Connection was closed or is closing. Skip it...')
+
+        # Remaining payloads are published one by one with retries
+        for payload in payloads[produced:]:
+            cls.produce(payload)
+
     @classmethod
     def _produce_with_retries(cls, payload, retries):
         try:
@@ -144,8 +255,111 @@ class RabbitMQTransport(LoggingMixin, BaseTransport):
 
             cls._produce_with_retries(payload, retries - 1)
 
+    @classmethod
+    def _consume_messages(cls, ch, messages, delay_queue):
+        # Applied changes are notified once for all delivered messages
+        with collecting_applied_changes():
+            cls._consume_prefetched_messages(ch, messages, delay_queue)
+
+    @classmethod
+    def _consume_prefetched_messages(cls, ch, messages, delay_queue):
+        if len(messages) == 1:
+            cls._consume_message(ch, *messages[0], delay_queue)
+            return
+
+        batch, batch_kind, batch_keys = [], None, set()
+        for method, _, body in messages:
+            payload = cls._parse_message(ch, method, body)
+            if payload is None:
+                continue
+
+            key = (payload.cqrs_id, payload.pk)
+            kind = cls._get_batch_kind(payload, delay_queue)
+            if batch and (kind != batch_kind or key in batch_keys):
+                cls._consume_batch(ch, batch_kind, batch, delay_queue)
+                batch, batch_keys = [], set()
+
+                # Failed messages of the consumed batch block their instances
+                kind = cls._get_batch_kind(payload, delay_queue)
+
+            if kind is None:
+                cls._consume_payload(ch, method.delivery_tag, payload, delay_queue)
+            else:
+                batch.append((method.delivery_tag, payload))
+                batch_kind = kind
+                batch_keys.add(key)
+
+        if batch:
+            cls._consume_batch(ch, batch_kind, batch, delay_queue)
+
+    @staticmethod
+    def _get_batch_kind(payload, delay_queue):
+        if payload.is_expired() or delay_queue.parking_lot.is_blocked(
+            (payload.cqrs_id, payload.pk),
+        ):
+            return
+
+        is_delete = payload.signal_type == SignalType.DELETE
+        if consumer.is_batch_consumable(payload.cqrs_id, payload.signal_type):
+            return ('handler', payload.cqrs_id, is_delete)
+
+        if is_delete and consumer.is_batch_deletable(payload.cqrs_id):
+            return ('delete', payload.cqrs_id)
+
+        if consumer.is_concurrently_consumable(payload.cqrs_id, payload.signal_type):
+            return ('concurrent',)
+
+    @classmethod
+    def _consume_batch(cls, ch, kind, batch, delay_queue):
+        if len(batch) == 1:
+            cls._consume_payload(ch, *batch[0], delay_queue)
+        elif kind[0] == 'delete':
+            cls._consume_deletes(ch, batch, delay_queue)
+        elif kind[0] == 'concurrent':
+            results = consumer.consume_concurrently([payload for _, payload in batch])
+            cls._complete_batch(ch, batch, results, delay_queue)
+        else:
+            results = consumer.consume_batch([payload for _, payload in batch])
+            cls._complete_batch(ch, batch, results, delay_queue)
+
+    @classmethod
+    def _consume_deletes(cls, ch, deletes, delay_queue):
+        try:
+            is_deleted = consumer.consume_deletes([payload for _, payload in deletes])
+        except Exception:
+            is_deleted = False
+            logger.error('CQRS service exception', exc_info=True)
+
+        if is_deleted:
+            for delivery_tag, payload in deletes:
+                cls.log_consumed(payload)
+                cls._complete_message(ch, delivery_tag, payload, delay_queue)
+
+            return
+
+        # Failed batches are consumed one by one to retry only failed messages
+        for delivery_tag, payload in deletes:
+            cls._consume_payload(ch, delivery_tag, payload, delay_queue)
+
+    @classmethod
+    def _complete_batch(cls, ch, batch, results, delay_queue):
+        for (delivery_tag, payload), result in zip(batch, results):
+            cls.log_consumed(payload)
+
+            exception = result if isinstance(result, Exception) else None
+            if result and exception is None:
+                cls._complete_message(ch, delivery_tag, payload, delay_queue)
+            else:
+                cls._fail_message(ch, delivery_tag, payload, exception, delay_queue)
+
     @classmethod
     def _consume_message(cls, ch, method, properties, body, delay_queue):
+        payload = cls._parse_message(ch, method, body)
+        if payload is not None:
+            cls._consume_payload(ch, method.delivery_tag, payload, delay_queue)
+
+    @classmethod
+    def _parse_message(cls, ch, method, body):
         try:
             dct = ujson.loads(body)
         except ValueError:
@@ -161,24 +375,54 @@ class RabbitMQTransport(LoggingMixin, BaseTransport):
                 ch.basic_reject(delivery_tag=method.delivery_tag, requeue=False)
                 return
 
-        payload = TransportPayload.from_message(dct)
+        return TransportPayload.from_message(dct)
+
+    @classmethod
+    def _consume_payload(cls, ch, delivery_tag, payload, delay_queue, reorder_eta=None):
         cls.log_consumed(payload)
 
-        delivery_tag = method.delivery_tag
         if payload.is_expired():
             cls._add_to_dead_letter_queue(ch, payload)
             cls._nack(ch, delivery_tag)
             return
 
+        key = (payload.cqrs_id, payload.pk)
+        parking_lot = delay_queue.parking_lot
+        if parking_lot.is_blocked(key):
+            # Later messages for the instance must not overtake the delayed one
+            parking_lot.park(key, delivery_tag, payload)
+            cls.log_parked(payload)
+            return
+
+        now = timezone.now()
+        reorder_window = get_reorder_window()
+        is_buffered = reorder_eta is not None
+        if not is_buffered:
+            reorder_eta = now + timedelta(seconds=reorder_window)
+
+        reorder_buffer = delay_queue.reorder_buffer
+        is_reorderable = bool(
+            reorder_window and (reorder_eta > now) and (not reorder_buffer.full()),
+        )
+
         instance, exception = None, None
         try:
-            instance = consumer.consume(payload)
+            with buffering_revision_gaps(is_reorderable):
+                instance = consumer.consume(payload)
+        except RevisionGapError:
+            # Message waits for missing revisions within the reorder window
+            reorder_buffer.put(key, DelayMessage(delivery_tag, payload, reorder_eta))
+            if not is_buffered:
+                metrics.increment(metrics.REPLICA_REORDER_BUFFERED)
+                cls.log_buffered(payload, reorder_eta)
+
+            return
         except Exception as e:
             exception = e
             logger.error('CQRS service exception', exc_info=True)
 
         if instance and exception is None:
-            cls._ack(ch, delivery_tag, payload)
+            cls._complete_message(ch, delivery_tag, payload, delay_queue)
         else:
             cls._fail_message(
                 ch,
@@ -188,6 +432,36 @@ class RabbitMQTransport(LoggingMixin, BaseTransport):
                 delay_queue,
             )
 
+    @classmethod
+    def _complete_message(cls, channel, delivery_tag, payload, delay_queue):
+        cls._ack(channel, delivery_tag, payload)
+
+        key = (payload.cqrs_id, payload.pk)
+        delay_queue.release(delay_queue.parking_lot.pop_dependants(key))
+        buffered_messages = delay_queue.reorder_buffer.pop(key)
+        if payload.signal_type == SignalType.DELETE:
+            buffered_messages = cls._drop_superseded_messages(
+                channel,
+                buffered_messages,
+                payload.instance_data.get('cqrs_revision'),
+            )
+
+        cls._consume_buffered_messages(channel, buffered_messages, delay_queue)
+
+    @classmethod
+    def _drop_superseded_messages(cls, channel, messages, delete_revision):
+        # Buffered messages older than an applied delete must not recreate the instance
+        pending_messages = []
+        for message in messages:
+            revision = message.payload.instance_data.get('cqrs_revision')
+            if delete_revision is None or revision is None or revision < delete_revision:
+                cls.log_superseded(message.payload)
+                cls._ack(channel, message.delivery_tag)
+            else:
+                pending_messages.append(message)
+
+        return pending_messages
+
     @classmethod
     def _fail_message(cls, channel, delivery_tag, payload, exception, delay_queue):
         cls.log_consumed_failed(payload)
@@ -200,6 +474,11 @@ class RabbitMQTransport(LoggingMixin, BaseTransport):
         if model_cls.should_retry_cqrs(payload.retries, exception):
             delay = model_cls.get_cqrs_retry_delay(payload.retries)
             cls._delay_message(channel, delivery_tag, payload, delay, delay_queue)
+            delay_queue.parking_lot.block(
+                (payload.cqrs_id, payload.pk),
+                delivery_tag,
+                dependencies=model_cls.get_cqrs_dependencies(payload.instance_data),
+            )
         else:
             cls._add_to_dead_letter_queue(channel, payload)
             cls._nack(channel, delivery_tag)
@@ -214,6 +493,7 @@ class RabbitMQTransport(LoggingMixin, BaseTransport):
                 requeue_message.delivery_tag,
                 requeue_message.payload,
             )
+            cls._unpark_messages(channel, requeue_message, delay_queue)
 
         eta = timezone.now() + timedelta(seconds=delay)
         delay_message = DelayMessage(delivery_tag, payload, eta)
@@ -249,6 +529,38 @@ class RabbitMQTransport(LoggingMixin, BaseTransport):
     def _process_delay_messages(cls, channel, delay_queue):
         for delay_message in delay_queue.get_ready():
             cls._requeue_message(channel, delay_message.delivery_tag, delay_message.payload)
+            cls._unpark_messages(channel, delay_message, delay_queue)
+
+        expired_messages = list(delay_queue.reorder_buffer.get_expired())
+        if expired_messages:
+            metrics.increment(metrics.REPLICA_REORDER_EXPIRED, len(expired_messages))
+            cls._consume_buffered_messages(channel, expired_messages, delay_queue)
+
+    @classmethod
+    def _consume_buffered_messages(cls, channel, buffered_messages, delay_queue):
+        for buffered_message in buffered_messages:
+            cls._consume_payload(
+                channel,
+                buffered_message.delivery_tag,
+                buffered_message.payload,
+                delay_queue,
+                reorder_eta=buffered_message.eta,
+            )
+
+    @classmethod
+    def _unpark_messages(cls, channel, delay_message, delay_queue):
+        # Parked messages are requeued right after the delayed one to keep the order
+        payload = delay_message.payload
+        parked_messages = delay_queue.parking_lot.unblock(
+            (payload.cqrs_id, payload.pk),
+            delay_message.delivery_tag,
+        )
+        for delivery_tag, parked_payload in parked_messages:
+            parked_payload.is_requeue = True
+
+            cls.produce(parked_payload)
+            cls._nack(channel, delivery_tag)
+            cls.log_unparked(parked_payload)
 
     @classmethod
     def _produce_message(cls, channel, exchange, payload, expiration=None):
@@ -272,6 +584,8 @@ class RabbitMQTransport(LoggingMixin, BaseTransport):
 
         if payload.signal_type == SignalType.SYNC and payload.queue:
             routing_key = 'cqrs.{0}.{1}'.format(payload.queue, routing_key)
+        elif payload.signal_type == SignalType.RESYNC:
+            routing_key = '{0}.{1}'.format(RESYNC_ROUTING_KEY_PREFIX, routing_key)
         elif getattr(payload, 'is_dead_letter', False):
             dead_letter_queue_name = cls._get_consumer_settings()[1]
             routing_key = 'cqrs.{0}.{1}'.format(dead_letter_queue_name, routing_key)
@@ -426,6 +740,12 @@ class RabbitMQTransport(LoggingMixin, BaseTransport):
             prefetch_count,
         )
 
+    @staticmethod
+    def _get_prefetch_controller(max_prefetch_count):
+        time_budget = get_prefetch_time_budget()
+        if time_budget:
+            return PrefetchController(max_prefetch_count, time_budget)
+
     @classmethod
     def _ack(cls, channel, delivery_tag, payload=None):
         channel.basic_ack(delivery_tag)
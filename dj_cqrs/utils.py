@@ -1,16 +1,35 @@
 #  Copyright © 2025 CloudBlue. All rights reserved.
 
 import logging
+import time
 from collections import defaultdict
 from contextlib import ContextDecorator
 from datetime import date, datetime, timedelta
 from uuid import UUID
 
 from django.conf import settings
-from django.db import transaction
+from django.db import close_old_connections, transaction
+from django.db.models.sql import UpdateQuery
 from django.utils import timezone
-
-from dj_cqrs.constants import DB_VENDOR_PG, SUPPORTED_TIMEOUT_DB_VENDORS
+from django.utils.module_loading import import_string
+
+from dj_cqrs.constants import (
+    DB_VENDOR_PG,
+    DB_VENDOR_SQLITE,
+    DEFAULT_MASTER_CHURN_STATS_SIZE,
+    DEFAULT_REPLICA_ASYNC_CONCURRENCY,
+    DEFAULT_REPLICA_CONNECTION_CHECK_INTERVAL,
+    DEFAULT_REPLICA_CONNECTION_CHECK_MESSAGES,
+    DEFAULT_REPLICA_PREFETCH_TIME_BUDGET,
+    DEFAULT_REPLICA_READ_CACHE_SIZE,
+    DEFAULT_REPLICA_READ_CACHE_TTL,
+    DEFAULT_REPLICA_REORDER_BUFFER_SIZE,
+    DEFAULT_REPLICA_REORDER_WINDOW,
+    DEFAULT_REPLICA_RESYNC_WINDOW,
+    DEFAULT_REPLICA_REVISION_CACHE_SIZE,
+    SQLITE_UPDATE_RETURNING_VERSION,
+    SUPPORTED_TIMEOUT_DB_VENDORS,
+)
 from dj_cqrs.logger import install_last_query_capturer
 from dj_cqrs.state import cqrs_state
 
@@ -33,6 +52,16 @@ def get_message_expiration_dt(message_ttl=None):
     return timezone.now() + timedelta(seconds=message_ttl)
 
 
+def get_churn_stats_size():
+    """Returns max number of instances per master model, that are tracked in churn statistics.
+
+    :return: Positive integer number or 0 if churn statistics are disabled
+    :rtype: int
+    """
+    master_settings = settings.CQRS.get('master', {})
+    return master_settings.get('CQRS_CHURN_STATS_SIZE') or DEFAULT_MASTER_CHURN_STATS_SIZE
+
+
 def get_delay_queue_max_size():
     """Returns max allowed number of "waiting" messages in the delay queue.
 
@@ -59,6 +88,155 @@ def get_messages_prefetch_count_per_worker():
     return delay_queue_max_size + 1
 
 
+def get_prefetch_time_budget():
+    """Returns seconds of processing for messages, that are prefetched by a single worker.
+
+    :return: Positive number or 0 if prefetch count is static
+    :rtype: float
+    """
+    replica_settings = settings.CQRS.get('replica', {})
+    return (
+        replica_settings.get('CQRS_PREFETCH_TIME_BUDGET') or DEFAULT_REPLICA_PREFETCH_TIME_BUDGET
+    )
+
+
+def get_shard_router():
+    """Returns function, that maps replica instances to DB aliases of the shards.
+
+    :return: Function of (cqrs_id, pk) arguments or None if sharding isn't used
+    :rtype: typing.Callable or None
+    """
+    shard_router = settings.CQRS.get('replica', {}).get('CQRS_SHARD_ROUTER')
+    if isinstance(shard_router, str):
+        return import_string(shard_router)
+
+    return shard_router
+
+
+def get_revision_cache_size():
+    """Returns max number of replica instance revisions, that are cached by a single worker.
+
+    :return: Positive integer number or 0 if cache is disabled
+    :rtype: int
+    """
+    replica_settings = settings.CQRS.get('replica', {})
+    return replica_settings.get('CQRS_REVISION_CACHE_SIZE') or DEFAULT_REPLICA_REVISION_CACHE_SIZE
+
+
+def get_read_cache_settings():
+    """Returns settings of the read cache for replica instances.
+
+    :return: Max number of instances, that are cached by a single process (0 if process-local
+        cache is disabled), TTL in seconds and Django cache alias or None
+    :rtype: tuple
+    """
+    replica_settings = settings.CQRS.get('replica', {})
+    return (
+        replica_settings.get('CQRS_READ_CACHE_SIZE') or DEFAULT_REPLICA_READ_CACHE_SIZE,
+        replica_settings.get('CQRS_READ_CACHE_TTL') or DEFAULT_REPLICA_READ_CACHE_TTL,
+        replica_settings.get('CQRS_READ_CACHE_BACKEND'),
+    )
+
+
+def get_reorder_window():
+    """Returns how long packages with revision gaps wait for the missing revisions.
+
+    :return: Positive number of seconds or 0 if reordering is disabled
+    :rtype: int
+    """
+    replica_settings = settings.CQRS.get('replica', {})
+    return replica_settings.get('CQRS_REORDER_WINDOW') or DEFAULT_REPLICA_REORDER_WINDOW
+
+
+def get_reorder_buffer_size():
+    """Returns max number of packages with revision gaps, that are buffered by a single worker.
+
+    :return: Positive integer number
+    :rtype: int
+    """
+    replica_settings = settings.CQRS.get('replica', {})
+    return (
+        replica_settings.get('CQRS_REORDER_BUFFER_SIZE') or DEFAULT_REPLICA_REORDER_BUFFER_SIZE
+    )
+
+
+def get_resync_window():
+    """Returns how long resync requests are aggregated before they are sent to the master.
+
+    :return: Positive number of seconds or 0 if resync requests are disabled
+    :rtype: int
+    """
+    replica_settings = settings.CQRS.get('replica', {})
+    return replica_settings.get('CQRS_RESYNC_WINDOW') or DEFAULT_REPLICA_RESYNC_WINDOW
+
+
+def get_async_concurrency():
+    """Returns max number of coroutine handlers, that are run concurrently by a single worker.
+
+    :return: Positive integer number
+    :rtype: int
+    """
+    replica_settings = settings.CQRS.get('replica', {})
+    return (
+        replica_settings.get('CQRS_ASYNC_CONCURRENCY') or DEFAULT_REPLICA_ASYNC_CONCURRENCY
+    )
+
+
+def get_connection_check_settings():
+    """Returns how often DB connections are checked for usability by a single worker.
+
+    :return: Interval in seconds and number of messages between checks, 0 to check every message
+    :rtype: tuple
+    """
+    replica_settings = settings.CQRS.get('replica', {})
+    return (
+        replica_settings.get(
+            'CQRS_CONNECTION_CHECK_INTERVAL',
+            DEFAULT_REPLICA_CONNECTION_CHECK_INTERVAL,
+        ),
+        replica_settings.get(
+            'CQRS_CONNECTION_CHECK_MESSAGES',
+            DEFAULT_REPLICA_CONNECTION_CHECK_MESSAGES,
+        ),
+    )
+
+
+class ConnectionsHealthCheck:
+    """Closes unusable or obsolete DB connections not more often, than on the configured
+    time or message count interval.
+    """
+
+    def __init__(self):
+        self._checked_at = None
+        self._messages = 0
+
+    def check(self):
+        """Counts consumed message and closes old DB connections, if the interval is passed.
+
+        :return: Flag, if DB connections were checked.
+        :rtype: bool
+        """
+        self._messages += 1
+
+        now = time.monotonic()
+        if self._checked_at is not None:
+            interval, max_messages = get_connection_check_settings()
+            if (now - self._checked_at < interval) and (self._messages < max_messages):
+                return False
+
+        close_old_connections()
+        self._checked_at = now
+        self._messages = 0
+        return True
+
+    def invalidate(self):
+        """Forces DB connections check for the next consumed message."""
+        self._checked_at = None
+
+
+connections_health_check = ConnectionsHealthCheck()
+
+
 def get_json_valid_value(value):
     return str(value) if isinstance(value, (date, datetime, UUID)) else value
 
@@ -74,6 +252,11 @@ def apply_query_timeouts(model_cls):  # pragma: no cover
     if conn_vendor not in SUPPORTED_TIMEOUT_DB_VENDORS:
         return
 
+    # Timeout is set for the DB session, so it's applied again only after reconnect
+    conn.ensure_connection()
+    if getattr(conn, '_cqrs_query_timeout', None) == (conn.connection, query_timeout):
+        return
+
     if conn_vendor == DB_VENDOR_PG:
         statement = 'SET statement_timeout TO %s'
     else:
@@ -82,9 +265,63 @@ def apply_query_timeouts(model_cls):  # pragma: no cover
     with conn.cursor() as cursor:
         cursor.execute(statement, params=(query_timeout,))
 
+    # Session changes are rolled back together with the outer transaction
+    if not conn.in_atomic_block:
+        conn._cqrs_query_timeout = (conn.connection, query_timeout)
+
     install_last_query_capturer(model_cls)
 
 
+def supports_update_returning(connection):
+    """Checks, if the DB backend can return column values from UPDATE statements.
+
+    :param connection: Django DB connection.
+    :rtype: bool
+    """
+    vendor = getattr(connection, 'vendor', '')
+    if vendor == DB_VENDOR_PG:
+        return True
+
+    if vendor == DB_VENDOR_SQLITE:
+        return connection.Database.sqlite_version_info >= SQLITE_UPDATE_RETURNING_VERSION
+
+    return False
+
+
+def update_returning(qs, values, fields):
+    """Updates a single row and reads back values of the fields with the same statement.
+
+    :param django.db.models.QuerySet qs: Queryset, that is filtered to a single row.
+    :param list values: Update values in the format of `Model._do_update()`.
+    :param list fields: Model fields, that are returned.
+    :return: Values of the fields or None, if no row is updated.
+    :rtype: tuple or None
+    """
+    query = qs.query.chain(UpdateQuery)
+    query.add_update_fields(values)
+    query.annotations = {}
+    compiler = query.get_compiler(qs.db)
+    connection = compiler.connection
+
+    sql, params = compiler.as_sql()
+    sql = '{0} RETURNING {1}'.format(
+        sql,
+        ', '.join(connection.ops.quote_name(f.column) for f in fields),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+
+    if row is None:
+        return None
+
+    converters = compiler.get_converters([f.get_col(qs.model._meta.db_table) for f in fields])
+    if converters:
+        row = next(iter(compiler.apply_converters([row], converters)))
+
+    return tuple(row)
+
+
 class _BulkRelateCM(ContextDecorator):
     def __init__(self, cqrs_id=None):
         self._cqrs_id = cqrs_id
@@ -0,0 +1 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
@@ -0,0 +1,58 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+"""Microbenchmark of the replica update path: mapping, change detection and assignment.
+
+Database writes are disabled, so only per-message CPU is measured.
+
+Usage: python -m tests.benchmarks.replica_update [calls]
+"""
+
+import os
+import sys
+import timeit
+
+import django
+
+
+def main(calls=100000, repeat=10):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tests.dj.settings')
+    django.setup()
+
+    from django.utils.timezone import now
+
+    from tests.dj_replica.models import BasicFieldsModelRef
+
+    instance = BasicFieldsModelRef(
+        int_field=1,
+        char_field='text',
+        bool_field=True,
+        float_field=1.5,
+        cqrs_revision=0,
+        cqrs_updated=now(),
+    )
+    instance.save = lambda *args, **kwargs: None
+    master_data = {
+        'int_field': 1,
+        'char_field': 'new_text',
+        'bool_field': True,
+        'date_field': '2021-04-30',
+        'datetime_field': '2021-04-30 11:50:05.164341+00:00',
+        'float_field': 1.5,
+        'url_field': None,
+        'uuid_field': None,
+        'cqrs_revision': 1,
+        'cqrs_updated': '2021-04-30 11:50:05.164341+00:00',
+    }
+
+    mapped_data = BasicFieldsModelRef.cqrs._map_save_data(master_data)
+    benchmarks = (
+        ('map', lambda: BasicFieldsModelRef.cqrs._map_save_data(master_data)),
+        ('update', lambda: instance.cqrs_update(False, mapped_data)),
+    )
+    for name, func in benchmarks:
+        best = min(timeit.repeat(func, number=calls, repeat=repeat))
+        print('{0}: {1:.2f} us/msg'.format(name, best / calls * 1e6))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
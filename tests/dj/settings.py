@@ -67,6 +67,12 @@ else:
         },
     }
 
+# Replica shard for sharded storage tests
+DATABASES['shard'] = dict(
+    DATABASES['default'],
+    NAME='{0}_shard'.format(DATABASES['default']['NAME']),
+)
+
 LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'UTC'
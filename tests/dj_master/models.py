@@ -208,3 +208,11 @@ class WithM2MModel(MasterMixin):
 
 class FailModel(MasterMixin, models.Model):
     CQRS_ID = 'fail'
+
+
+class JSONFieldModel(MasterMixin, models.Model):
+    CQRS_ID = 'json'
+    CQRS_SKIP_UNCHANGED = True
+
+    id = models.IntegerField(primary_key=True)
+    json_field = models.JSONField(null=True)
@@ -1,5 +1,7 @@
 #  Copyright © 2025 CloudBlue. All rights reserved.
 
+import asyncio
+
 from django.db import DatabaseError, models
 
 from dj_cqrs.metas import ReplicaMeta
@@ -123,6 +125,22 @@ class Book(models.Model):
     author = models.ForeignKey(AuthorRef, on_delete=models.CASCADE)
 
 
+class OrderRef(ReplicaMixin):
+    CQRS_ID = 'order'
+    CQRS_NESTED = {'lines': ('dj_replica.OrderLine', 'order')}
+
+    id = models.IntegerField(primary_key=True)
+    number = models.CharField(max_length=20)
+
+
+class OrderLine(models.Model):
+    id = models.IntegerField(primary_key=True)
+    product = models.CharField(max_length=20)
+    quantity = models.IntegerField(default=1)
+
+    order = models.ForeignKey(OrderRef, related_name='lines', on_delete=models.CASCADE)
+
+
 class Article(ReplicaMixin):
     CQRS_ID = 'article'
 
@@ -206,3 +224,54 @@ for cqrs_id in ('document1', 'document2'):
             return cls.CQRS_ID, master_data, kwargs
 
     ReplicaMeta.register(DocCls)
+
+
+class BatchHandledModel(RawReplicaMixin):
+    CQRS_ID = 'batch_handled'
+
+    @classmethod
+    def cqrs_save(cls, master_data, **kwargs):
+        return master_data.get('ok', True)
+
+    @classmethod
+    def cqrs_delete(cls, master_data, **kwargs):
+        return True
+
+    @classmethod
+    def cqrs_save_batch(cls, items):
+        return [item.instance_data.get('ok', True) for item in items]
+
+    @classmethod
+    def cqrs_delete_batch(cls, items):
+        return [True for _ in items]
+
+
+ReplicaMeta.register(BatchHandledModel)
+
+
+class AsyncHandledModel(RawReplicaMixin):
+    CQRS_ID = 'async_handled'
+
+    running = 0
+    max_running = 0
+
+    @classmethod
+    async def cqrs_save(cls, master_data, **kwargs):
+        cls.running += 1
+        cls.max_running = max(cls.max_running, cls.running)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            cls.running -= 1
+
+        if master_data.get('error'):
+            raise ValueError(master_data['error'])
+
+        return master_data.get('ok', True)
+
+    @classmethod
+    async def cqrs_delete(cls, master_data, **kwargs):
+        return True
+
+
+ReplicaMeta.register(AsyncHandledModel)
@@ -0,0 +1,205 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+from types import SimpleNamespace
+
+import pytest
+
+from dj_cqrs.cache import (
+    BackendReadCache,
+    LocalReadCache,
+    RevisionCache,
+    get_read_cache,
+    get_revision_cache,
+)
+
+
+def test_revision_cache_get_set():
+    cache = RevisionCache(max_size=10)
+
+    assert cache.get('basic', 1) is None
+
+    cache.set('basic', 1, 5)
+    cache.set('basic', 1, 6)
+
+    assert cache.get('basic', 1) == 6
+    assert cache.get('other', 1) is None
+    assert len(cache) == 1
+
+
+def test_revision_cache_lru_eviction():
+    cache = RevisionCache(max_size=2)
+
+    cache.set('basic', 1, 1)
+    cache.set('basic', 2, 2)
+    cache.get('basic', 1)
+    cache.set('basic', 3, 3)
+
+    assert cache.get('basic', 1) == 1
+    assert cache.get('basic', 2) is None
+    assert cache.get('basic', 3) == 3
+
+
+def test_revision_cache_invalidate_and_clear():
+    cache = RevisionCache(max_size=2)
+    cache.set('basic', 1, 1)
+    cache.set('basic', 2, 2)
+
+    cache.invalidate('basic', 1)
+    cache.invalidate('basic', 100)
+    assert cache.get('basic', 1) is None
+    assert len(cache) == 1
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_revision_cache_invalid_size():
+    with pytest.raises(AssertionError):
+        RevisionCache(max_size=0)
+
+
+def test_get_revision_cache_disabled():
+    assert get_revision_cache() is None
+
+
+def test_get_revision_cache(settings):
+    settings.CQRS['replica']['CQRS_REVISION_CACHE_SIZE'] = 10
+
+    cache = get_revision_cache()
+    assert cache.max_size == 10
+    assert get_revision_cache() is cache
+
+    settings.CQRS['replica']['CQRS_REVISION_CACHE_SIZE'] = 20
+    assert get_revision_cache().max_size == 20
+
+
+def _instance(name, revision=0):
+    return SimpleNamespace(name=name, cqrs_revision=revision)
+
+
+def test_local_read_cache_get_set_invalidate():
+    cache = LocalReadCache(max_size=10, ttl=60)
+    a, b = _instance('a'), _instance('b')
+
+    cache.set_many('basic', {1: a, 2: b})
+
+    assert cache.get_many('basic', [1, 2, 3]) == {1: a, 2: b}
+    assert cache.get_many('other', [1]) == {}
+
+    cache.invalidate_many('basic', {1: 1, 100: None})
+    assert cache.get_many('basic', [1, 2, 100]) == {2: b}
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_local_read_cache_keeps_newer_revisions():
+    cache = LocalReadCache(max_size=10, ttl=60)
+    new = _instance('new', 2)
+
+    cache.set_many('basic', {1: new})
+    cache.set_many('basic', {1: _instance('old', 1)})
+    assert cache.get_many('basic', [1]) == {1: new}
+
+    cache.invalidate_many('basic', {1: 3, 2: None})
+    cache.set_many('basic', {1: new, 2: _instance('deleted', 5)})
+    assert cache.get_many('basic', [1, 2]) == {}
+
+    newest = _instance('newest', 3)
+    cache.set_many('basic', {1: newest})
+    assert cache.get_many('basic', [1]) == {1: newest}
+
+
+def test_local_read_cache_lru_eviction():
+    cache = LocalReadCache(max_size=2, ttl=60)
+    a, b, c = _instance('a'), _instance('b'), _instance('c')
+
+    cache.set_many('basic', {1: a, 2: b})
+    cache.get_many('basic', [1])
+    cache.set_many('basic', {3: c})
+
+    assert cache.get_many('basic', [1, 2, 3]) == {1: a, 3: c}
+
+
+def test_local_read_cache_ttl(mocker):
+    monotonic = mocker.patch('dj_cqrs.cache.time.monotonic', return_value=100)
+    cache = LocalReadCache(max_size=2, ttl=60)
+    a = _instance('a')
+    cache.set_many('basic', {1: a})
+    cache.invalidate_many('basic', {2: 1})
+
+    monotonic.return_value = 159
+    assert cache.get_many('basic', [1]) == {1: a}
+
+    monotonic.return_value = 160
+    assert cache.get_many('basic', [1]) == {}
+    assert len(cache) == 1
+
+    # Expired invalidation doesn't block caching
+    cache.set_many('basic', {2: a})
+    assert cache.get_many('basic', [2]) == {2: a}
+
+
+def test_local_read_cache_invalid_size():
+    with pytest.raises(AssertionError):
+        LocalReadCache(max_size=0, ttl=60)
+
+
+def test_backend_read_cache():
+    cache = BackendReadCache('default', ttl=60)
+    cache.clear()
+
+    cache.set_many('basic', {1: _instance('a'), 2: _instance('b')})
+    cache.invalidate_many('basic', {2: 1})
+
+    assert {pk: i.name for pk, i in cache.get_many('basic', [1, 2]).items()} == {1: 'a'}
+    assert cache.get_many('other', [1]) == {}
+
+    cache.clear()
+    assert cache.get_many('basic', [1]) == {}
+
+
+def test_backend_read_cache_keeps_newer_revisions():
+    cache = BackendReadCache('default', ttl=60)
+    cache.clear()
+
+    cache.set_many('basic', {1: _instance('new', 2)})
+    cache.invalidate_many('basic', {2: 3, 3: None})
+    cache.set_many(
+        'basic',
+        {1: _instance('old', 1), 2: _instance('old', 2), 3: _instance('deleted', 5)},
+    )
+    assert {pk: i.name for pk, i in cache.get_many('basic', [1, 2, 3]).items()} == {1: 'new'}
+
+    cache.set_many('basic', {1: _instance('newest', 3), 2: _instance('newest', 3)})
+    assert {pk: i.name for pk, i in cache.get_many('basic', [1, 2]).items()} == {
+        1: 'newest',
+        2: 'newest',
+    }
+
+    cache.clear()
+
+
+def test_get_read_cache_disabled():
+    assert get_read_cache() is None
+
+
+def test_get_read_cache_local(settings):
+    settings.CQRS['replica']['CQRS_READ_CACHE_SIZE'] = 10
+
+    cache = get_read_cache()
+    assert isinstance(cache, LocalReadCache)
+    assert (cache.max_size, cache.ttl) == (10, 60)
+    assert get_read_cache() is cache
+
+    settings.CQRS['replica']['CQRS_READ_CACHE_TTL'] = 5
+    assert get_read_cache().ttl == 5
+
+
+def test_get_read_cache_backend(settings):
+    settings.CQRS['replica']['CQRS_READ_CACHE_BACKEND'] = 'default'
+
+    cache = get_read_cache()
+    assert isinstance(cache, BackendReadCache)
+    assert (cache.alias, cache.ttl) == ('default', 60)
+    assert get_read_cache() is cache
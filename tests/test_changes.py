@@ -0,0 +1,111 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+import pytest
+from django.db import transaction
+from django.utils.timezone import now
+
+from dj_cqrs.changes import collecting_applied_changes, record_applied_change
+from dj_cqrs.constants import SignalType
+from dj_cqrs.controller.consumer import consume, consume_deletes
+from dj_cqrs.dataclasses import ReplicaChange, TransportPayload
+from dj_cqrs.signals import post_cqrs_apply
+from tests.dj_replica.models import BasicFieldsModelRef
+
+
+@pytest.fixture
+def receiver(mocker):
+    receiver = mocker.MagicMock()
+    post_cqrs_apply.connect(receiver, weak=False)
+    yield receiver
+    post_cqrs_apply.disconnect(receiver)
+
+
+def _change(pk, revision=1):
+    return ReplicaChange('basic', pk, revision - 1, revision, SignalType.SAVE)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_changes_are_sent_once(receiver):
+    with collecting_applied_changes():
+        record_applied_change(_change(1))
+        with collecting_applied_changes():
+            record_applied_change(_change(2))
+
+        receiver.assert_not_called()
+
+    receiver.assert_called_once()
+    assert receiver.call_args[1]['changes'] == [_change(1), _change(2)]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rolled_back_changes_are_not_sent(receiver):
+    with collecting_applied_changes():
+        with transaction.atomic():
+            record_applied_change(_change(1))
+
+        try:
+            with transaction.atomic():
+                record_applied_change(_change(2))
+                raise ValueError
+        except ValueError:
+            pass
+
+    assert receiver.call_args[1]['changes'] == [_change(1)]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_no_changes(receiver):
+    with collecting_applied_changes():
+        pass
+
+    receiver.assert_not_called()
+
+
+def test_changes_are_not_collected_without_receivers():
+    with collecting_applied_changes():
+        record_applied_change(_change(1))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_receiver_error(caplog):
+    def failing_receiver(**kwargs):
+        raise ValueError('receiver error')
+
+    post_cqrs_apply.connect(failing_receiver)
+    try:
+        with collecting_applied_changes():
+            record_applied_change(_change(1))
+    finally:
+        post_cqrs_apply.disconnect(failing_receiver)
+
+    assert 'CQRS post apply receiver' in caplog.text
+
+
+@pytest.mark.django_db(transaction=True)
+def test_consumed_changes(receiver):
+    data = {'int_field': 1, 'char_field': 'text', 'cqrs_revision': 0, 'cqrs_updated': now()}
+    consume(TransportPayload(SignalType.SAVE, 'basic', data, 1))
+
+    data = dict(data, cqrs_revision=1, char_field='new')
+    consume(
+        TransportPayload(
+            SignalType.SYNC,
+            'basic',
+            data,
+            1,
+            previous_data={'char_field': 'text'},
+        ),
+    )
+    consume_deletes(
+        [TransportPayload(SignalType.DELETE, 'basic', {'id': 1, **data}, 1)] * 2,
+    )
+
+    assert [c[1]['changes'] for c in receiver.call_args_list] == [
+        [ReplicaChange('basic', 1, None, 0, SignalType.SAVE)],
+        [ReplicaChange('basic', 1, 0, 1, SignalType.SYNC, ('char_field',))],
+        [
+            ReplicaChange('basic', 1, None, 1, SignalType.DELETE),
+            ReplicaChange('basic', 1, None, 1, SignalType.DELETE),
+        ],
+    ]
+    assert not BasicFieldsModelRef.objects.exists()
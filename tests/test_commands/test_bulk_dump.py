@@ -5,7 +5,7 @@ import ujson
 from django.core.management import CommandError, call_command
 from django.db import transaction
 
-from tests.dj_master.models import Author, Publisher
+from tests.dj_master.models import Author, BasicFieldsModel, Publisher
 from tests.test_commands.utils import remove_file
 from tests.utils import db_error
 
@@ -89,6 +89,29 @@ def tests_dumps_more_than_batch(capsys):
     assert 'Done!\n149 instance(s) saved.\n149 instance(s) processed.' in captured.err
 
 
+@pytest.mark.django_db
+def test_dumps_values_without_serializer(capsys, mocker, django_assert_num_queries):
+    remove_file('basic.dump')
+    instances = [
+        BasicFieldsModel.objects.create(int_field=pk, char_field='text', date_field='2020-01-01')
+        for pk in (1, 2)
+    ]
+    expected = [instance.to_cqrs_dict() for instance in instances]
+    to_cqrs_dict = mocker.spy(BasicFieldsModel, 'to_cqrs_dict')
+
+    # Two counts and a single select of values
+    with django_assert_num_queries(3):
+        call_command(COMMAND_NAME, '--cqrs-id=basic')
+
+    with open('basic.dump', 'r') as f:
+        lines = f.readlines()
+        assert lines[0].strip() == 'basic'
+        assert [ujson.loads(ln) for ln in lines[1:]] == expected
+
+    to_cqrs_dict.assert_not_called()
+    remove_file('basic.dump')
+
+
 @pytest.mark.django_db
 def test_error(capsys, mocker):
     remove_file('author.dump')
@@ -103,6 +126,32 @@ def test_error(capsys, mocker):
     assert '0 instance(s) saved.' in captured.err
 
 
+@pytest.mark.django_db
+def test_error_without_serializer(capsys, mocker):
+    remove_file('basic.dump')
+    for pk in (1, 2):
+        BasicFieldsModel.objects.create(int_field=pk, char_field='text')
+
+    plan = BasicFieldsModel._cqrs_serialization_plan
+    serialize_values = plan.serialize_values
+    mocker.patch.object(
+        type(plan),
+        'serialize_values',
+        lambda self, row: serialize_values(row) if row['int_field'] == 2 else 1 / 0,
+    )
+    call_command(COMMAND_NAME, '--cqrs-id=basic')
+
+    captured = capsys.readouterr()
+    assert 'Dump record failed for pk=1: ZeroDivisionError' in captured.err
+    assert '1 instance(s) saved.' in captured.err
+    assert '2 instance(s) processed.' in captured.err
+
+    with open('basic.dump', 'r') as f:
+        assert [ujson.loads(ln)['int_field'] for ln in f.readlines()[1:]] == [2]
+
+    remove_file('basic.dump')
+
+
 @pytest.mark.django_db
 def test_progress(capsys):
     remove_file('author.dump')
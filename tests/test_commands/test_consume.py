@@ -7,7 +7,8 @@ from pathlib import Path
 import pytest
 from django.core.management import CommandError, call_command
 
-from dj_cqrs.management.commands.cqrs_consume import WorkersManager, consume
+from dj_cqrs.management.commands.cqrs_consume import WorkersAutoscaler, WorkersManager, consume
+from dj_cqrs.transport.rabbit_mq import RabbitMQTransport
 
 
 COMMAND_NAME = 'cqrs_consume'
@@ -30,6 +31,13 @@ def test_no_arguments(mocker, reload_transport):
         ignore_paths=None,
         sigint_timeout=5,
         sigkill_timeout=1,
+        max_workers=None,
+        scale_up_depth=1000,
+        scale_down_depth=100,
+        scale_cooldown=60,
+        scale_interval=10,
+        restart_wave_size=1,
+        ready_timeout=30,
     )
 
 
@@ -51,6 +59,13 @@ def test_with_arguments(mocker, reload_transport):
         ignore_paths=['/path1', '/path2'],
         sigint_timeout=5,
         sigkill_timeout=1,
+        max_workers=None,
+        scale_up_depth=1000,
+        scale_down_depth=100,
+        scale_cooldown=60,
+        scale_interval=10,
+        restart_wave_size=1,
+        ready_timeout=30,
     )
 
 
@@ -66,9 +81,63 @@ def test_several_cqrs_id(mocker, reload_transport):
         ignore_paths=None,
         sigint_timeout=5,
         sigkill_timeout=1,
+        max_workers=None,
+        scale_up_depth=1000,
+        scale_down_depth=100,
+        scale_cooldown=60,
+        scale_interval=10,
+        restart_wave_size=1,
+        ready_timeout=30,
     )
 
 
+def test_with_autoscaling_arguments(mocker, reload_transport):
+    mocked_worker = mocker.patch('dj_cqrs.management.commands.cqrs_consume.WorkersManager')
+
+    call_command(
+        COMMAND_NAME,
+        '--workers=2',
+        '--max-workers=5',
+        '--scale-up-depth=500',
+        '--scale-down-depth=10',
+        '--scale-cooldown=30',
+        '--scale-interval=5',
+    )
+
+    mocked_worker.assert_called_once_with(
+        consume_kwargs={},
+        workers=2,
+        reload=False,
+        ignore_paths=None,
+        sigint_timeout=5,
+        sigkill_timeout=1,
+        max_workers=5,
+        scale_up_depth=500,
+        scale_down_depth=10,
+        scale_cooldown=30,
+        scale_interval=5,
+        restart_wave_size=1,
+        ready_timeout=30,
+    )
+
+
+@pytest.mark.parametrize(
+    'args, error',
+    (
+        (('--workers=3', '--max-workers=2'), 'Max workers number should be greater'),
+        (
+            ('--max-workers=2', '--scale-up-depth=10', '--scale-down-depth=10'),
+            'Scale up depth should be greater than scale down depth.',
+        ),
+    ),
+)
+def test_wrong_autoscaling_arguments(reload_transport, args, error):
+    with pytest.raises(CommandError) as e:
+        call_command(COMMAND_NAME, *args)
+
+    assert error in str(e)
+
+
 def test_wrong_cqrs_id(reload_transport):
     with pytest.raises(CommandError) as e:
         call_command(COMMAND_NAME, cqrs_id=['author', 'random', 'no_db'])
@@ -131,6 +200,7 @@ def test_worker_manager_run_with_reload(mocker):
     worker = WorkersManager(
         {'cqrs_ids': {'author', 'basic', 'no_db'}},
         reload=True,
+        ready_timeout=0,
     )
     worker.stop_event.wait = mocker.MagicMock()
 
@@ -171,3 +241,214 @@ def test_consume(mocker):
 
     mocked_setup.assert_called_once()
     mocked_consume.assert_called_once_with(**consume_kwargs)
+
+
+def test_consume_ready_event(mocker):
+    mocker.patch('django.setup')
+    mocked_consume = mocker.patch.object(RabbitMQTransport, 'consume', autospec=True)
+    mocker.patch('dj_cqrs.transport.current_transport', RabbitMQTransport)
+    ready_event = mocker.MagicMock()
+
+    consume(ready_event=ready_event, cqrs_ids={'author'})
+
+    mocked_consume.assert_called_once_with(cqrs_ids={'author'}, ready_callback=ready_event.set)
+    ready_event.set.assert_not_called()
+
+
+def test_consume_ready_event_not_supported_by_transport(mocker):
+    mocker.patch('django.setup')
+    mocked_consume = mocker.patch('dj_cqrs.transport.current_transport.consume')
+    mocker.patch('dj_cqrs.management.commands.cqrs_consume.signature')
+    ready_event = mocker.MagicMock()
+
+    consume(ready_event=ready_event)
+
+    mocked_consume.assert_called_once_with()
+    ready_event.set.assert_called_once()
+
+
+def _mock_processes(mocker, count):
+    processes = [mocker.MagicMock(pid=pid) for pid in range(count)]
+    return mocker.patch(
+        'dj_cqrs.management.commands.cqrs_consume.start_process',
+        side_effect=processes,
+    )
+
+
+def test_worker_manager_start_passes_ready_event(mocker):
+    mocked_start_process = _mock_processes(mocker, 1)
+
+    worker = WorkersManager({'cqrs_ids': {'author'}})
+    worker.start()
+
+    consume_kwargs = mocked_start_process.call_args[0][3]
+    assert consume_kwargs['cqrs_ids'] == {'author'}
+    assert consume_kwargs['ready_event'] is worker._ready_events[0]
+
+
+def test_worker_manager_rolling_restart(mocker):
+    _mock_processes(mocker, 6)
+    events = []
+    mocker.patch.object(
+        WorkersManager,
+        '_wait_ready',
+        side_effect=lambda processes: events.append(('ready', [p.pid for p in processes])),
+    )
+    mocker.patch.object(
+        WorkersManager,
+        '_stop_process',
+        side_effect=lambda process: events.append(('stop', process.pid)),
+    )
+
+    worker = WorkersManager({}, workers=3, restart_wave_size=2)
+    worker.start()
+    worker.restart()
+
+    assert [p.pid for p in worker.pool] == [3, 4, 5]
+    assert events == [('ready', [3, 4]), ('stop', 0), ('stop', 1), ('ready', [5]), ('stop', 2)]
+
+
+def test_worker_manager_stop_the_world_restart(mocker):
+    _mock_processes(mocker, 4)
+    wait_ready = mocker.patch.object(WorkersManager, '_wait_ready')
+
+    worker = WorkersManager({}, workers=2, restart_wave_size=0)
+    worker.start()
+    old_pool = list(worker.pool)
+    worker.restart()
+
+    wait_ready.assert_not_called()
+    assert [p.pid for p in worker.pool] == [2, 3]
+    for process in old_pool:
+        process.stop.assert_called_once()
+    assert 0 not in worker._ready_events
+
+
+def test_worker_manager_wait_ready(mocker, caplog):
+    _mock_processes(mocker, 2)
+
+    worker = WorkersManager({}, workers=2, ready_timeout=0)
+    worker.start()
+    worker._ready_events[0].set()
+
+    worker._wait_ready(worker.pool)
+
+    assert 'pid 0 is not ready' not in caplog.text
+    assert 'Consumer process with pid 1 is not ready after 0 seconds.' in caplog.text
+
+
+def test_autoscaler_scale_up():
+    autoscaler = WorkersAutoscaler(1, 3, scale_up_depth=100, scale_down_depth=10, cooldown=60)
+
+    assert autoscaler.get_workers_count(1, 500, now=0) == 2
+    # Cooldown
+    assert autoscaler.get_workers_count(2, 1000, now=30) == 2
+    assert autoscaler.get_workers_count(2, 1500, now=90) == 3
+    # Max workers
+    assert autoscaler.get_workers_count(3, 5000, now=200) == 3
+
+
+def test_autoscaler_no_scale_up_for_fast_draining_backlog():
+    autoscaler = WorkersAutoscaler(1, 3, scale_up_depth=100, scale_down_depth=10, cooldown=60)
+
+    assert autoscaler.get_workers_count(1, 500, now=0) == 2
+    # 290 messages are drained in 60 seconds, remaining ones will be consumed within cooldown
+    assert autoscaler.get_workers_count(2, 210, now=60) == 2
+
+
+def test_autoscaler_hysteresis():
+    autoscaler = WorkersAutoscaler(1, 3, scale_up_depth=100, scale_down_depth=10, cooldown=0)
+
+    assert autoscaler.get_workers_count(2, 150, now=0) == 2
+    assert autoscaler.get_workers_count(2, 30, now=1) == 2
+    assert autoscaler.get_workers_count(2, 10, now=2) == 1
+    # Min workers
+    assert autoscaler.get_workers_count(1, 0, now=3) == 1
+
+
+@pytest.mark.parametrize(
+    'min_workers, max_workers, up, down',
+    ((0, 1, 10, 1), (2, 1, 10, 1), (1, 2, 10, 10)),
+)
+def test_autoscaler_wrong_configuration(min_workers, max_workers, up, down):
+    with pytest.raises(AssertionError):
+        WorkersAutoscaler(min_workers, max_workers, scale_up_depth=up, scale_down_depth=down)
+
+
+def test_worker_manager_without_autoscaling():
+    worker = WorkersManager({}, workers=2, max_workers=2)
+
+    assert worker.autoscaler is None
+    worker.autoscale()
+
+
+def test_worker_manager_autoscale(mocker):
+    mocker.patch(
+        'dj_cqrs.management.commands.cqrs_consume.get_queue_depth',
+        side_effect=[5000, 0],
+    )
+    mocked_start_process = mocker.patch('dj_cqrs.management.commands.cqrs_consume.start_process')
+
+    worker = WorkersManager({}, workers=1, max_workers=3, scale_cooldown=0, scale_interval=0)
+    worker.start()
+    assert len(worker.pool) == 1
+
+    worker.autoscale()
+    assert len(worker.pool) == 2
+    assert worker.workers == 2
+    assert mocked_start_process.call_count == 2
+
+    worker.autoscale()
+    assert len(worker.pool) == 1
+    assert worker.workers == 1
+    mocked_start_process.return_value.stop.assert_called_once_with(
+        sigint_timeout=5,
+        sigkill_timeout=1,
+    )
+
+
+def test_worker_manager_autoscale_interval(mocker):
+    mocked_depth = mocker.patch(
+        'dj_cqrs.management.commands.cqrs_consume.get_queue_depth',
+        return_value=0,
+    )
+
+    worker = WorkersManager({}, workers=1, max_workers=3, scale_interval=100)
+    worker.autoscale()
+    worker.autoscale()
+
+    assert mocked_depth.call_count == 1
+
+
+def test_worker_manager_autoscale_not_supported_transport(reload_transport, caplog):
+    worker = WorkersManager({}, workers=1, max_workers=3)
+    worker.autoscale()
+
+    assert worker.autoscaler is None
+    assert 'autoscaling is disabled' in caplog.text
+
+
+def test_worker_manager_autoscale_depth_error(mocker, caplog):
+    mocker.patch(
+        'dj_cqrs.management.commands.cqrs_consume.get_queue_depth',
+        side_effect=ValueError,
+    )
+
+    worker = WorkersManager({}, workers=1, max_workers=3)
+    worker.autoscale()
+
+    assert worker.autoscaler is not None
+    assert 'Queue depth check failed, skipping autoscaling.' in caplog.text
+
+
+def test_worker_manager_run_with_autoscaling(mocker):
+    mocker.patch('dj_cqrs.management.commands.cqrs_consume.start_process')
+    autoscale = mocker.patch.object(WorkersManager, 'autoscale')
+
+    worker = WorkersManager({}, workers=1, max_workers=2, scale_interval=3)
+    worker.stop_event.wait = mocker.MagicMock(side_effect=[False, True])
+
+    worker.run()
+
+    assert autoscale.call_count == 1
+    worker.stop_event.wait.assert_called_with(timeout=3)
@@ -0,0 +1,159 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+import pytest
+import ujson
+from django.core.management import CommandError, call_command
+
+from dj_cqrs.constants import SignalType
+from dj_cqrs.management.commands.cqrs_resync import Command, RabbitMQTransport
+from tests.dj_master.models import Author
+
+
+COMMAND_NAME = 'cqrs_resync'
+
+
+def _request(cqrs_id, pks, queue='replica'):
+    return ujson.dumps(
+        {
+            'signal_type': SignalType.RESYNC,
+            'cqrs_id': cqrs_id,
+            'instance_data': {'pks': pks},
+            'instance_pk': None,
+            'queue': queue,
+        },
+    ).encode('utf-8')
+
+
+@pytest.fixture
+def channel(mocker):
+    mocker.patch.object(Command, 'check_transport')
+    mocker.patch.object(
+        RabbitMQTransport,
+        '_get_common_settings',
+        return_value=('host', 'port', mocker.MagicMock(), 'exchange'),
+    )
+
+    channel = mocker.MagicMock()
+    mocker.patch.object(
+        RabbitMQTransport,
+        '_create_connection',
+        return_value=(mocker.MagicMock(), channel),
+    )
+    return channel
+
+
+def _frame(mocker, delivery_tag):
+    method_frame = mocker.MagicMock()
+    method_frame.delivery_tag = delivery_tag
+    return method_frame
+
+
+def test_wrong_transport():
+    with pytest.raises(CommandError) as e:
+        call_command(COMMAND_NAME, '--queue=resync')
+
+    assert 'Resync command is available only for RabbitMQTransport.' in str(e)
+
+
+def test_no_queue(settings, mocker):
+    mocker.patch.object(Command, 'check_transport')
+    settings.CQRS['master'].pop('resync_queue', None)
+
+    with pytest.raises(CommandError) as e:
+        call_command(COMMAND_NAME)
+
+    assert 'Resync queue name is not set!' in str(e)
+
+
+def test_bad_window(mocker):
+    mocker.patch.object(Command, 'check_transport')
+
+    with pytest.raises(CommandError):
+        call_command(COMMAND_NAME, '--queue=resync', '--window=-1')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_requests_are_aggregated_and_synced(channel, mocker, capsys):
+    for pk in (1, 2, 3):
+        Author.objects.create(id=pk, name='author')
+
+    channel.consume.return_value = iter(
+        [
+            (_frame(mocker, 1), None, _request('author', [1, 2])),
+            (_frame(mocker, 2), None, _request('author', [2, 4])),
+            (_frame(mocker, 3), None, b'bad'),
+            (_frame(mocker, 4), None, _request('author', [3], queue='other')),
+        ],
+    )
+    produce_batch = mocker.patch('dj_cqrs.controller.producer.produce_batch')
+
+    call_command(COMMAND_NAME, '--queue=resync', '--window=60')
+
+    channel.queue_declare.assert_called_once_with('resync', durable=True, exclusive=False)
+    channel.queue_bind.assert_any_call(
+        exchange='exchange',
+        queue='resync',
+        routing_key='cqrs_resync.author',
+    )
+    channel.basic_ack.assert_called_once_with(4, multiple=True)
+
+    batches = sorted(
+        [(p.signal_type, p.queue, p.pk) for p in c.args[0]] for c in produce_batch.call_args_list
+    )
+    assert batches == [
+        [(SignalType.SYNC, 'other', 3)],
+        [(SignalType.SYNC, 'replica', 1), (SignalType.SYNC, 'replica', 2)],
+    ]
+
+    captured = capsys.readouterr()
+    assert '2 of 3 requested instance(s) synced to replica (author).' in captured.out
+    assert '1 of 1 requested instance(s) synced to other (author).' in captured.out
+    assert 'Bad resync request' in captured.err
+
+
+@pytest.mark.django_db
+def test_requests_are_synced_after_window(channel, mocker):
+    channel.consume.return_value = iter(
+        [
+            (_frame(mocker, 1), None, _request('author', [1])),
+            (None, None, None),
+            (_frame(mocker, 2), None, _request('invalid', [1])),
+        ],
+    )
+    mocker.patch(
+        'dj_cqrs.management.commands.cqrs_resync.time.monotonic',
+        side_effect=[0, 1, 10, 10, 10],
+    )
+
+    call_command(COMMAND_NAME, '--queue=resync', '--window=5')
+
+    assert channel.basic_ack.call_args_list == [
+        mocker.call(1, multiple=True),
+        mocker.call(2, multiple=True),
+    ]
+
+
+@pytest.mark.django_db
+def test_failed_batch_is_synced_one_by_one(channel, mocker, capsys):
+    for pk in (1, 2, 3):
+        Author.objects.create(id=pk, name='author')
+
+    channel.consume.return_value = iter([(_frame(mocker, 1), None, _request('author', [1, 2, 3]))])
+    produce_batch = mocker.patch('dj_cqrs.controller.producer.produce_batch')
+    bulk_class_serialization = Author._bulk_class_serialization.__func__
+
+    def serialize(cls, instances, using):
+        if any(instance.pk == 2 for instance in instances):
+            raise ValueError('error')
+
+        return bulk_class_serialization(cls, instances, using)
+
+    mocker.patch.object(Author, '_bulk_class_serialization', classmethod(serialize))
+
+    call_command(COMMAND_NAME, '--queue=resync', '--window=0', '--batch=10')
+
+    assert [[p.pk for p in c.args[0]] for c in produce_batch.call_args_list] == [[1], [3]]
+
+    captured = capsys.readouterr()
+    assert 'Sync record failed for pk=2: ValueError: error' in captured.err
+    assert '2 of 3 requested instance(s) synced to replica (author).' in captured.out
@@ -5,10 +5,26 @@ from django.conf import settings
 from django.utils.timezone import now
 
 from dj_cqrs.constants import SignalType
-from dj_cqrs.controller.consumer import consume, route_signal_to_replica_model
+from dj_cqrs.controller.consumer import (
+    consume,
+    consume_batch,
+    consume_concurrently,
+    consume_deletes,
+    is_batch_consumable,
+    is_batch_deletable,
+    is_concurrently_consumable,
+    route_signal_to_replica_model,
+)
 from dj_cqrs.controller.producer import produce
 from dj_cqrs.dataclasses import TransportPayload
-from tests.dj_replica.models import AbstractModel, OnlyDirectSyncModel
+from tests.dj_replica.models import (
+    AbstractModel,
+    AsyncHandledModel,
+    BasicFieldsModelRef,
+    BatchHandledModel,
+    OnlyDirectSyncModel,
+)
+from tests.utils import db_error
 
 
 def test_producer(mocker):
@@ -40,6 +56,7 @@ def test_consumer(mocker):
         previous_data={'e': 'f'},
         meta=None,
         queue='xyz',
+        pk='c',
     )
 
 
@@ -68,6 +85,24 @@ def test_changed_payload_data_during_consume(mocker):
     assert payload.previous_data == {'previous_key': 'initial previous'}
 
 
+def test_consume_without_payload_copy(mocker):
+    mocker.patch.object(BasicFieldsModelRef, 'CQRS_COPY_PAYLOAD', False)
+    factory_mock = mocker.patch('dj_cqrs.controller.consumer.route_signal_to_replica_model')
+    payload = TransportPayload(
+        SignalType.SAVE,
+        'basic',
+        {'int_field': 1},
+        1,
+        previous_data={'char_field': 'text'},
+    )
+
+    consume(payload)
+
+    args, kwargs = factory_mock.call_args
+    assert args[2] is payload.instance_data
+    assert kwargs['previous_data'] is payload.previous_data
+
+
 @pytest.mark.django_db(transaction=True)
 def test_route_signal_to_replica_model_integrity_error(caplog):
     instance_data = {
@@ -123,3 +158,164 @@ def test_route_signal_to_replica_exception(data, pk_repr, caplog):
     )
 
     assert 'pk = {pk}'.format(pk=pk_repr) in caplog.text
+
+
+@pytest.mark.parametrize(
+    'cqrs_id, result',
+    (
+        ('basic', True),
+        ('author', True),
+        ('meta', False),
+        ('no_db', False),
+        ('document1', False),
+        ('invalid', False),
+    ),
+)
+def test_is_batch_deletable(cqrs_id, result):
+    assert is_batch_deletable(cqrs_id) is result
+
+
+def _delete_payload(pk):
+    return TransportPayload(
+        SignalType.DELETE,
+        'basic',
+        {'id': pk, 'cqrs_revision': 1, 'cqrs_updated': now()},
+        pk,
+    )
+
+
+@pytest.mark.django_db
+def test_consume_deletes():
+    for pk in (1, 2, 3):
+        BasicFieldsModelRef.objects.create(
+            int_field=pk,
+            cqrs_revision=0,
+            cqrs_updated=now(),
+            char_field='text',
+        )
+
+    assert consume_deletes([_delete_payload(1), _delete_payload(3)]) is True
+    assert list(BasicFieldsModelRef.objects.values_list('pk', flat=True)) == [2]
+
+
+@pytest.mark.django_db
+def test_consume_deletes_error(mocker, caplog):
+    mocker.patch('dj_cqrs.controller.consumer.apply_query_timeouts', side_effect=db_error)
+
+    assert consume_deletes([_delete_payload(1), _delete_payload(2)]) is False
+    assert 'CQRS DELETE error: pks = [1, 2] (basic).' in caplog.text
+
+
+@pytest.mark.django_db
+def test_consume_deletes_exception(mocker, caplog):
+    mocker.patch.object(BasicFieldsModelRef.cqrs, 'delete_instances', side_effect=ValueError)
+
+    assert consume_deletes([_delete_payload(1), _delete_payload(2)]) is False
+    assert 'CQRS DELETE batch error: pks = [1, 2] (basic).' in caplog.text
+
+
+def test_route_signal_to_replica_model_checks_connections(mocker):
+    check_mock = mocker.patch('dj_cqrs.controller.consumer.connections_health_check')
+    mocker.patch('dj_cqrs.controller.consumer.apply_query_timeouts', side_effect=db_error)
+
+    route_signal_to_replica_model(SignalType.SAVE, 'basic', {})
+
+    check_mock.check.assert_called_once_with()
+    check_mock.invalidate.assert_called_once_with()
+
+
+@pytest.mark.parametrize(
+    'cqrs_id, signal_type, result',
+    (
+        ('batch_handled', SignalType.SAVE, True),
+        ('batch_handled', SignalType.SYNC, True),
+        ('batch_handled', SignalType.DELETE, True),
+        ('batch_handled', 'invalid', False),
+        ('document1', SignalType.SAVE, False),
+        ('basic', SignalType.SAVE, False),
+        ('invalid', SignalType.SAVE, False),
+    ),
+)
+def test_is_batch_consumable(cqrs_id, signal_type, result):
+    assert is_batch_consumable(cqrs_id, signal_type) is result
+
+
+def test_consume_batch(mocker, settings):
+    mocker.patch.object(BatchHandledModel, 'CQRS_ONLY_DIRECT_SYNCS', True)
+    save_batch = mocker.spy(BatchHandledModel, 'cqrs_save_batch')
+    payloads = [
+        TransportPayload(SignalType.SAVE, 'batch_handled', {'id': 1}, 1),
+        TransportPayload(SignalType.SYNC, 'batch_handled', {'id': 2}, 2, queue='other'),
+        TransportPayload(
+            SignalType.SYNC,
+            'batch_handled',
+            {'id': 3, 'ok': False},
+            3,
+            queue='replica',
+        ),
+    ]
+
+    assert consume_batch(payloads) == [True, True, False]
+    items = save_batch.call_args[0][0]
+    assert [item.pk for item in items] == [1, 3]
+    assert items[0] is not payloads[0]
+
+
+def test_consume_batch_error(mocker, caplog):
+    error = ValueError('sink is unavailable')
+    mocker.patch.object(BatchHandledModel, 'cqrs_delete_batch', side_effect=error)
+    payloads = [
+        TransportPayload(SignalType.DELETE, 'batch_handled', {'id': 1}, 1),
+        TransportPayload(SignalType.DELETE, 'batch_handled', {'id': 2}, 2),
+    ]
+
+    assert consume_batch(payloads) == [error, error]
+    assert 'CQRS batch error: pks = [1, 2] (batch_handled).' in caplog.text
+
+
+def test_consume_batch_wrong_results(mocker):
+    mocker.patch.object(BatchHandledModel, 'cqrs_save_batch', return_value=[True])
+    payloads = [
+        TransportPayload(SignalType.SAVE, 'batch_handled', {'id': 1}, 1),
+        TransportPayload(SignalType.SAVE, 'batch_handled', {'id': 2}, 2),
+    ]
+
+    results = consume_batch(payloads)
+
+    assert all(isinstance(result, AssertionError) for result in results)
+
+
+@pytest.mark.parametrize(
+    'cqrs_id, signal_type, result',
+    (
+        ('async_handled', SignalType.SAVE, True),
+        ('async_handled', SignalType.DELETE, True),
+        ('async_handled', 'invalid', False),
+        ('batch_handled', SignalType.SAVE, False),
+        ('basic', SignalType.SAVE, False),
+    ),
+)
+def test_is_concurrently_consumable(cqrs_id, signal_type, result):
+    assert is_concurrently_consumable(cqrs_id, signal_type) is result
+
+
+def test_consume_coroutine_handler():
+    payload = TransportPayload(SignalType.SAVE, 'async_handled', {'id': 1, 'ok': 'result'}, 1)
+
+    assert consume(payload) == 'result'
+
+
+def test_consume_concurrently(settings, mocker):
+    settings.CQRS['replica']['CQRS_ASYNC_CONCURRENCY'] = 3
+    mocker.patch.object(AsyncHandledModel, 'max_running', 0)
+    payloads = [
+        TransportPayload(SignalType.SAVE, 'async_handled', {'id': pk}, pk) for pk in range(10)
+    ]
+    payloads[1].instance_data['error'] = 'sink is unavailable'
+
+    results = consume_concurrently(payloads)
+
+    assert results[0] is True
+    assert isinstance(results[1], ValueError)
+    assert results[2:] == [True] * 8
+    assert AsyncHandledModel.max_running == 3
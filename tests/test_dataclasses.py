@@ -1,6 +1,9 @@
 #  Copyright © 2025 CloudBlue. All rights reserved.
 
-from datetime import datetime, timezone
+import copy
+from datetime import datetime, timedelta, timezone
+
+import pytest
 
 from dj_cqrs.constants import SignalType
 from dj_cqrs.dataclasses import TransportPayload
@@ -37,3 +40,41 @@ def test_transport_payload_without_expires(mocker, settings):
     )
 
     assert payload.expires == expected_expires
+
+
+@pytest.mark.parametrize(
+    'expires, expected_expires',
+    (
+        ('2020-01-01T00:00:10+00:00', datetime(2020, 1, 1, second=10, tzinfo=timezone.utc)),
+        ('2020-01-01T00:00:10Z', datetime(2020, 1, 1, second=10, tzinfo=timezone.utc)),
+        (
+            '2020-01-01T03:00:10+03:00',
+            datetime(2020, 1, 1, 3, second=10, tzinfo=timezone(timedelta(hours=3))),
+        ),
+        ('Jan 1 2020 00:00:10 UTC', datetime(2020, 1, 1, second=10, tzinfo=timezone.utc)),
+    ),
+)
+def test_transport_payload_expires_parsing(expires, expected_expires):
+    payload = TransportPayload.from_message(
+        {
+            'signal_type': SignalType.SYNC,
+            'cqrs_id': 'cqrs_id',
+            'instance_data': {},
+            'instance_pk': 'id',
+            'expires': expires,
+        },
+    )
+
+    assert payload.expires == expected_expires
+
+
+def test_transport_payload_slots():
+    payload = TransportPayload(SignalType.SAVE, 'cqrs_id', {'id': 1}, 1, retries=2)
+
+    assert not hasattr(payload, '__dict__')
+    with pytest.raises(AttributeError):
+        payload.extra = 1
+
+    payload_copy = copy.deepcopy(payload)
+    assert payload_copy.to_dict() == payload.to_dict()
+    assert payload_copy.instance_data is not payload.instance_data
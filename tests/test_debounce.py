@@ -0,0 +1,186 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+import time
+
+import pytest
+
+from dj_cqrs import metrics
+from dj_cqrs.constants import SignalType
+from dj_cqrs.dataclasses import TransportPayload
+from dj_cqrs.debounce import ChurnStats, DebounceBuffer, debounce_buffer
+from dj_cqrs.publishing import batch_cqrs_publishing
+from tests.dj_master import models
+
+
+def _payload(pk, revision, queue=None):
+    return TransportPayload(
+        SignalType.SAVE,
+        'basic',
+        {'id': pk, 'cqrs_revision': revision},
+        pk,
+        queue,
+    )
+
+
+@pytest.fixture
+def produce_batch(mocker):
+    return mocker.patch('dj_cqrs.controller.producer.produce_batch')
+
+
+@pytest.fixture
+def debounced_model(mocker):
+    mocker.patch.object(models.SimplestModel, 'CQRS_DEBOUNCE_MS', 500)
+    yield models.SimplestModel
+    debounce_buffer.pop_due(force=True)
+    debounce_buffer._timer = None
+
+
+@pytest.fixture
+def monotonic(mocker):
+    mocker.patch('dj_cqrs.debounce.threading.Timer')
+    return mocker.patch('dj_cqrs.debounce.time.monotonic', return_value=100)
+
+
+def test_latest_payload_is_published_after_window(monotonic, produce_batch):
+    metrics.reset_counters()
+    buffer = DebounceBuffer()
+
+    buffer.add(_payload(1, 1), 1)
+    monotonic.return_value = 100.5
+    buffer.add(_payload(2, 1), 1)
+    buffer.add(_payload(1, 2), 1)
+    buffer.add(_payload(1, 2, queue='replica'), 1)
+
+    assert len(buffer) == 3
+    assert buffer.flush() == 0
+    produce_batch.assert_not_called()
+
+    monotonic.return_value = 101
+    assert buffer.flush() == 1
+    assert produce_batch.call_args[0][0][0].instance_data == {'id': 1, 'cqrs_revision': 2}
+
+    assert buffer.flush(force=True) == 2
+    assert len(buffer) == 0
+    assert metrics.get_counter(metrics.MASTER_DEBOUNCED_CHANGES) == 1
+
+
+def test_discard(monotonic, produce_batch):
+    buffer = DebounceBuffer()
+    buffer.discard('basic', 1)
+
+    buffer.add(_payload(1, 1), 1)
+    buffer.add(_payload(1, 1, queue='replica'), 1)
+    buffer.add(_payload(2, 1), 1)
+    buffer.discard('basic', 1)
+
+    assert buffer.flush(force=True) == 1
+    assert produce_batch.call_args[0][0][0].pk == 2
+
+
+def test_timer_publishes_due_payloads(produce_batch):
+    buffer = DebounceBuffer()
+
+    buffer.add(_payload(1, 1), 60)
+    buffer.add(_payload(2, 1), 0.01)
+
+    for _ in range(100):
+        if produce_batch.called:
+            break
+        time.sleep(0.01)
+
+    assert [p.pk for p in produce_batch.call_args[0][0]] == [2]
+    assert len(buffer) == 1
+    assert buffer._timer is not None
+
+    buffer._timer.cancel()
+
+
+def test_timer_error(mocker, produce_batch):
+    produce_batch.side_effect = ValueError('error')
+    logger = mocker.patch('dj_cqrs.debounce.logger')
+    buffer = DebounceBuffer()
+    buffer.add(_payload(1, 1), 0)
+
+    buffer._on_timer()
+
+    logger.error.assert_called_once_with('CQRS debounced payloads publishing failed: error.')
+
+
+def test_churn_stats(settings, mocker):
+    settings.CQRS['master']['CQRS_CHURN_STATS_SIZE'] = 2
+    mocker.patch('dj_cqrs.debounce.time.monotonic', return_value=0)
+    stats = ChurnStats()
+
+    for pk in (1, 1, 1, 2, 2, 3):
+        stats.add('basic', pk)
+    stats.add('author', 1)
+
+    assert stats.get_top('basic') == [(1, 3, 180), (3, 3, 180)]
+    assert stats.get_top('basic', limit=1) == [(1, 3, 180)]
+    assert stats.get_stats() == {
+        'basic': [(1, 3, 180), (3, 3, 180)],
+        'author': [(1, 1, 60)],
+    }
+
+    stats.reset()
+    assert stats.get_stats() == {}
+
+
+def test_churn_stats_disabled(settings):
+    settings.CQRS['master'].pop('CQRS_CHURN_STATS_SIZE', None)
+    stats = ChurnStats()
+
+    stats.add('basic', 1)
+
+    assert stats.get_top('basic') == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_debounced_model(mocker, debounced_model, monotonic, produce_batch):
+    produce = mocker.patch('dj_cqrs.controller.producer.produce')
+
+    instance = debounced_model.objects.create(id=1, name='old')
+    instance.name = 'new'
+    instance.save()
+    debounced_model.cqrs.bulk_create([debounced_model(id=2)])
+
+    produce.assert_not_called()
+    assert len(debounce_buffer) == 2
+
+    monotonic.return_value = 100.5
+    assert debounce_buffer.flush() == 2
+    assert [
+        (p.pk, p.instance_data['name'], p.instance_data['cqrs_revision'])
+        for p in produce_batch.call_args[0][0]
+    ] == [(1, 'new', 1), (2, None, 0)]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_debounced_model_delete(mocker, debounced_model, monotonic, produce_batch):
+    produce = mocker.patch('dj_cqrs.controller.producer.produce')
+
+    instance = debounced_model.objects.create(id=1, name='old')
+    instance.delete()
+
+    assert len(debounce_buffer) == 0
+    assert produce.call_args[0][0].signal_type == SignalType.DELETE
+
+
+@pytest.mark.django_db(transaction=True)
+def test_debounced_model_batched_save(mocker, debounced_model, monotonic, produce_batch):
+    mocker.patch('dj_cqrs.controller.producer.produce')
+
+    instance = debounced_model.objects.create(id=1, name='old')
+    with batch_cqrs_publishing():
+        instance.name = 'new'
+        instance.save()
+
+    assert len(debounce_buffer) == 0
+    assert [
+        (p.pk, p.instance_data['name'], p.instance_data['cqrs_revision'])
+        for p in produce_batch.call_args[0][0]
+    ] == [(1, 'new', 1)]
+
+    monotonic.return_value = 100.5
+    assert debounce_buffer.flush() == 0
+    produce_batch.assert_called_once()
@@ -5,7 +5,13 @@ from queue import Full
 
 import pytest
 
-from dj_cqrs.delay import DelayMessage, DelayQueue
+from dj_cqrs.dataclasses import TransportPayload
+from dj_cqrs.delay import (
+    DelayMessage,
+    DelayQueue,
+    ParkingLot,
+    ReorderBuffer,
+)
 
 
 def test_delay_message(mocker):
@@ -98,3 +104,122 @@ def test_delay_queue_invalid_max_size():
         DelayQueue(max_size=0)
 
     assert e.value.args[0] == 'Delay queue max_size should be positive integer.'
+
+
+def test_delay_queue_release(mocker):
+    fake_now = datetime(2020, 1, 1, second=0, tzinfo=timezone.utc)
+    mocker.patch('django.utils.timezone.now', return_value=fake_now)
+
+    delay_queue = DelayQueue()
+    for delivery_tag in (1, 2, 3):
+        delay_queue.put(
+            DelayMessage(delivery_tag, None, fake_now + timedelta(seconds=delivery_tag)),
+        )
+
+    delay_queue.release(set())
+    assert list(delay_queue.get_ready()) == []
+
+    delay_queue.release({3})
+    ready_messages = list(delay_queue.get_ready())
+
+    assert [m.delivery_tag for m in ready_messages] == [3]
+    assert ready_messages[0].eta == fake_now
+    assert delay_queue.qsize() == 2
+
+
+def test_delay_queue_held_size():
+    eta = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    delay_queue = DelayQueue()
+    delay_queue.put(DelayMessage(1, None, eta))
+    delay_queue.parking_lot.block(('book', 1), 1)
+    delay_queue.parking_lot.park(('book', 1), 2, None)
+    delay_queue.reorder_buffer.put(('book', 2), DelayMessage(3, None, eta))
+
+    assert delay_queue.held_size() == 3
+
+
+def test_parking_lot():
+    parking_lot = ParkingLot()
+
+    assert not parking_lot.is_blocked(('book', 1))
+
+    parking_lot.block(('book', 1), 1, dependencies=[('author', 1)])
+    parking_lot.park(('book', 1), 2, 'payload2')
+    parking_lot.park(('book', 1), 3, 'payload3')
+
+    assert parking_lot.is_blocked(('book', 1))
+    assert not parking_lot.is_blocked(('book', 2))
+    assert parking_lot.size() == 2
+
+    assert parking_lot.unblock(('book', 1), 2) == []
+    assert parking_lot.unblock(('book', 1), 1) == [(2, 'payload2'), (3, 'payload3')]
+    assert not parking_lot.is_blocked(('book', 1))
+    assert parking_lot.size() == 0
+    assert parking_lot.pop_dependants(('author', 1)) == set()
+
+
+def test_parking_lot_pop_dependants():
+    parking_lot = ParkingLot()
+    parking_lot.block(('book', 1), 1, dependencies=[('author', 1)])
+    parking_lot.block(('book', 2), 2, dependencies=[('author', 1), ('author', 2)])
+
+    assert parking_lot.pop_dependants(('author', 1)) == {1, 2}
+    assert parking_lot.pop_dependants(('author', 1)) == set()
+    assert parking_lot.is_blocked(('book', 1))
+
+
+def test_parking_lot_park_not_blocked():
+    with pytest.raises(AssertionError) as e:
+        ParkingLot().park(('book', 1), 1, None)
+
+    assert e.value.args[0] == 'Messages can be parked only for blocked keys.'
+
+
+def _buffered_message(delivery_tag, revision, eta):
+    payload = TransportPayload('SAVE', 'basic', {'id': 1, 'cqrs_revision': revision}, 1)
+    return DelayMessage(delivery_tag, payload, eta)
+
+
+def test_reorder_buffer_pop():
+    fake_now = datetime(2020, 1, 1, second=0, tzinfo=timezone.utc)
+    reorder_buffer = ReorderBuffer()
+    assert reorder_buffer.pop(('basic', 1)) == []
+
+    for delivery_tag, revision in ((1, 5), (2, 3), (3, 4)):
+        reorder_buffer.put(('basic', 1), _buffered_message(delivery_tag, revision, fake_now))
+    reorder_buffer.put(('basic', 2), _buffered_message(4, 1, fake_now))
+
+    assert reorder_buffer.qsize() == 4
+    assert [m.delivery_tag for m in reorder_buffer.pop(('basic', 1))] == [2, 3, 1]
+    assert reorder_buffer.pop(('basic', 1)) == []
+    assert reorder_buffer.qsize() == 1
+
+
+def test_reorder_buffer_get_expired(mocker):
+    fake_now = datetime(2020, 1, 1, second=0, tzinfo=timezone.utc)
+    mocker.patch('django.utils.timezone.now', return_value=fake_now)
+
+    reorder_buffer = ReorderBuffer()
+    reorder_buffer.put(('basic', 1), _buffered_message(1, 5, fake_now + timedelta(seconds=1)))
+    reorder_buffer.put(('basic', 1), _buffered_message(2, 3, fake_now))
+    reorder_buffer.put(('basic', 2), _buffered_message(3, 3, fake_now + timedelta(seconds=1)))
+
+    assert [m.delivery_tag for m in reorder_buffer.get_expired()] == [2, 1]
+    assert reorder_buffer.qsize() == 1
+
+
+def test_reorder_buffer_full():
+    fake_now = datetime(2020, 1, 1, second=0, tzinfo=timezone.utc)
+    reorder_buffer = ReorderBuffer(max_size=1)
+    reorder_buffer.put(('basic', 1), _buffered_message(1, 2, fake_now))
+
+    assert reorder_buffer.full()
+    with pytest.raises(Full):
+        reorder_buffer.put(('basic', 1), _buffered_message(2, 3, fake_now))
+
+
+def test_reorder_buffer_invalid_max_size():
+    with pytest.raises(AssertionError) as e:
+        ReorderBuffer(max_size=0)
+
+    assert e.value.args[0] == 'Reorder buffer max_size should be positive integer.'
@@ -7,17 +7,20 @@ from uuid import uuid4
 import pytest
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.db import transaction
+from django.db import connection, transaction
 from django.db.models import CharField, F, IntegerField
 from django.utils.timezone import now
 
+from dj_cqrs import metrics
 from dj_cqrs.constants import (
+    ALL_BASIC_FIELDS,
     DEFAULT_MASTER_AUTO_UPDATE_FIELDS,
     DEFAULT_MASTER_MESSAGE_TTL,
     FIELDS_TRACKER_FIELD_NAME,
     SignalType,
 )
 from dj_cqrs.metas import MasterMeta
+from dj_cqrs.utils import supports_update_returning
 from tests.dj_master import models
 from tests.dj_master.serializers import AuthorSerializer
 from tests.utils import (
@@ -113,6 +116,19 @@ def test_cqrs_bad_configuration(mocker):
     assert "CQRS_FIELDS can't be set together with CQRS_SERIALIZER." in str(e.value)
 
 
+def test_cqrs_skip_unchanged_bad_configuration():
+    class Cls(object):
+        CQRS_FIELDS = ALL_BASIC_FIELDS
+        CQRS_SERIALIZER = 'path.to.serializer'
+        CQRS_SKIP_UNCHANGED = True
+        CQRS_TRACKED_FIELDS = None
+
+    with pytest.raises(AssertionError) as e:
+        MasterMetaTest.check_correct_configuration(Cls)
+
+    assert 'Model Cls: CQRS_SKIP_UNCHANGED requires CQRS_TRACKED_FIELDS' in str(e.value)
+
+
 @pytest.mark.django_db
 def test_to_cqrs_dict_has_cqrs_fields():
     m = models.AutoFieldsModel.objects.create()
@@ -218,6 +234,24 @@ def test_cqrs_sync(mocker):
     )
 
 
+@pytest.mark.django_db(transaction=True)
+def test_cqrs_sync_without_refresh(mocker, django_assert_num_queries):
+    models.ChosenFieldsModel.objects.create(char_field='old')
+    m = models.ChosenFieldsModel.objects.first()
+
+    publisher_mock = mocker.patch('dj_cqrs.controller.producer.produce')
+    with django_assert_num_queries(0):
+        assert m.cqrs_sync(refresh=False)
+
+    assert_publisher_once_called_with_args(
+        publisher_mock,
+        SignalType.SYNC,
+        models.ChosenFieldsModel.CQRS_ID,
+        {'char_field': 'old', 'id': m.pk},
+        m.pk,
+    )
+
+
 @pytest.mark.django_db(transaction=True)
 def test_cqrs_sync_optimized_for_class_serialization(mocker, django_assert_num_queries):
     models.Author.objects.create(
@@ -723,6 +757,52 @@ def test_f_expr():
     assert previous_data['int_field'] == 0
 
 
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.skipif(
+    not supports_update_returning(connection),
+    reason='UPDATE ... RETURNING is not supported',
+)
+def test_f_expr_values_are_returned_by_update(mocker, django_assert_num_queries):
+    m = models.AllFieldsModel.objects.create(int_field=0, char_field='char')
+    publisher_mock = mocker.patch('dj_cqrs.controller.producer.produce')
+    m.int_field = F('int_field') + 1
+
+    with django_assert_num_queries(1):
+        m.save()
+
+    assert m.int_field == 1
+    assert m.cqrs_revision == 1
+    assert publisher_mock.call_args[0][0].instance_data['int_field'] == 1
+    assert publisher_mock.call_args[0][0].instance_data['cqrs_revision'] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_f_expr_values_are_refreshed_without_update_returning(mocker):
+    mocker.patch('dj_cqrs.mixins.supports_update_returning', return_value=False)
+    m = models.AllFieldsModel.objects.create(int_field=0, char_field='char')
+    publisher_mock = mocker.patch('dj_cqrs.controller.producer.produce')
+    m.int_field = F('int_field') + 1
+    m.save()
+
+    assert publisher_mock.call_args[0][0].instance_data['int_field'] == 1
+    assert publisher_mock.call_args[0][0].instance_data['cqrs_revision'] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_update_returning_instance_is_deleted():
+    m = models.SimplestModel.objects.create(id=1)
+    models.SimplestModel.objects.filter(id=1).delete()
+
+    assert not m._do_update(
+        models.SimplestModel._base_manager.all(),
+        'default',
+        1,
+        [(models.SimplestModel._meta.get_field('cqrs_revision'), None, F('cqrs_revision') + 1)],
+        None,
+        False,
+    )
+
+
 @pytest.mark.django_db(transaction=True)
 def test_generic_fk():
     sm = models.SimplestModel.objects.create(id=1, name='char')
@@ -1077,3 +1157,146 @@ def test_get_cqrs_meta_default(mocker, settings):
 
     obj.save()
     assert publisher_mock.call_args[0][0].meta == {}
+
+
+@pytest.fixture
+def skip_unchanged(mocker):
+    metrics.reset_counters()
+    mocker.patch.object(models.SimplestModel, 'CQRS_SKIP_UNCHANGED', True)
+    return mocker.patch('dj_cqrs.controller.producer.produce')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_unchanged_save_is_suppressed(skip_unchanged):
+    models.SimplestModel.objects.create(id=1, name='name')
+    skip_unchanged.reset_mock()
+
+    instance = models.SimplestModel.objects.get(id=1)
+    cqrs_updated = instance.cqrs_updated
+    instance.save()
+    instance.save(update_fields=['name'], update_cqrs_fields=True)
+
+    skip_unchanged.assert_not_called()
+    instance.refresh_from_db()
+    assert instance.cqrs_revision == 0
+    assert instance.cqrs_updated == cqrs_updated
+    assert metrics.get_counter(metrics.MASTER_SUPPRESSED_SAVES) == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_changed_save_is_published(skip_unchanged):
+    instance = models.SimplestModel.objects.create(id=1, name='old')
+    instance.save()
+    skip_unchanged.assert_called_once()
+
+    instance.name = 'new'
+    instance.save()
+    instance.save()
+
+    assert skip_unchanged.call_count == 2
+    assert skip_unchanged.call_args[0][0].instance_data['name'] == 'new'
+    assert skip_unchanged.call_args[0][0].instance_data['cqrs_revision'] == 1
+    assert metrics.get_counter(metrics.MASTER_SUPPRESSED_SAVES) == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_unchanged_save_with_deferred_fields(skip_unchanged):
+    models.SimplestModel.objects.create(id=1, name='name')
+    skip_unchanged.reset_mock()
+
+    instance = models.SimplestModel.objects.only('id').get(id=1)
+    instance.save()
+
+    skip_unchanged.assert_not_called()
+    assert models.SimplestModel.objects.get(id=1).name == 'name'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reverted_save_after_refresh_is_published(skip_unchanged):
+    models.SimplestModel.objects.create(id=1, name='a')
+    instance = models.SimplestModel.objects.get(id=1)
+
+    other_instance = models.SimplestModel.objects.get(id=1)
+    other_instance.name = 'b'
+    other_instance.save()
+    skip_unchanged.reset_mock()
+
+    instance.refresh_from_db()
+    instance.name = 'a'
+    instance.save()
+
+    skip_unchanged.assert_called_once()
+    assert skip_unchanged.call_args[0][0].instance_data['name'] == 'a'
+    assert skip_unchanged.call_args[0][0].instance_data['cqrs_revision'] == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_partial_refresh_keeps_local_changes(skip_unchanged):
+    models.SimplestModel.objects.create(id=1, name='a')
+    instance = models.SimplestModel.objects.get(id=1)
+    skip_unchanged.reset_mock()
+
+    instance.name = 'b'
+    instance.refresh_from_db(fields=['cqrs_revision'])
+    instance.save()
+
+    assert skip_unchanged.call_args[0][0].instance_data['name'] == 'b'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_in_place_json_change_is_published(mocker):
+    produce = mocker.patch('dj_cqrs.controller.producer.produce')
+    models.JSONFieldModel.objects.create(id=1, json_field={'items': [1]})
+    instance = models.JSONFieldModel.objects.get(id=1)
+    produce.reset_mock()
+
+    instance.json_field['items'].append(2)
+    instance.save()
+    instance.save()
+
+    produce.assert_called_once()
+    assert produce.call_args[0][0].instance_data['json_field'] == {'items': [1, 2]}
+    assert models.JSONFieldModel.objects.get(id=1).cqrs_revision == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_unchanged_then_changed_save_in_transaction_is_published(mocker):
+    produce = mocker.patch('dj_cqrs.controller.producer.produce')
+    models.JSONFieldModel.objects.create(id=1, json_field={'items': [1]})
+    instance = models.JSONFieldModel.objects.get(id=1)
+    produce.reset_mock()
+
+    with transaction.atomic():
+        instance.save()
+        instance.json_field['items'].append(2)
+        instance.save()
+
+    produce.assert_called_once()
+    assert produce.call_args[0][0].instance_data['json_field'] == {'items': [1, 2]}
+    assert models.JSONFieldModel.objects.get(id=1).cqrs_revision == 1
+
+
+@pytest.mark.django_db
+def test_save_with_expressions_is_not_suppressed(mocker):
+    mocker.patch.object(models.AllFieldsModel, 'CQRS_SKIP_UNCHANGED', True)
+    instance = models.AllFieldsModel.objects.create(int_field=0)
+
+    instance.int_field = F('int_field') + 1
+
+    assert instance._get_cqrs_snapshot() is None
+    assert not instance._is_cqrs_unchanged()
+
+
+@pytest.mark.django_db
+def test_unchanged_save_with_serializer_is_detected_by_tracker(mocker):
+    mocker.patch.object(models.TrackedFieldsParentModel, 'CQRS_SKIP_UNCHANGED', True)
+    mocker.patch.object(models.TrackedFieldsParentModel, 'CQRS_SERIALIZER', 'path.to.serializer')
+    models.TrackedFieldsParentModel._base_manager.bulk_create(
+        [models.TrackedFieldsParentModel(id=1, char_field='old')],
+    )
+
+    instance = models.TrackedFieldsParentModel.objects.get(id=1)
+    assert instance._is_cqrs_unchanged()
+
+    instance.char_field = 'new'
+    assert not instance._is_cqrs_unchanged()
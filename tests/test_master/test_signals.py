@@ -122,7 +122,7 @@ def test_manual_post_bulk_create(mocker):
     models.AutoFieldsModel.objects.bulk_create([models.AutoFieldsModel() for _ in range(3)])
     created_models = list(models.AutoFieldsModel.objects.all())
 
-    publisher_mock = mocker.patch('dj_cqrs.controller.producer.produce')
+    publisher_mock = mocker.patch('tests.dj.transport.TransportStub.produce')
     models.AutoFieldsModel.call_post_bulk_create(created_models)
 
     assert publisher_mock.call_count == 3
@@ -158,7 +158,7 @@ def test_bulk_relate_cqrs_serialization(
 
 @pytest.mark.django_db(transaction=True)
 def test_automatic_post_bulk_create(mocker):
-    publisher_mock = mocker.patch('dj_cqrs.controller.producer.produce')
+    publisher_mock = mocker.patch('tests.dj.transport.TransportStub.produce')
 
     instances = models.SimplestTrackedModel.cqrs.bulk_create(
         [models.SimplestTrackedModel(id=i, status='new') for i in range(1, 4)],
@@ -194,7 +194,7 @@ def test_post_bulk_update_wout_prev_data(mocker, filter_kwargs):
         models.SimplestModel.objects.all().values_list('cqrs_updated', flat=True),
     )
 
-    publisher_mock = mocker.patch('dj_cqrs.controller.producer.produce')
+    publisher_mock = mocker.patch('tests.dj.transport.TransportStub.produce')
     models.SimplestModel.cqrs.bulk_update(
         queryset=models.SimplestModel.objects.filter(**filter_kwargs),
         name='new',
@@ -251,7 +251,7 @@ def test_post_bulk_update_with_prev_data(mocker, filter_kwargs, cqrs_revision, d
     m.status = 'x'
     m.save()
 
-    publisher_mock = mocker.patch('dj_cqrs.controller.producer.produce')
+    publisher_mock = mocker.patch('tests.dj.transport.TransportStub.produce')
     call_count = models.SimplestTrackedModel.cqrs.bulk_update(
         queryset=models.SimplestTrackedModel.objects.filter(**filter_kwargs).order_by('id'),
         description='new',
@@ -282,6 +282,37 @@ def test_post_bulk_update_with_prev_data(mocker, filter_kwargs, cqrs_revision, d
         assert m.status is None
 
 
+@pytest.mark.django_db(transaction=True)
+def test_post_bulk_update_is_produced_in_batch(mocker, django_assert_num_queries):
+    for i in range(3):
+        models.Author.objects.create(id=i, name='old')
+
+    instances = list(models.Author.objects.order_by('id'))
+
+    produce_batch_mock = mocker.patch('dj_cqrs.controller.producer.produce_batch')
+    # Authors with prefetched books
+    with django_assert_num_queries(2):
+        models.Author.call_post_update(instances)
+
+    produce_batch_mock.assert_called_once()
+    payloads = produce_batch_mock.call_args[0][0]
+    assert [payload.pk for payload in payloads] == [0, 1, 2]
+    assert payloads[0].instance_data['name'] == 'old'
+    assert payloads[0].instance_data['cqrs_revision'] == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_post_bulk_produces_existing_instances(mocker, caplog):
+    instances = [models.Author.objects.create(id=i, name='old') for i in range(2)]
+    models.Author.objects.filter(id=0).delete()
+
+    produce_batch_mock = mocker.patch('dj_cqrs.controller.producer.produce_batch')
+    models.Author.call_post_update(instances)
+
+    assert [payload.pk for payload in produce_batch_mock.call_args[0][0]] == [1]
+    assert "The instance doesn't exist (pk=0)" in caplog.text
+
+
 @pytest.mark.django_db
 def test_post_bulk_update_nothing_to_update(mocker):
     publisher_mock = mocker.patch('dj_cqrs.controller.producer.produce')
@@ -0,0 +1,18 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+from dj_cqrs import metrics
+
+
+def test_counters():
+    metrics.reset_counters()
+
+    metrics.increment('a')
+    metrics.increment('a', 2)
+    metrics.increment('b')
+
+    assert metrics.get_counter('a') == 3
+    assert metrics.get_counter('c') == 0
+    assert metrics.get_counters() == {'a': 3, 'b': 1}
+
+    metrics.reset_counters()
+    assert metrics.get_counters() == {}
@@ -0,0 +1,150 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+from datetime import datetime, timezone
+from uuid import UUID
+
+import pytest
+
+from dj_cqrs.plans import build_master_serialization_plan, build_replica_ingest_plan
+from tests.dj_master import models as master_models
+from tests.dj_replica import models
+
+
+def test_master_serialization_plan_all_fields():
+    plan = build_master_serialization_plan(master_models.BasicFieldsModel)
+
+    assert [name for name, _, _ in plan.fields] == [
+        f.name for f in master_models.BasicFieldsModel._meta.fields
+    ]
+    assert {name: converter for name, _, converter in plan.fields} == {
+        'cqrs_revision': None,
+        'cqrs_updated': str,
+        'int_field': None,
+        'bool_field': None,
+        'char_field': None,
+        'date_field': str,
+        'datetime_field': str,
+        'float_field': None,
+        'url_field': None,
+        'uuid_field': str,
+    }
+
+
+def test_master_serialization_plan_chosen_fields():
+    plan = build_master_serialization_plan(master_models.ChosenFieldsModel)
+
+    assert plan.fields == (
+        ('id', 'id', None),
+        ('char_field', 'char_field', None),
+        ('cqrs_revision', 'cqrs_revision', None),
+        ('cqrs_updated', 'cqrs_updated', str),
+    )
+    assert plan.attnames == ('id', 'char_field', 'cqrs_revision', 'cqrs_updated')
+
+
+def test_master_serialization_plan_foreign_key():
+    plan = build_master_serialization_plan(master_models.Author)
+
+    assert ('publisher', 'publisher_id', None) in plan.fields
+
+
+def test_master_serialization_plan_is_registered():
+    plan = master_models.BasicFieldsModel._cqrs_serialization_plan
+
+    assert plan == build_master_serialization_plan(master_models.BasicFieldsModel)
+    assert not hasattr(master_models.Author, '_cqrs_serialization_plan')
+
+
+def test_master_serialization_plan_serialize_values():
+    plan = build_master_serialization_plan(master_models.ChosenFieldsModel)
+    updated = datetime(2021, 4, 30, 11, 50, 5, tzinfo=timezone.utc)
+
+    assert plan.serialize_values(
+        {'id': 1, 'char_field': None, 'cqrs_revision': 2, 'cqrs_updated': updated},
+    ) == {
+        'id': 1,
+        'char_field': None,
+        'cqrs_revision': 2,
+        'cqrs_updated': '2021-04-30 11:50:05+00:00',
+    }
+
+
+@pytest.mark.django_db
+def test_master_serialization_plan_serialize():
+    instance = master_models.BasicFieldsModel.objects.create(
+        int_field=1,
+        char_field='text',
+        uuid_field=UUID('f9c3b4ba-f8a1-4a7b-9c56-e21cf6c81f4f'),
+    )
+    plan = master_models.BasicFieldsModel._cqrs_serialization_plan
+
+    data = plan.serialize(instance)
+    assert data['uuid_field'] == 'f9c3b4ba-f8a1-4a7b-9c56-e21cf6c81f4f'
+    assert data['date_field'] is None
+    assert data['cqrs_updated'] == str(instance.cqrs_updated)
+    assert data == plan.serialize_values(
+        master_models.BasicFieldsModel.objects.values(*plan.attnames).get(),
+    )
+
+
+def test_replica_ingest_plan_without_mapping():
+    plan = build_replica_ingest_plan(models.BasicFieldsModelRef)
+
+    assert plan.pk_name == 'int_field'
+    assert plan.mapping is None
+    assert 'url_field' in plan.field_names
+    assert plan.required_field_names == {
+        'int_field',
+        'char_field',
+        'cqrs_revision',
+        'cqrs_updated',
+    }
+
+
+def test_replica_ingest_plan_with_mapping():
+    plan = build_replica_ingest_plan(models.MappedFieldsModelRef)
+
+    assert plan.pk_name == 'id'
+    assert plan.mapping == (('int_field', 'id'), ('char_field', 'name'))
+    assert plan.field_names == {'id', 'name', 'cqrs_revision', 'cqrs_updated'}
+
+
+def test_replica_ingest_plan_is_registered():
+    plan = models.MappedFieldsModelRef._cqrs_ingest_plan
+
+    assert plan == build_replica_ingest_plan(models.MappedFieldsModelRef)
+
+
+def test_replica_ingest_plan_convert():
+    plan = build_replica_ingest_plan(models.BasicFieldsModelRef)
+
+    assert plan.convert({'cqrs_updated': '2021-04-30 11:50:05.164341+00:00'}) == {
+        'cqrs_updated': datetime(2021, 4, 30, 11, 50, 5, 164341, tzinfo=timezone.utc),
+    }
+    assert plan.convert({'cqrs_updated': 'invalid'}) == {'cqrs_updated': 'invalid'}
+    assert plan.convert({'int_field': 1}) == {'int_field': 1}
+
+
+def test_replica_ingest_plan_convert_copies_data():
+    plan = build_replica_ingest_plan(models.BasicFieldsModelRef)
+    mapped_data = {'cqrs_updated': '2021-04-30 11:50:05+00:00'}
+
+    assert isinstance(plan.convert(mapped_data)['cqrs_updated'], datetime)
+    assert mapped_data == {'cqrs_updated': '2021-04-30 11:50:05+00:00'}
+
+
+def test_replica_ingest_plan_convert_value():
+    plan = build_replica_ingest_plan(models.BasicFieldsModelRef)
+
+    assert plan.convert_value('cqrs_updated', '2021-04-30 11:50:05+00:00') == datetime(
+        2021,
+        4,
+        30,
+        11,
+        50,
+        5,
+        tzinfo=timezone.utc,
+    )
+    assert plan.convert_value('char_field', '2021-04-30 11:50:05+00:00') == (
+        '2021-04-30 11:50:05+00:00'
+    )
@@ -0,0 +1,75 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+import pytest
+
+from dj_cqrs.prefetch import PrefetchController
+
+
+def test_initial_prefetch_count():
+    assert PrefetchController(max_count=1001, time_budget=1).prefetch_count == 1
+    assert PrefetchController(max_count=1001, time_budget=1).get_prefetch_count(5) == 6
+
+
+def test_invalid_time_budget():
+    with pytest.raises(AssertionError):
+        PrefetchController(max_count=1001, time_budget=0)
+
+
+def test_latency_moving_average():
+    controller = PrefetchController(max_count=1001, time_budget=1)
+
+    controller.observe(0, 1)
+    assert controller.latency is None
+
+    controller.observe(10, 1)
+    assert controller.latency == pytest.approx(0.1)
+
+    controller.observe(1, 1.1)
+    assert controller.latency == pytest.approx(0.3)
+
+
+@pytest.mark.parametrize(
+    'max_count,latency,held_count,expected',
+    [
+        (1001, 0.01, 0, 100),
+        (1001, 0.01, 20, 120),
+        (1001, 5, 0, 1),
+        (1001, 5, 3, 4),
+        (1001, 0.0001, 0, 1001),
+        (1001, 0, 0, 1001),
+        (0, 0.0001, 0, 10000),
+        (0, 0, 0, 1),
+    ],
+)
+def test_get_prefetch_count(max_count, latency, held_count, expected):
+    controller = PrefetchController(max_count=max_count, time_budget=1)
+    controller.latency = latency
+
+    assert controller.get_prefetch_count(held_count) == expected
+
+
+def test_adjust(mocker):
+    channel = mocker.MagicMock()
+    controller = PrefetchController(max_count=1001, time_budget=1)
+    controller.observe(100, 1)
+
+    assert controller.adjust(channel, 0) == 100
+    channel.basic_qos.assert_called_once_with(prefetch_count=100)
+
+    controller.latency = 1 / 90
+    assert controller.adjust(channel, 0) == 100
+    assert channel.basic_qos.call_count == 1
+
+    controller.latency = 1
+    assert controller.adjust(channel, 0) == 1
+    channel.basic_qos.assert_called_with(prefetch_count=1)
+
+
+def test_adjust_makes_room_for_held_messages(mocker):
+    channel = mocker.MagicMock()
+    controller = PrefetchController(max_count=1001, time_budget=1)
+    controller.latency = 1
+    controller.prefetch_count = 10
+
+    assert controller.adjust(channel, 10) == 11
+    channel.basic_qos.assert_called_once_with(prefetch_count=11)
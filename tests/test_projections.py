@@ -0,0 +1,168 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+import pytest
+from django.utils.timezone import now
+
+from dj_cqrs.constants import SignalType
+from dj_cqrs.controller.consumer import consume, consume_deletes
+from dj_cqrs.dataclasses import ProjectionDelta, TransportPayload
+from dj_cqrs.projections import (
+    Projection,
+    apply_projection_deltas,
+    collecting_projection_deltas,
+    record_projection_delta,
+)
+from dj_cqrs.registries import ProjectionRegistry
+from tests.dj_replica.models import BasicFieldsModelRef
+
+
+class CharFieldCounts(Projection):
+    CQRS_IDS = ('basic',)
+
+    counts = {}
+    batches = []
+
+    @classmethod
+    def apply(cls, deltas):
+        cls.batches.append(deltas)
+        for delta in deltas:
+            if delta.old_data:
+                cls.counts[delta.old_data['char_field']] -= 1
+            if delta.new_data:
+                value = delta.new_data['char_field']
+                cls.counts[value] = cls.counts.get(value, 0) + 1
+
+
+@pytest.fixture
+def projection(mocker):
+    mocker.patch.dict(ProjectionRegistry.projections, clear=True)
+    mocker.patch.object(CharFieldCounts, 'counts', {})
+    mocker.patch.object(CharFieldCounts, 'batches', [])
+    return ProjectionRegistry.register_projection(CharFieldCounts)
+
+
+def _save_payload(pk, revision, char_field, signal_type=SignalType.SAVE):
+    return TransportPayload(
+        signal_type,
+        'basic',
+        {
+            'int_field': pk,
+            'cqrs_revision': revision,
+            'cqrs_updated': str(now()),
+            'char_field': char_field,
+        },
+        pk,
+    )
+
+
+def _delete_payload(pk):
+    return TransportPayload(
+        SignalType.DELETE,
+        'basic',
+        {'id': pk, 'cqrs_revision': 1, 'cqrs_updated': str(now())},
+        pk,
+    )
+
+
+def _delta(pk):
+    return ProjectionDelta('basic', pk, SignalType.SAVE, None, {'char_field': 'a'})
+
+
+def test_register_projection(projection):
+    assert ProjectionRegistry.register_projection(CharFieldCounts) is CharFieldCounts
+    assert ProjectionRegistry.get_projections('basic') == [CharFieldCounts]
+    assert ProjectionRegistry.get_projections('author') == []
+
+
+def test_register_projection_without_cqrs_ids():
+    class BadProjection(Projection):
+        pass
+
+    with pytest.raises(AssertionError):
+        ProjectionRegistry.register_projection(BadProjection)
+
+
+def test_projection_is_not_implemented():
+    with pytest.raises(NotImplementedError):
+        Projection.apply([])
+
+
+def test_deltas_are_applied_in_batch(projection):
+    with collecting_projection_deltas():
+        record_projection_delta(_delta(1))
+        with collecting_projection_deltas():
+            record_projection_delta(_delta(2))
+
+        assert CharFieldCounts.batches == []
+
+    assert CharFieldCounts.batches == [[_delta(1), _delta(2)]]
+
+
+def test_deltas_are_applied_immediately_outside_of_context(projection):
+    record_projection_delta(_delta(1))
+
+    assert CharFieldCounts.batches == [[_delta(1)]]
+
+
+def test_deltas_are_not_applied_on_error(projection):
+    with pytest.raises(ValueError):
+        with collecting_projection_deltas():
+            record_projection_delta(_delta(1))
+            raise ValueError
+
+    assert CharFieldCounts.batches == []
+
+
+def test_deltas_of_other_models_are_skipped(projection):
+    apply_projection_deltas([ProjectionDelta('author', 1, SignalType.DELETE, {}, None)])
+
+    assert CharFieldCounts.batches == []
+
+
+@pytest.mark.django_db
+def test_consumed_changes_update_projection(projection):
+    consume(_save_payload(1, 0, 'a'))
+    consume(_save_payload(2, 0, 'a'))
+    consume(_save_payload(1, 1, 'b'))
+    consume(_save_payload(1, 1, 'c'))
+    consume(_save_payload(2, 0, 'b', signal_type=SignalType.SYNC))
+
+    assert CharFieldCounts.counts == {'a': 0, 'b': 2}
+
+    delta = CharFieldCounts.batches[2][0]
+    assert delta.signal_type == SignalType.SAVE
+    assert (delta.old_data['char_field'], delta.old_data['cqrs_revision']) == ('a', 0)
+    assert (delta.new_data['char_field'], delta.new_data['cqrs_revision']) == ('b', 1)
+    assert CharFieldCounts.batches[-1][0].signal_type == SignalType.SYNC
+
+
+@pytest.mark.django_db
+def test_consumed_deletes_update_projection_in_batch(projection):
+    consume(_save_payload(1, 0, 'a'))
+    consume(_save_payload(2, 0, 'a'))
+    consume(_delete_payload(3))
+
+    assert consume_deletes([_delete_payload(1), _delete_payload(2)]) is True
+
+    assert CharFieldCounts.counts == {'a': 0}
+    assert [(d.pk, d.new_data) for d in CharFieldCounts.batches[-1]] == [(1, None), (2, None)]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_projection_error_rolls_back_replica_change(projection, mocker):
+    mocker.patch.object(CharFieldCounts, 'apply', side_effect=ValueError)
+
+    with pytest.raises(ValueError):
+        consume(_save_payload(1, 0, 'a'))
+
+    assert not BasicFieldsModelRef.objects.exists()
+
+
+@pytest.mark.django_db
+def test_no_projections(django_assert_num_queries):
+    consume(_save_payload(1, 0, 'a'))
+
+    with django_assert_num_queries(1):
+        BasicFieldsModelRef.cqrs.delete_instance(
+            {'id': 1, 'cqrs_revision': 1, 'cqrs_updated': now()},
+        )
@@ -0,0 +1,149 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+import pytest
+from django.db import transaction
+
+from dj_cqrs.constants import SignalType
+from dj_cqrs.publishing import batch_cqrs_publishing
+from dj_cqrs.state import cqrs_state
+from tests.dj_master import models
+
+
+@pytest.fixture
+def produce(mocker):
+    mocker.patch('dj_cqrs.controller.producer.produce')
+    return mocker.patch('dj_cqrs.controller.producer.produce_batch')
+
+
+def _published(produce_batch):
+    return [
+        (payload.signal_type, payload.pk, payload.instance_data['cqrs_revision'])
+        for payload in produce_batch.call_args[0][0]
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_changes_are_published_on_commit_in_batch(produce):
+    with transaction.atomic():
+        with batch_cqrs_publishing():
+            for pk in (1, 2, 3):
+                models.SimplestModel.objects.create(id=pk, name='name')
+
+            models.SimplestModel.objects.get(id=1).save()
+            models.SimplestModel.objects.get(id=3).delete()
+
+        produce.assert_not_called()
+
+    produce.assert_called_once()
+    assert _published(produce) == [
+        (SignalType.SAVE, 2, 0),
+        (SignalType.SAVE, 1, 1),
+        (SignalType.DELETE, 3, 1),
+    ]
+    assert cqrs_state.publishing_batch is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_changes_are_published_on_exit_without_transaction(produce):
+    with batch_cqrs_publishing():
+        models.SimplestModel.objects.create(id=1, name='name')
+        with transaction.atomic():
+            models.SimplestModel.objects.create(id=2, name='name')
+
+        produce.assert_not_called()
+
+    assert _published(produce) == [(SignalType.SAVE, 1, 0), (SignalType.SAVE, 2, 0)]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rolled_back_changes_are_not_published(produce):
+    with batch_cqrs_publishing():
+        with transaction.atomic():
+            models.SimplestModel.objects.create(id=1, name='name')
+
+            try:
+                with transaction.atomic():
+                    models.SimplestModel.objects.create(id=2, name='name')
+                    raise ValueError
+            except ValueError:
+                pass
+
+        try:
+            with transaction.atomic():
+                models.SimplestModel.objects.create(id=3, name='name')
+                raise ValueError
+        except ValueError:
+            pass
+
+    assert _published(produce) == [(SignalType.SAVE, 1, 0)]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_committed_changes_are_published_on_error(produce):
+    with pytest.raises(ValueError):
+        with batch_cqrs_publishing():
+            models.SimplestModel.objects.create(id=1, name='name')
+            raise ValueError
+
+    assert _published(produce) == [(SignalType.SAVE, 1, 0)]
+    assert cqrs_state.publishing_batch is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_nested_contexts_are_merged(produce):
+    with batch_cqrs_publishing() as batch:
+        with batch_cqrs_publishing() as nested_batch:
+            models.SimplestModel.objects.create(id=1, name='name')
+
+        assert nested_batch is batch
+        assert len(batch) == 1
+        produce.assert_not_called()
+
+    produce.assert_called_once()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sync_is_collapsed_per_queue(produce):
+    instance = models.SimplestModel.objects.create(id=1, name='name')
+
+    with batch_cqrs_publishing():
+        instance.cqrs_sync(queue='replica')
+        instance.cqrs_sync(queue='replica')
+        instance.cqrs_sync(queue='other')
+
+    payloads = produce.call_args[0][0]
+    assert [(p.signal_type, p.queue) for p in payloads] == [
+        (SignalType.SYNC, 'replica'),
+        (SignalType.SYNC, 'other'),
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_instances_are_serialized_in_bulk(produce, django_assert_num_queries):
+    publisher = models.Publisher.objects.create(id=1, name='publisher')
+    models.Author.objects.create(id=1, name='author', publisher=publisher)
+    models.Author.objects.create(id=2, name='author', publisher=publisher)
+    authors = list(models.Author.objects.all())
+
+    # Authors with publishers and books are selected with a query and a prefetch query
+    with django_assert_num_queries(2):
+        with batch_cqrs_publishing():
+            for author in authors:
+                author.cqrs_sync()
+
+    assert [p.instance_data['publisher']['name'] for p in produce.call_args[0][0]] == [
+        'publisher',
+        'publisher',
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_missing_instances_are_skipped(produce):
+    with batch_cqrs_publishing():
+        with transaction.atomic():
+            models.Author.objects.create(id=1, name='author')
+            models.Author.objects.create(id=2, name='author')
+
+        models.Author.objects.filter(id=1)._raw_delete('default')
+
+    assert _published(produce) == [(SignalType.SAVE, 2, 0)]
@@ -1,14 +1,23 @@
 #  Copyright © 2025 CloudBlue. All rights reserved.
 
+import pickle
+from datetime import datetime, timezone
+
 import pytest
 from django.conf import settings
+from django.db import transaction
 from django.db.models import CharField, IntegerField, QuerySet
+from django.db.models.signals import post_delete
+from django.utils.dateparse import parse_datetime
 from django.utils.timezone import now
 
+from dj_cqrs import metrics
+from dj_cqrs.cache import get_read_cache, get_revision_cache
 from dj_cqrs.constants import SignalType
 from dj_cqrs.dataclasses import TransportPayload
 from dj_cqrs.metas import ReplicaMeta
 from dj_cqrs.mixins import RawReplicaMixin
+from dj_cqrs.reorder import RevisionGapError, buffering_revision_gaps
 from tests.dj.transport import TransportStub
 from tests.dj_replica import models
 from tests.utils import db_error
@@ -19,6 +28,10 @@ class ReplicaMetaTest(ReplicaMeta):
     def check_cqrs_mapping(cls, model_cls):
         return cls._check_cqrs_mapping(model_cls)
 
+    @classmethod
+    def check_cqrs_nested(cls, model_cls):
+        return cls._check_cqrs_nested(model_cls)
+
 
 def test_cqrs_fields_non_existing_field(mocker):
     with pytest.raises(AssertionError) as e:
@@ -205,6 +218,144 @@ def test_update_ok():
     assert instance.float_field == 1.30
 
 
+@pytest.mark.django_db
+def test_hooks_receive_serialized_cqrs_updated(mocker):
+    cqrs_create = mocker.spy(models.BasicFieldsModelRef, 'cqrs_create')
+    cqrs_update = mocker.spy(models.BasicFieldsModelRef, 'cqrs_update')
+    updated = '2021-04-30 11:50:05+00:00'
+
+    for revision in (0, 1):
+        models.BasicFieldsModelRef.cqrs_save(
+            {
+                'int_field': 1,
+                'cqrs_revision': revision,
+                'cqrs_updated': updated,
+                'char_field': 'text',
+            },
+        )
+
+    assert cqrs_create.call_args[0][1]['cqrs_updated'] == updated
+    assert cqrs_update.call_args[0][2]['cqrs_updated'] == updated
+
+    instance = models.BasicFieldsModelRef.objects.get(pk=1)
+    assert instance.cqrs_revision == 1
+    assert str(instance.cqrs_updated) == updated
+
+
+@pytest.mark.django_db
+def test_update_writes_only_changed_fields(mocker):
+    models.BasicFieldsModelRef.objects.create(
+        int_field=1,
+        cqrs_revision=0,
+        cqrs_updated=now(),
+        char_field='text',
+        float_field=1.30,
+    )
+    save_mock = mocker.patch.object(models.BasicFieldsModelRef, 'save')
+
+    models.BasicFieldsModelRef.cqrs_save(
+        {
+            'int_field': 1,
+            'cqrs_revision': 1,
+            'cqrs_updated': '2021-04-30 11:50:05.164341+00:00',
+            'char_field': 'new_text',
+            'float_field': 1.30,
+        },
+    )
+
+    save_mock.assert_called_once_with(
+        update_fields=['cqrs_revision', 'cqrs_updated', 'char_field'],
+    )
+
+
+@pytest.mark.django_db
+def test_update_skips_noop_write(django_assert_num_queries):
+    metrics.reset_counters()
+    cqrs_updated = now()
+    models.BasicFieldsModelRef.objects.create(
+        int_field=1,
+        cqrs_revision=1,
+        cqrs_updated=cqrs_updated,
+        char_field='text',
+    )
+
+    with django_assert_num_queries(1):
+        instance = models.BasicFieldsModelRef.cqrs_save(
+            {
+                'int_field': 1,
+                'cqrs_revision': 1,
+                'cqrs_updated': str(cqrs_updated),
+                'char_field': 'text',
+            },
+            sync=True,
+        )
+
+    assert instance.char_field == 'text'
+    assert metrics.get_counter(metrics.REPLICA_SKIPPED_WRITES) == 1
+
+
+@pytest.mark.django_db
+def test_update_bumps_only_revision(mocker):
+    metrics.reset_counters()
+    models.BasicFieldsModelRef.objects.create(
+        int_field=1,
+        cqrs_revision=0,
+        cqrs_updated=now(),
+        char_field='text',
+    )
+    save_mock = mocker.patch.object(models.BasicFieldsModelRef, 'save')
+
+    models.BasicFieldsModelRef.cqrs_save(
+        {
+            'int_field': 1,
+            'cqrs_revision': 1,
+            'cqrs_updated': now(),
+            'char_field': 'text',
+        },
+    )
+
+    save_mock.assert_called_once_with(update_fields=['cqrs_revision', 'cqrs_updated'])
+    assert metrics.get_counter(metrics.REPLICA_SKIPPED_WRITES) == 1
+
+
+@pytest.mark.django_db
+def test_update_parses_values_once(mocker):
+    instance = models.BasicFieldsModelRef.objects.create(
+        int_field=1,
+        cqrs_revision=0,
+        cqrs_updated=now(),
+        char_field='text',
+    )
+    mocker.patch.object(models.BasicFieldsModelRef, 'save')
+    parse_mock = mocker.MagicMock(wraps=parse_datetime)
+    mocker.patch('django.db.models.fields.parse_datetime', parse_mock)
+    mocker.patch('dj_cqrs.plans.parse_datetime', parse_mock)
+
+    instance.cqrs_update(
+        False,
+        {'int_field': 1, 'cqrs_revision': 1, 'cqrs_updated': '2021-04-30 11:50:05+00:00'},
+    )
+
+    assert parse_mock.call_count == 1
+    assert instance.cqrs_updated == datetime(2021, 4, 30, 11, 50, 5, tzinfo=timezone.utc)
+
+
+@pytest.mark.django_db
+def test_update_unknown_fields_saves_whole_instance(mocker):
+    instance = models.BasicFieldsModelRef.objects.create(
+        int_field=1,
+        cqrs_revision=0,
+        cqrs_updated=now(),
+        char_field='text',
+    )
+    save_mock = mocker.patch.object(models.BasicFieldsModelRef, 'save')
+
+    instance.cqrs_update(False, {'int_field': 1, 'cqrs_revision': 1, 'unknown': 1})
+    instance.cqrs_update(False, {'int_field': 1, 'cqrs_revision': 2, 'date_field': 'invalid'})
+
+    assert save_mock.call_args_list == [mocker.call(), mocker.call()]
+
+
 @pytest.mark.django_db
 def test_update_db_error(mocker, caplog):
     models.BasicFieldsModelRef.objects.create(
@@ -253,6 +404,83 @@ def test_delete_ok():
     assert models.BasicFieldsModelRef.objects.count() == 0
 
 
+@pytest.mark.django_db
+def test_delete_instances(django_assert_num_queries):
+    for pk in (1, 2, 3):
+        models.BasicFieldsModelRef.objects.create(
+            int_field=pk,
+            cqrs_revision=0,
+            cqrs_updated=now(),
+            char_field='text',
+        )
+
+    with django_assert_num_queries(1):
+        is_deleted = models.BasicFieldsModelRef.cqrs.delete_instances(
+            [{'id': pk, 'cqrs_revision': 1, 'cqrs_updated': now()} for pk in (1, 2)],
+        )
+
+    assert is_deleted
+    assert list(models.BasicFieldsModelRef.objects.values_list('pk', flat=True)) == [3]
+
+
+@pytest.mark.django_db
+def test_delete_instances_bad_data(caplog):
+    is_deleted = models.BasicFieldsModelRef.cqrs.delete_instances(
+        [{'id': 1, 'cqrs_revision': 1, 'cqrs_updated': now()}, {'cqrs_revision': 1}],
+    )
+
+    assert not is_deleted
+    assert 'CQRS PK is not provided in data (basic).' in caplog.text
+
+
+@pytest.mark.django_db
+def test_delete_instances_db_error(mocker, caplog):
+    mocker.patch.object(models.BasicFieldsModelRef.objects, 'filter', side_effect=db_error)
+
+    is_deleted = models.BasicFieldsModelRef.cqrs.delete_instances(
+        [{'id': pk, 'cqrs_revision': 1, 'cqrs_updated': now()} for pk in (1, 2)],
+    )
+
+    assert not is_deleted
+    assert 'CQRS delete error: pks = [1, 2] (basic).' in caplog.text
+
+
+@pytest.mark.django_db
+def test_delete_by_pks_fast_path(mocker):
+    delete_mock = mocker.patch('django.db.models.QuerySet.delete')
+    models.BasicFieldsModelRef.objects.create(
+        int_field=1,
+        cqrs_revision=0,
+        cqrs_updated=now(),
+        char_field='text',
+    )
+
+    assert models.BasicFieldsModelRef.cqrs.delete_by_pks([1, 2]) == 1
+    delete_mock.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_delete_by_pks_with_signal_receivers():
+    models.BasicFieldsModelRef.objects.create(
+        int_field=1,
+        cqrs_revision=0,
+        cqrs_updated=now(),
+        char_field='text',
+    )
+    deleted = []
+
+    def receiver(instance, **kwargs):
+        deleted.append(instance.pk)
+
+    post_delete.connect(receiver, sender=models.BasicFieldsModelRef)
+    try:
+        assert models.BasicFieldsModelRef.cqrs.delete_by_pks([1]) == 1
+    finally:
+        post_delete.disconnect(receiver, sender=models.BasicFieldsModelRef)
+
+    assert deleted == [1]
+
+
 @pytest.mark.django_db
 def test_delete_non_existing_id():
     is_deleted = models.BasicFieldsModelRef.cqrs_delete(
@@ -515,6 +743,256 @@ def test_updates_were_lost(caplog):
     assert 'Lost or filtered out 4 CQRS packages: pk = 1, cqrs_revision = 5 (basic)' in caplog.text
 
 
+@pytest.mark.django_db
+def test_revision_gap_metrics():
+    metrics.reset_counters()
+    models.BasicFieldsModelRef.objects.create(
+        int_field=1,
+        cqrs_revision=3,
+        cqrs_updated=now(),
+        char_field='text',
+    )
+
+    for revision in (5, 4):
+        models.BasicFieldsModelRef.cqrs_save(
+            {
+                'int_field': 1,
+                'cqrs_revision': revision,
+                'cqrs_updated': now(),
+                'char_field': 'text{0}'.format(revision),
+            },
+        )
+
+    assert metrics.get_counter(metrics.REPLICA_REVISION_GAPS) == 1
+    assert metrics.get_counter(metrics.REPLICA_OUTDATED_REVISIONS) == 1
+
+
+@pytest.mark.django_db
+def test_revision_gap_requests_resync(mocker):
+    request_resync = mocker.patch('dj_cqrs.managers.request_resync')
+    models.BasicFieldsModelRef.objects.create(
+        int_field=1,
+        cqrs_revision=0,
+        cqrs_updated=now(),
+        char_field='text',
+    )
+
+    for pk, revision in ((1, 2), (2, 3), (1, 3)):
+        models.BasicFieldsModelRef.cqrs_save(
+            {
+                'int_field': pk,
+                'cqrs_revision': revision,
+                'cqrs_updated': now(),
+                'char_field': 'text',
+            },
+        )
+
+    # Missing instance is created from the full state without a resync
+    assert request_resync.call_args_list == [mocker.call('basic', 1, using='default')]
+    assert models.BasicFieldsModelRef.objects.get(pk=2).cqrs_revision == 3
+
+
+@pytest.mark.django_db
+def test_sync_doesnt_request_resync(mocker):
+    request_resync = mocker.patch('dj_cqrs.managers.request_resync')
+
+    models.BasicFieldsModelRef.cqrs_save(
+        {'int_field': 1, 'cqrs_revision': 3, 'cqrs_updated': now(), 'char_field': 'text'},
+        sync=True,
+    )
+
+    request_resync.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_revision_gap_buffering(caplog):
+    metrics.reset_counters()
+    models.BasicFieldsModelRef.objects.create(
+        int_field=1,
+        cqrs_revision=0,
+        cqrs_updated=now(),
+        char_field='text',
+    )
+
+    with pytest.raises(RevisionGapError) as e:
+        with buffering_revision_gaps():
+            models.BasicFieldsModelRef.cqrs_save(
+                {
+                    'int_field': 1,
+                    'cqrs_revision': 2,
+                    'cqrs_updated': now(),
+                    'char_field': 'text2',
+                },
+            )
+
+    assert (e.value.cqrs_id, e.value.pk, e.value.revision, e.value.expected_revision) == (
+        'basic',
+        1,
+        2,
+        1,
+    )
+    assert models.BasicFieldsModelRef.objects.get(pk=1).cqrs_revision == 0
+    assert metrics.get_counter(metrics.REPLICA_REVISION_GAPS) == 0
+    assert 'Lost or filtered out' not in caplog.text
+
+
+def test_revision_gap_error_pickling():
+    error = pickle.loads(pickle.dumps(RevisionGapError('basic', 1, 3, 2)))
+
+    assert (error.cqrs_id, error.pk, error.revision, error.expected_revision) == ('basic', 1, 3, 2)
+    assert str(error) == 'CQRS revision gap: pk = 1, cqrs_revision = 3, expected = 2 (basic).'
+
+
+@pytest.fixture
+def revision_cache(settings):
+    settings.CQRS['replica']['CQRS_REVISION_CACHE_SIZE'] = 100
+    cache = get_revision_cache()
+    cache.clear()
+    return cache
+
+
+@pytest.mark.django_db(transaction=True)
+def test_revision_cache_skips_duplicates_without_db(
+    revision_cache,
+    caplog,
+    django_assert_num_queries,
+):
+    data = {
+        'int_field': 1,
+        'cqrs_revision': 0,
+        'cqrs_updated': now(),
+        'char_field': 'text',
+    }
+    models.BasicFieldsModelRef.cqrs_save(data)
+    assert revision_cache.get('basic', 1) == 0
+
+    with django_assert_num_queries(0):
+        assert models.BasicFieldsModelRef.cqrs_save(data) is True
+
+    assert 'Received duplicate CQRS data: pk = 1, cqrs_revision = 0 (basic).' in caplog.text
+
+
+@pytest.mark.django_db(transaction=True)
+def test_revision_cache_checks_sync_duplicates_in_db(revision_cache):
+    data = {
+        'int_field': 1,
+        'cqrs_revision': 0,
+        'cqrs_updated': now(),
+        'char_field': 'text',
+    }
+    models.BasicFieldsModelRef.cqrs_save(data)
+    models.BasicFieldsModelRef.objects.all().delete()
+
+    instance = models.BasicFieldsModelRef.cqrs_save(data, sync=True)
+
+    assert instance.char_field == 'text'
+    assert models.BasicFieldsModelRef.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_revision_cache_applies_lower_revision_of_recreated_instance(revision_cache):
+    # Instance was deleted and recreated by another worker
+    revision_cache.set('basic', 1, 3)
+
+    instance = models.BasicFieldsModelRef.cqrs_save(
+        {
+            'int_field': 1,
+            'cqrs_revision': 0,
+            'cqrs_updated': now(),
+            'char_field': 'recreated',
+        },
+    )
+
+    assert instance.char_field == 'recreated'
+    assert models.BasicFieldsModelRef.objects.get(int_field=1).cqrs_revision == 0
+    assert revision_cache.get('basic', 1) == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_revision_cache_applies_sync_downgrade(revision_cache):
+    models.BasicFieldsModelRef.objects.create(
+        int_field=1,
+        cqrs_revision=3,
+        cqrs_updated=now(),
+        char_field='text',
+    )
+    revision_cache.set('basic', 1, 3)
+
+    instance = models.BasicFieldsModelRef.cqrs_save(
+        {
+            'int_field': 1,
+            'cqrs_revision': 2,
+            'cqrs_updated': now(),
+            'char_field': 'synced',
+        },
+        sync=True,
+    )
+
+    assert instance.char_field == 'synced'
+    assert revision_cache.get('basic', 1) == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_revision_cache_update_and_delete(revision_cache):
+    models.BasicFieldsModelRef.objects.create(
+        int_field=1,
+        cqrs_revision=0,
+        cqrs_updated=now(),
+        char_field='text',
+    )
+
+    models.BasicFieldsModelRef.cqrs_save(
+        {
+            'int_field': 1,
+            'cqrs_revision': 1,
+            'cqrs_updated': now(),
+            'char_field': 'new_text',
+        },
+    )
+    assert revision_cache.get('basic', 1) == 1
+
+    models.BasicFieldsModelRef.cqrs_delete({'id': 1, 'cqrs_revision': 2, 'cqrs_updated': now()})
+    assert revision_cache.get('basic', 1) is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_revision_cache_is_warmed_by_db_duplicates(revision_cache):
+    models.BasicFieldsModelRef.objects.create(
+        int_field=1,
+        cqrs_revision=5,
+        cqrs_updated=now(),
+        char_field='text',
+    )
+
+    models.BasicFieldsModelRef.cqrs_save(
+        {
+            'int_field': 1,
+            'cqrs_revision': 4,
+            'cqrs_updated': now(),
+            'char_field': 'old_text',
+        },
+    )
+
+    assert revision_cache.get('basic', 1) == 5
+
+
+@pytest.mark.django_db(transaction=True)
+def test_revision_cache_is_not_updated_on_rollback(revision_cache):
+    with pytest.raises(ZeroDivisionError):
+        with transaction.atomic():
+            models.BasicFieldsModelRef.cqrs_save(
+                {
+                    'int_field': 1,
+                    'cqrs_revision': 0,
+                    'cqrs_updated': now(),
+                    'char_field': 'text',
+                },
+            )
+            1 / 0
+
+    assert revision_cache.get('basic', 1) is None
+
+
 @pytest.mark.django_db()
 def test_tracked_fields_mapped(mocker):
     cqrs_update_mock = mocker.patch.object(models.MappedFieldsModelRef, 'cqrs_update')
@@ -597,6 +1075,25 @@ def test_get_cqrs_retry_delay(settings, retry_delay, current_retry):
     assert result is retry_delay
 
 
+@pytest.mark.parametrize(
+    'dependencies, master_data, result',
+    (
+        (None, {'author_id': 1}, []),
+        ({'author_id': 'author'}, {'author_id': 1}, [('author', 1)]),
+        ({'author_id': 'author'}, {'author_id': None}, []),
+        (
+            {'author_id': 'author', 'publisher_id': 'publisher'},
+            {'publisher_id': 2},
+            [('publisher', 2)],
+        ),
+    ),
+)
+def test_get_cqrs_dependencies(mocker, dependencies, master_data, result):
+    mocker.patch.object(models.BasicFieldsModelRef, 'CQRS_DEPENDENCIES', dependencies)
+
+    assert models.BasicFieldsModelRef.get_cqrs_dependencies(master_data) == result
+
+
 @pytest.mark.django_db(transaction=True)
 def test_support_for_meta_create():
     meta = TransportStub.consume(
@@ -711,3 +1208,225 @@ def test_support_for_non_models_delete(cqrs_id):
     assert _cqrs_id == cqrs_id
     assert _data == data
     assert kwargs == {'meta': meta}
+
+
+@pytest.mark.parametrize(
+    'cqrs_nested',
+    (
+        ['lines'],
+        {'lines': 'dj_replica.OrderLine'},
+        {'lines': ('dj_replica.OrderLine', 'order', 'id')},
+        {'lines': ('dj_replica.OrderLine', None)},
+    ),
+)
+def test_cqrs_nested_bad_setting(cqrs_nested):
+    class Cls(object):
+        CQRS_NESTED = cqrs_nested
+
+    with pytest.raises(AssertionError) as e:
+        ReplicaMetaTest.check_cqrs_nested(Cls)
+
+    assert str(e.value) == 'CQRS_NESTED is not correctly set for model Cls.'
+
+
+def _order_data(revision, lines, **kwargs):
+    data = {
+        'id': 1,
+        'number': 'order',
+        'cqrs_revision': revision,
+        'cqrs_updated': now(),
+        'lines': lines,
+    }
+    data.update(kwargs)
+    return data
+
+
+@pytest.mark.django_db
+def test_nested_rows_are_created():
+    instance = models.OrderRef.cqrs_save(
+        _order_data(
+            0,
+            [
+                {'id': 1, 'product': 'a', 'quantity': 2, 'unknown': 'x'},
+                {'id': 2, 'product': 'b'},
+            ],
+        ),
+    )
+
+    assert instance.number == 'order'
+    lines = models.OrderLine.objects.order_by('id')
+    assert list(lines.values_list('id', 'order_id', 'product', 'quantity')) == [
+        (1, 1, 'a', 2),
+        (2, 1, 'b', 1),
+    ]
+
+
+@pytest.mark.django_db
+def test_nested_rows_are_synced_in_bulk(django_assert_num_queries):
+    models.OrderRef.cqrs_save(
+        _order_data(
+            0,
+            [
+                {'id': 1, 'product': 'a'},
+                {'id': 2, 'product': 'b'},
+                {'id': 3, 'product': 'c'},
+            ],
+        ),
+    )
+
+    # Select order, update order, select lines, delete, bulk update, bulk create
+    with django_assert_num_queries(6):
+        models.OrderRef.cqrs_save(
+            _order_data(
+                1,
+                [
+                    {'id': 1, 'product': 'a'},
+                    {'id': 2, 'product': 'b2', 'quantity': 5},
+                    {'id': 4, 'product': 'd'},
+                ],
+            ),
+        )
+
+    assert list(
+        models.OrderLine.objects.order_by('id').values_list('id', 'product', 'quantity'),
+    ) == [(1, 'a', 1), (2, 'b2', 5), (4, 'd', 1)]
+
+
+@pytest.mark.django_db
+def test_nested_rows_are_not_changed_by_outdated_package():
+    models.OrderRef.cqrs_save(_order_data(2, [{'id': 1, 'product': 'a'}]))
+    models.OrderRef.cqrs_save(_order_data(1, [{'id': 1, 'product': 'b'}]))
+
+    assert list(models.OrderLine.objects.values_list('product', flat=True)) == ['a']
+
+
+@pytest.mark.django_db
+def test_nested_rows_are_kept_without_nested_data():
+    models.OrderRef.cqrs_save(_order_data(0, [{'id': 1, 'product': 'a'}]))
+
+    data = _order_data(1, [])
+    del data['lines']
+    models.OrderRef.cqrs_save(data)
+    assert models.OrderLine.objects.count() == 1
+
+    models.OrderRef.cqrs_save(_order_data(2, None))
+    assert models.OrderLine.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_nested_rows_without_pk(caplog):
+    assert models.OrderRef.cqrs_save(_order_data(0, [{'product': 'a'}])) is None
+
+    assert models.OrderRef.objects.count() == 0
+    assert 'CQRS PK is not provided in nested lines data (order).' in caplog.text
+
+
+@pytest.fixture
+def read_cache(settings, mocker):
+    settings.CQRS['replica']['CQRS_READ_CACHE_SIZE'] = 100
+    mocker.patch.object(models.BasicFieldsModelRef, 'CQRS_READ_CACHE', True)
+    cache = get_read_cache()
+    cache.clear()
+    metrics.reset_counters()
+    return cache
+
+
+def _create_basic_instances(*pks):
+    for pk in pks:
+        models.BasicFieldsModelRef.objects.create(
+            int_field=pk,
+            cqrs_revision=0,
+            cqrs_updated=now(),
+            char_field='text',
+        )
+
+
+@pytest.mark.django_db
+def test_cached_filter_by_pks(read_cache, django_assert_num_queries):
+    _create_basic_instances(1, 2)
+
+    with django_assert_num_queries(1):
+        instances = models.BasicFieldsModelRef.cqrs.cached_filter_by_pks([2, 3, 1])
+    assert [instance.pk for instance in instances] == [2, 1]
+
+    with django_assert_num_queries(1):
+        instances = models.BasicFieldsModelRef.cqrs.cached_filter_by_pks([1, 2, 3])
+    assert [instance.pk for instance in instances] == [1, 2]
+
+    assert metrics.get_counter(metrics.REPLICA_READ_CACHE_HITS) == 2
+    assert metrics.get_counter(metrics.REPLICA_READ_CACHE_MISSES) == 4
+
+
+@pytest.mark.django_db
+def test_cached_get(read_cache, django_assert_num_queries):
+    _create_basic_instances(1)
+
+    assert models.BasicFieldsModelRef.cqrs.cached_get(1).char_field == 'text'
+    with django_assert_num_queries(0):
+        assert models.BasicFieldsModelRef.cqrs.cached_get(1).pk == 1
+
+    with pytest.raises(models.BasicFieldsModelRef.DoesNotExist):
+        models.BasicFieldsModelRef.cqrs.cached_get(2)
+
+
+@pytest.mark.django_db
+def test_cached_get_without_read_cache(settings, django_assert_num_queries):
+    settings.CQRS['replica']['CQRS_READ_CACHE_SIZE'] = 100
+    get_read_cache().clear()
+    _create_basic_instances(1)
+
+    models.BasicFieldsModelRef.cqrs.cached_get(1)
+    with django_assert_num_queries(1):
+        assert models.BasicFieldsModelRef.cqrs.cached_filter_by_pks([1, 2])[0].pk == 1
+
+    assert len(get_read_cache()) == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_read_cache_is_invalidated_by_consumed_changes(read_cache):
+    _create_basic_instances(1, 2)
+    models.BasicFieldsModelRef.cqrs.cached_filter_by_pks([1, 2])
+
+    models.BasicFieldsModelRef.cqrs_save(
+        {
+            'int_field': 1,
+            'cqrs_revision': 1,
+            'cqrs_updated': now(),
+            'char_field': 'new_text',
+        },
+    )
+    assert read_cache.get_many('basic', [1, 2]).keys() == {2}
+    assert models.BasicFieldsModelRef.cqrs.cached_get(1).char_field == 'new_text'
+
+    models.BasicFieldsModelRef.cqrs_delete({'id': 2, 'cqrs_revision': 1, 'cqrs_updated': now()})
+    with pytest.raises(models.BasicFieldsModelRef.DoesNotExist):
+        models.BasicFieldsModelRef.cqrs.cached_get(2)
+
+    models.BasicFieldsModelRef.cqrs.delete_by_pks([1])
+    assert read_cache.get_many('basic', [1, 2]) == {}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_read_cache_is_invalidated_after_commit(read_cache):
+    _create_basic_instances(1)
+    stale_instance = models.BasicFieldsModelRef.objects.get(pk=1)
+
+    with transaction.atomic():
+        models.BasicFieldsModelRef.cqrs_save(
+            {
+                'int_field': 1,
+                'cqrs_revision': 1,
+                'cqrs_updated': now(),
+                'char_field': 'new_text',
+            },
+        )
+        # Concurrent read before the commit
+        read_cache.set_many('basic', {1: stale_instance})
+
+    assert read_cache.get_many('basic', [1]) == {}
+
+    # Concurrent read, that was selected before the commit, is cached after it
+    read_cache.set_many('basic', {1: stale_instance})
+    assert read_cache.get_many('basic', [1]) == {}
+    assert models.BasicFieldsModelRef.cqrs.cached_get(1).char_field == 'new_text'
+    assert read_cache.get_many('basic', [1])[1].cqrs_revision == 1
@@ -0,0 +1,71 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+import pytest
+
+from dj_cqrs import metrics
+from dj_cqrs.constants import SignalType
+from dj_cqrs.resync import flush_resync_requests, request_resync, resync_requests
+
+
+@pytest.fixture
+def produce(mocker):
+    resync_requests.pop_all()
+    yield mocker.patch('dj_cqrs.controller.producer.produce')
+    resync_requests.pop_all()
+
+
+def test_resync_disabled(settings, produce):
+    settings.CQRS['replica'].pop('CQRS_RESYNC_WINDOW', None)
+
+    request_resync('basic', 1)
+
+    assert len(resync_requests) == 0
+    assert flush_resync_requests() == 0
+    produce.assert_not_called()
+
+
+def test_resync_requests_are_aggregated(settings, produce, mocker):
+    settings.CQRS['replica']['CQRS_RESYNC_WINDOW'] = 5
+    metrics.reset_counters()
+    monotonic = mocker.patch('dj_cqrs.resync.time.monotonic', return_value=100)
+
+    for cqrs_id, pk in (('basic', 1), ('basic', 2), ('author', 1), ('basic', 1)):
+        request_resync(cqrs_id, pk)
+
+    assert len(resync_requests) == 3
+    assert flush_resync_requests() == 0
+
+    monotonic.return_value = 105
+    assert flush_resync_requests() == 3
+
+    payloads = {call.args[0].cqrs_id: call.args[0] for call in produce.call_args_list}
+    assert payloads.keys() == {'basic', 'author'}
+    assert payloads['basic'].signal_type == SignalType.RESYNC
+    assert payloads['basic'].queue == 'replica'
+    assert payloads['basic'].pk is None
+    assert sorted(payloads['basic'].instance_data['pks']) == [1, 2]
+    assert payloads['author'].instance_data == {'pks': [1]}
+    assert len(resync_requests) == 0
+    assert metrics.get_counter(metrics.REPLICA_RESYNC_REQUESTS) == 3
+
+
+@pytest.mark.django_db(transaction=True)
+def test_resync_requests_are_flushed_when_window_is_passed(settings, produce, mocker):
+    settings.CQRS['replica']['CQRS_RESYNC_WINDOW'] = 5
+    monotonic = mocker.patch('dj_cqrs.resync.time.monotonic', return_value=100)
+
+    request_resync('basic', 1)
+    monotonic.return_value = 106
+    request_resync('basic', 2)
+
+    assert produce.call_count == 1
+    assert sorted(produce.call_args[0][0].instance_data['pks']) == [1, 2]
+
+
+def test_flush_resync_requests_force(settings, produce):
+    settings.CQRS['replica']['CQRS_RESYNC_WINDOW'] = 60
+    request_resync('basic', 1)
+
+    assert flush_resync_requests() == 0
+    assert flush_resync_requests(force=True) == 1
+    assert produce.call_count == 1
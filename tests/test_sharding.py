@@ -0,0 +1,202 @@
+#  Copyright © 2025 CloudBlue. All rights reserved.
+
+import pytest
+from django.db import DatabaseError, router, transaction
+from django.db.models.signals import post_save
+from django.utils.timezone import now
+
+from dj_cqrs.changes import collecting_applied_changes
+from dj_cqrs.constants import SignalType
+from dj_cqrs.controller.consumer import consume, consume_deletes
+from dj_cqrs.dataclasses import TransportPayload
+from dj_cqrs.managers import ReplicaManager
+from dj_cqrs.resync import request_resync, resync_requests
+from dj_cqrs.sharding import (
+    ReplicaShardRouter,
+    get_current_shard,
+    get_shard,
+    group_by_shard,
+    using_shard,
+)
+from dj_cqrs.signals import post_cqrs_apply
+from tests.dj_master.models import SimplestModel
+from tests.dj_replica.models import BasicFieldsModelRef, OrderLine
+
+
+def shard_by_parity(cqrs_id, pk):
+    return 'even' if pk % 2 == 0 else 'odd'
+
+
+def test_get_shard_without_router():
+    assert get_shard('basic', 1) is None
+
+
+@pytest.mark.parametrize('shard_router', (shard_by_parity, 'tests.test_sharding.shard_by_parity'))
+def test_get_shard(settings, shard_router):
+    settings.CQRS['replica']['CQRS_SHARD_ROUTER'] = shard_router
+
+    assert get_shard('basic', 1) == 'odd'
+    assert get_shard('basic', 2) == 'even'
+
+
+def test_using_shard():
+    shard_router = ReplicaShardRouter()
+    assert shard_router.db_for_write(BasicFieldsModelRef) is None
+
+    with using_shard('odd'):
+        with using_shard(None):
+            assert get_current_shard() == 'odd'
+
+        with using_shard('even'):
+            assert shard_router.db_for_read(BasicFieldsModelRef) == 'even'
+
+        assert shard_router.db_for_write(BasicFieldsModelRef) == 'odd'
+        assert shard_router.db_for_write(SimplestModel) is None
+        assert shard_router.db_for_read(SimplestModel) is None
+
+    assert get_current_shard() is None
+
+
+def test_group_by_shard(settings):
+    settings.CQRS['replica']['CQRS_SHARD_ROUTER'] = shard_by_parity
+
+    assert group_by_shard('basic', [1, 2, 3]) == {'odd': [0, 2], 'even': [1]}
+
+
+def test_group_by_shard_without_router():
+    assert group_by_shard('basic', [1, 2, 3]) == {None: [0, 1, 2]}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_consume_routes_to_shard(settings, mocker):
+    settings.CQRS['replica']['CQRS_SHARD_ROUTER'] = lambda cqrs_id, pk: 'default'
+    settings.DATABASE_ROUTERS = ['dj_cqrs.sharding.ReplicaShardRouter']
+    db_for_write = mocker.spy(router, 'db_for_write')
+    shards = []
+
+    def receiver(**kwargs):
+        shards.append(get_current_shard())
+
+    post_save.connect(receiver, sender=BasicFieldsModelRef)
+    try:
+        consume(
+            TransportPayload(
+                SignalType.SAVE,
+                'basic',
+                {'int_field': 1, 'char_field': 'text', 'cqrs_revision': 0, 'cqrs_updated': now()},
+                1,
+            ),
+        )
+    finally:
+        post_save.disconnect(receiver, sender=BasicFieldsModelRef)
+
+    assert shards == ['default']
+    assert db_for_write.spy_return == 'default'
+    assert get_current_shard() is None
+    assert BasicFieldsModelRef.objects.filter(pk=1).exists()
+
+
+def test_consume_deletes_per_shard(settings, mocker):
+    settings.CQRS['replica']['CQRS_SHARD_ROUTER'] = shard_by_parity
+    mocker.patch('dj_cqrs.controller.consumer.connections_health_check')
+    delete_shard_instances = mocker.patch(
+        'dj_cqrs.controller.consumer._delete_shard_instances',
+        side_effect=[True, False],
+    )
+    payloads = [
+        TransportPayload(SignalType.DELETE, 'basic', {'id': pk, 'cqrs_revision': 1}, pk)
+        for pk in (1, 2, 3)
+    ]
+
+    assert consume_deletes(payloads) is False
+    assert delete_shard_instances.call_args_list == [
+        mocker.call(BasicFieldsModelRef, 'odd', [payloads[0], payloads[2]]),
+        mocker.call(BasicFieldsModelRef, 'even', [payloads[1]]),
+    ]
+
+
+@pytest.fixture
+def shard(settings):
+    settings.CQRS['replica']['CQRS_SHARD_ROUTER'] = lambda cqrs_id, pk: 'shard'
+    settings.DATABASE_ROUTERS = ['dj_cqrs.sharding.ReplicaShardRouter']
+
+
+@pytest.fixture
+def receiver(mocker):
+    receiver = mocker.MagicMock()
+    post_cqrs_apply.connect(receiver, weak=False)
+    yield receiver
+    post_cqrs_apply.disconnect(receiver)
+
+
+def _save_payload(pk):
+    return TransportPayload(
+        SignalType.SAVE,
+        'basic',
+        {'int_field': pk, 'char_field': 'text', 'cqrs_revision': 0, 'cqrs_updated': now()},
+        pk,
+    )
+
+
+@pytest.mark.django_db(transaction=True, databases=['default', 'shard'])
+def test_consume_commits_to_shard(shard, receiver):
+    with collecting_applied_changes():
+        assert consume(_save_payload(1))
+
+    assert BasicFieldsModelRef.objects.using('shard').filter(pk=1).exists()
+    assert not BasicFieldsModelRef.objects.using('default').filter(pk=1).exists()
+    assert [change.pk for change in receiver.call_args[1]['changes']] == [1]
+
+
+@pytest.mark.django_db(transaction=True, databases=['default', 'shard'])
+def test_consume_stores_nested_rows_in_shard(shard):
+    payload = TransportPayload(
+        SignalType.SAVE,
+        'order',
+        {
+            'id': 1,
+            'number': 'order',
+            'cqrs_revision': 0,
+            'cqrs_updated': now(),
+            'lines': [{'id': 1, 'product': 'a'}],
+        },
+        1,
+    )
+
+    assert consume(payload)
+
+    assert list(OrderLine.objects.using('shard').values_list('id', 'order_id')) == [(1, 1)]
+    assert not OrderLine.objects.using('default').exists()
+
+
+@pytest.mark.django_db(transaction=True, databases=['default', 'shard'])
+def test_consume_rolls_back_shard(shard, receiver, mocker):
+    mocker.patch.object(ReplicaManager, '_record_projection_delta', side_effect=ValueError)
+
+    with pytest.raises(ValueError):
+        with collecting_applied_changes():
+            consume(_save_payload(1))
+
+    assert not BasicFieldsModelRef.objects.using('shard').filter(pk=1).exists()
+    receiver.assert_not_called()
+
+
+@pytest.mark.django_db(transaction=True, databases=['default', 'shard'])
+def test_resync_is_requested_after_shard_commit(settings, mocker):
+    settings.CQRS['replica']['CQRS_RESYNC_WINDOW'] = 5
+    mocker.patch('dj_cqrs.resync.get_resync_window', return_value=-1)
+    produce = mocker.patch('dj_cqrs.controller.producer.produce')
+    resync_requests.pop_all()
+
+    with pytest.raises(DatabaseError):
+        with transaction.atomic(using='shard'):
+            request_resync('basic', 1, using='shard')
+            raise DatabaseError
+
+    produce.assert_not_called()
+
+    with transaction.atomic(using='shard'):
+        request_resync('basic', 2, using='shard')
+        produce.assert_not_called()
+
+    assert sorted(produce.call_args[0][0].instance_data['pks']) == [1, 2]
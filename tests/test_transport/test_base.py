@@ -13,3 +13,16 @@ def test_base_transport_consume():
 def test_base_transport_produce():
     with pytest.raises(NotImplementedError):
         BaseTransport.produce(None)
+
+
+def test_base_transport_produce_batch(mocker):
+    produce = mocker.patch.object(BaseTransport, 'produce')
+
+    BaseTransport.produce_batch([1, 2])
+
+    assert produce.call_args_list == [mocker.call(1), mocker.call(2)]
+
+
+def test_base_transport_get_queue_depth():
+    with pytest.raises(NotImplementedError):
+        BaseTransport.get_queue_depth()
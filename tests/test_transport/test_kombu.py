@@ -148,6 +148,35 @@ def test_produce_ok(kombu_transport, mocker, caplog):
     assert 'CQRS is published: pk = 1 (CQRS_ID)' in caplog.text
 
 
+def test_produce_batch_ok(kombu_transport, mocker):
+    connection = mocker.MagicMock()
+    get_kombu_objects = mocker.patch.object(
+        KombuTransport,
+        '_get_producer_kombu_objects',
+        return_value=(connection, None),
+    )
+    produce_message = mocker.patch.object(KombuTransport, '_produce_message')
+
+    kombu_transport.produce_batch(
+        [TransportPayload(SignalType.SAVE, 'CQRS_ID', {'id': pk}, pk) for pk in (1, 2)],
+    )
+
+    get_kombu_objects.assert_called_once()
+    assert produce_message.call_count == 2
+    connection.close.assert_called_once()
+
+
+def test_produce_batch_error(kombu_transport, mocker, caplog):
+    mocker.patch.object(KombuTransport, '_get_producer_kombu_objects', side_effect=kombu_error)
+    produce = mocker.patch.object(KombuTransport, 'produce')
+    payloads = [TransportPayload(SignalType.SAVE, 'CQRS_ID', {'id': pk}, pk) for pk in (1, 2)]
+
+    kombu_transport.produce_batch(payloads)
+
+    assert produce.call_args_list == [mocker.call(payloads[0]), mocker.call(payloads[1])]
+    assert "CQRS batch couldn't be published: 2 of 2 payload(s) are left." in caplog.text
+
+
 def test_produce_message_ok(mocker):
     channel = mocker.MagicMock()
     payload = TransportPayload(
@@ -357,3 +386,30 @@ def test_consumer_run(mocker):
     PublicKombuTransport.consume()
 
     mocked_run.assert_called_once()
+
+
+def test_consumer_ready_callback(mocker):
+    mocker.patch('dj_cqrs.transport.kombu.Connection')
+    ready_callback = mocker.MagicMock()
+
+    c = _KombuConsumer(
+        'amqp://localhost',
+        'cqrs',
+        'cqrs_queue',
+        2,
+        None,
+        ready_callback=ready_callback,
+    )
+    c.on_consume_ready(None, None, [])
+
+    ready_callback.assert_called_once_with()
+
+
+def test_consumer_flushes_resync_requests(mocker):
+    mocker.patch('dj_cqrs.transport.kombu.Connection')
+    flush_mock = mocker.patch('dj_cqrs.transport.kombu.flush_resync_requests')
+
+    c = _KombuConsumer('amqp://localhost', 'cqrs', 'cqrs_queue', 2, None)
+    c.on_iteration()
+
+    flush_mock.assert_called_once_with()
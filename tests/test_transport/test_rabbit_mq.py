@@ -15,6 +15,7 @@ from pika.exceptions import (
     StreamLostError,
 )
 
+from dj_cqrs import metrics
 from dj_cqrs.constants import (
     DEFAULT_MASTER_AUTO_UPDATE_FIELDS,
     DEFAULT_MASTER_MESSAGE_TTL,
@@ -23,9 +24,12 @@ from dj_cqrs.constants import (
     DEFAULT_REPLICA_RETRY_DELAY,
     SignalType,
 )
+from dj_cqrs.controller import consumer
 from dj_cqrs.dataclasses import TransportPayload
 from dj_cqrs.delay import DelayMessage, DelayQueue
+from dj_cqrs.reorder import RevisionGapError, is_buffering_revision_gaps
 from dj_cqrs.transport.rabbit_mq import RabbitMQTransport
+from tests.dj_replica.models import AsyncHandledModel, BasicFieldsModelRef, BatchHandledModel
 from tests.utils import db_error
 
 
@@ -46,6 +50,10 @@ class PublicRabbitMQTransport(RabbitMQTransport):
     def consume_message(cls, *args):
         return cls._consume_message(*args)
 
+    @classmethod
+    def consume_messages(cls, *args):
+        return cls._consume_messages(*args)
+
     @classmethod
     def delay_message(cls, *args):
         return cls._delay_message(*args)
@@ -229,6 +237,42 @@ def test_produce_ok(rabbit_transport, mocker, caplog):
     assert 'CQRS is published: pk = 1 (CQRS_ID)' in caplog.text
 
 
+def test_produce_batch_ok(rabbit_transport, mocker):
+    connection = mocker.MagicMock(is_closed=False)
+    create_connection = mocker.patch.object(
+        RabbitMQTransport,
+        '_create_connection',
+        return_value=(connection, mocker.MagicMock()),
+    )
+    produce_message = mocker.patch.object(RabbitMQTransport, '_produce_message')
+    produce = mocker.patch.object(RabbitMQTransport, 'produce')
+
+    rabbit_transport.produce_batch(
+        [TransportPayload(SignalType.SAVE, 'CQRS_ID', {'id': pk}, pk) for pk in (1, 2, 3)],
+    )
+
+    create_connection.assert_called_once()
+    assert produce_message.call_count == 3
+    produce.assert_not_called()
+    connection.close.assert_called_once()
+
+
+def test_produce_batch_error(rabbit_transport, mocker, caplog):
+    mocker.patch.object(
+        RabbitMQTransport,
+        '_create_connection',
+        return_value=(mocker.MagicMock(is_closed=True), mocker.MagicMock()),
+    )
+    mocker.patch.object(RabbitMQTransport, '_produce_message', side_effect=[None, AMQPError])
+    produce = mocker.patch.object(RabbitMQTransport, 'produce')
+    payloads = [TransportPayload(SignalType.SAVE, 'CQRS_ID', {'id': pk}, pk) for pk in (1, 2, 3)]
+
+    rabbit_transport.produce_batch(payloads)
+
+    assert produce.call_args_list == [mocker.call(payloads[1]), mocker.call(payloads[2])]
+    assert "CQRS batch couldn't be published: 2 of 3 payload(s) are left." in caplog.text
+
+
 def test_produce_retry_on_error(rabbit_transport, mocker, caplog):
     caplog.set_level(logging.INFO)
     mocker.patch.object(
@@ -379,6 +423,20 @@ def test_produce_sync_message_queue(mocker):
     assert basic_publish_kwargs['routing_key'] == 'cqrs.queue.cqrs_id'
 
 
+def test_get_queue_depth(rabbit_transport, mocker):
+    connection = mocker.MagicMock(is_closed=False)
+    connection.channel.return_value.queue_declare.return_value.method.message_count = 7
+    mocker.patch('dj_cqrs.transport.rabbit_mq.BlockingConnection', return_value=connection)
+
+    assert rabbit_transport.get_queue_depth() == 7
+
+    connection.channel.return_value.queue_declare.assert_called_once_with(
+        'replica',
+        passive=True,
+    )
+    connection.close.assert_called_once()
+
+
 def test_consume_connection_error(rabbit_transport, mocker, caplog):
     mocker.patch.object(
         RabbitMQTransport,
@@ -398,7 +456,11 @@ def test_consume_ok(rabbit_transport, mocker):
     mocker.patch.object(
         RabbitMQTransport,
         '_get_consumer_rmq_objects',
-        return_value=(None, None, consumer_generator),
+        return_value=(
+            None,
+            mocker.MagicMock(**{'get_waiting_message_count.return_value': 0}),
+            consumer_generator,
+        ),
     )
     mocker.patch.object(
         RabbitMQTransport,
@@ -410,6 +472,283 @@ def test_consume_ok(rabbit_transport, mocker):
         rabbit_transport.consume()
 
 
+def test_consume_ready_callback(rabbit_transport, mocker):
+    ready_callback = mocker.MagicMock()
+
+    def consumer_generator():
+        # Consumer isn't registered until the generator is iterated
+        ready_callback.assert_not_called()
+        yield None, None, None
+        yield 1, None, None
+
+    mocker.patch.object(
+        RabbitMQTransport,
+        '_get_consumer_rmq_objects',
+        return_value=(
+            None,
+            mocker.MagicMock(**{'get_waiting_message_count.return_value': 0}),
+            consumer_generator(),
+        ),
+    )
+    mocker.patch.object(RabbitMQTransport, '_consume_message', db_error)
+
+    with pytest.raises(DatabaseError):
+        rabbit_transport.consume(ready_callback=ready_callback)
+
+    ready_callback.assert_called_once_with()
+
+
+def test_consume_batches_prefetched_messages(rabbit_transport, mocker):
+    consumer_generator = (
+        v for v in [(1, None, 'a'), (2, None, 'b'), (None, None, None), (3, None, 'c')]
+    )
+    channel = mocker.MagicMock()
+    channel.get_waiting_message_count.side_effect = [1, 0, 0]
+    mocker.patch.object(
+        RabbitMQTransport,
+        '_get_consumer_rmq_objects',
+        return_value=(None, channel, consumer_generator),
+    )
+    consume_messages_mock = mocker.patch.object(
+        RabbitMQTransport,
+        '_consume_messages',
+        side_effect=[None, DatabaseError],
+    )
+
+    with pytest.raises(DatabaseError):
+        rabbit_transport.consume()
+
+    assert consume_messages_mock.call_args_list[0] == mocker.call(
+        channel,
+        [(1, None, 'a'), (2, None, 'b')],
+        mocker.ANY,
+    )
+    assert consume_messages_mock.call_args_list[1] == mocker.call(
+        channel,
+        [(3, None, 'c')],
+        mocker.ANY,
+    )
+
+
+def test_consume_adapts_prefetch_count(rabbit_transport, settings, mocker):
+    settings.CQRS['replica']['CQRS_PREFETCH_TIME_BUDGET'] = 1
+    consumer_generator = (v for v in [(1, None, 'a'), (2, None, 'b')])
+    channel = mocker.MagicMock(**{'get_waiting_message_count.return_value': 0})
+    get_rmq_objects = mocker.patch.object(
+        RabbitMQTransport,
+        '_get_consumer_rmq_objects',
+        return_value=(None, channel, consumer_generator),
+    )
+    mocker.patch('dj_cqrs.transport.rabbit_mq.time.monotonic', side_effect=[0, 0.01, 1, 2])
+    consume_messages_mock = mocker.patch.object(
+        RabbitMQTransport,
+        '_consume_messages',
+        side_effect=[None, DatabaseError],
+    )
+
+    with pytest.raises(DatabaseError):
+        rabbit_transport.consume()
+
+    assert get_rmq_objects.call_args[0][-1] == 1
+    assert consume_messages_mock.call_count == 2
+    channel.basic_qos.assert_called_once_with(prefetch_count=100)
+
+
+def _delete_message(mocker, delivery_tag, pk, cqrs_id='basic'):
+    body = ujson.dumps(
+        {
+            'signal_type': SignalType.DELETE,
+            'cqrs_id': cqrs_id,
+            'instance_data': {'id': pk, 'cqrs_revision': 1, 'cqrs_updated': '2020-01-01'},
+            'instance_pk': pk,
+        },
+    )
+    return mocker.MagicMock(delivery_tag=delivery_tag), None, body
+
+
+def test_consume_messages_batches_deletes(mocker, caplog):
+    caplog.set_level(logging.INFO)
+    consume_deletes_mock = mocker.patch(
+        'dj_cqrs.controller.consumer.consume_deletes',
+        return_value=True,
+    )
+    consume_mock = mocker.patch('dj_cqrs.controller.consumer.consume', return_value=True)
+    channel = mocker.MagicMock()
+
+    PublicRabbitMQTransport.consume_messages(
+        channel,
+        [
+            _delete_message(mocker, 1, 1),
+            _delete_message(mocker, 2, 2),
+            (mocker.MagicMock(delivery_tag=3), None, '{bad_payload:'),
+            _delete_message(mocker, 4, 3),
+            _delete_message(mocker, 5, 1, cqrs_id='meta'),
+            _delete_message(mocker, 6, 4),
+        ],
+        DelayQueue(),
+    )
+
+    assert [c[0][0][0].pk for c in consume_deletes_mock.call_args_list] == [1]
+    assert [p.pk for p in consume_deletes_mock.call_args[0][0]] == [1, 2, 3]
+    assert [c[0][0].pk for c in consume_mock.call_args_list] == [1, 4]
+    assert [c[0][0] for c in channel.basic_ack.call_args_list] == [1, 2, 4, 5, 6]
+    assert channel.basic_reject.call_count == 1
+    assert 'CQRS is applied: pk = 3 (basic), correlation_id = None.' in caplog.text
+
+
+@pytest.mark.parametrize('consume_deletes', (lambda payloads: False, ValueError))
+def test_consume_messages_failed_batch(mocker, consume_deletes):
+    consume_deletes_mock = mocker.patch(
+        'dj_cqrs.controller.consumer.consume_deletes',
+        side_effect=consume_deletes,
+    )
+    consume_mock = mocker.patch(
+        'dj_cqrs.controller.consumer.consume',
+        side_effect=[True, None],
+    )
+    channel = mocker.MagicMock()
+    delay_queue = DelayQueue()
+
+    PublicRabbitMQTransport.consume_messages(
+        channel,
+        [_delete_message(mocker, 1, 1), _delete_message(mocker, 2, 2)],
+        delay_queue,
+    )
+
+    assert consume_deletes_mock.call_count == 1
+    assert consume_mock.call_count == 2
+    assert [c[0][0] for c in channel.basic_ack.call_args_list] == [1]
+    assert delay_queue.qsize() == 1
+
+
+def _batch_handled_message(mocker, delivery_tag, pk, ok=True):
+    body = ujson.dumps(
+        {
+            'signal_type': SignalType.SAVE,
+            'cqrs_id': 'batch_handled',
+            'instance_data': {'id': pk, 'ok': ok},
+            'instance_pk': pk,
+        },
+    )
+    return mocker.MagicMock(delivery_tag=delivery_tag), None, body
+
+
+def test_consume_messages_batch_handlers(mocker, caplog):
+    caplog.set_level(logging.INFO)
+    save_batch = mocker.spy(BatchHandledModel, 'cqrs_save_batch')
+    delete_batch = mocker.spy(BatchHandledModel, 'cqrs_delete_batch')
+    channel = mocker.MagicMock()
+    delay_queue = DelayQueue()
+
+    PublicRabbitMQTransport.consume_messages(
+        channel,
+        [
+            _batch_handled_message(mocker, 1, 1),
+            _batch_handled_message(mocker, 2, 2, ok=False),
+            _batch_handled_message(mocker, 3, 1),
+            _delete_message(mocker, 4, 3, cqrs_id='batch_handled'),
+            _delete_message(mocker, 5, 4, cqrs_id='batch_handled'),
+        ],
+        delay_queue,
+    )
+
+    assert [[item.pk for item in c[0][0]] for c in save_batch.call_args_list] == [[1, 2]]
+    assert [[item.pk for item in c[0][0]] for c in delete_batch.call_args_list] == [[3, 4]]
+    assert [c[0][0] for c in channel.basic_ack.call_args_list] == [1, 3, 4, 5]
+    assert delay_queue.qsize() == 1
+    assert delay_queue.get().payload.pk == 2
+    assert 'CQRS is applied: pk = 4 (batch_handled), correlation_id = None.' in caplog.text
+
+
+def test_consume_messages_batch_handlers_blocked_instance(mocker):
+    save_batch = mocker.spy(BatchHandledModel, 'cqrs_save_batch')
+    channel = mocker.MagicMock()
+    delay_queue = DelayQueue()
+
+    PublicRabbitMQTransport.consume_messages(
+        channel,
+        [
+            _batch_handled_message(mocker, 1, 1),
+            _batch_handled_message(mocker, 2, 2, ok=False),
+            _batch_handled_message(mocker, 3, 2),
+            _batch_handled_message(mocker, 4, 3),
+            _batch_handled_message(mocker, 5, 4),
+        ],
+        delay_queue,
+    )
+
+    assert [[item.pk for item in c[0][0]] for c in save_batch.call_args_list] == [
+        [1, 2],
+        [3, 4],
+    ]
+    assert [c[0][0] for c in channel.basic_ack.call_args_list] == [1, 4, 5]
+    assert delay_queue.parking_lot.size() == 1
+    assert delay_queue.get().payload.pk == 2
+
+
+def test_consume_messages_concurrently(mocker, settings):
+    settings.CQRS['replica']['CQRS_ASYNC_CONCURRENCY'] = 10
+    mocker.patch.object(AsyncHandledModel, 'max_running', 0)
+    consume_concurrently = mocker.spy(consumer, 'consume_concurrently')
+    channel = mocker.MagicMock()
+    delay_queue = DelayQueue()
+
+    messages = []
+    for delivery_tag, pk, ok in ((1, 1, True), (2, 2, False), (3, 3, True), (4, 1, True)):
+        body = ujson.dumps(
+            {
+                'signal_type': SignalType.SAVE,
+                'cqrs_id': 'async_handled',
+                'instance_data': {'id': pk, 'ok': ok},
+                'instance_pk': pk,
+            },
+        )
+        messages.append((mocker.MagicMock(delivery_tag=delivery_tag), None, body))
+
+    PublicRabbitMQTransport.consume_messages(channel, messages, delay_queue)
+
+    assert [[p.pk for p in c[0][0]] for c in consume_concurrently.call_args_list] == [[1, 2, 3]]
+    assert AsyncHandledModel.max_running == 3
+    assert [c[0][0] for c in channel.basic_ack.call_args_list] == [1, 3, 4]
+    assert delay_queue.get().payload.pk == 2
+
+
+def test_consume_messages_concurrently_blocked_instance(mocker, settings):
+    settings.CQRS['replica']['CQRS_ASYNC_CONCURRENCY'] = 10
+    consume_concurrently = mocker.spy(consumer, 'consume_concurrently')
+    channel = mocker.MagicMock()
+    delay_queue = DelayQueue()
+
+    messages = []
+    for delivery_tag, pk, ok in ((1, 1, False), (2, 2, True), (3, 1, True), (4, 3, True)):
+        body = ujson.dumps(
+            {
+                'signal_type': SignalType.SAVE,
+                'cqrs_id': 'async_handled',
+                'instance_data': {'id': pk, 'ok': ok},
+                'instance_pk': pk,
+            },
+        )
+        messages.append((mocker.MagicMock(delivery_tag=delivery_tag), None, body))
+
+    PublicRabbitMQTransport.consume_messages(channel, messages, delay_queue)
+
+    assert [[p.pk for p in c[0][0]] for c in consume_concurrently.call_args_list] == [[1, 2]]
+    assert [c[0][0] for c in channel.basic_ack.call_args_list] == [2, 4]
+    assert delay_queue.parking_lot.size() == 1
+    assert delay_queue.get().payload.pk == 1
+
+
+def test_consume_messages_single_message(mocker):
+    consume_message_mock = mocker.patch.object(RabbitMQTransport, '_consume_message')
+    channel = mocker.MagicMock()
+    message = _delete_message(mocker, 1, 1)
+
+    PublicRabbitMQTransport.consume_messages(channel, [message], None)
+
+    consume_message_mock.assert_called_once_with(channel, *message, None)
+
+
 def test_consume_message_ack(mocker, caplog):
     caplog.set_level(logging.INFO)
     consumer_mock = mocker.patch('dj_cqrs.controller.consumer.consume')
@@ -421,7 +760,7 @@ def test_consume_message_ack(mocker, caplog):
         '{"signal_type":"signal","cqrs_id":"cqrs_id","instance_data":{},'
         '"instance_pk":1, "previous_data":{}, "correlation_id":"abc",'
         '"expires":"2100-01-01T00:00:00+00:00", "retries":1}',
-        mocker.MagicMock(),
+        DelayQueue(),
     )
 
     assert consumer_mock.call_count == 1
@@ -451,7 +790,7 @@ def test_consume_message_nack(mocker, caplog):
         '{"signal_type":"signal","cqrs_id":"basic","instance_data":{},'
         '"instance_pk":1,"previous_data":null,'
         '"expires":"2100-01-01T00:00:00+00:00", "retries":0}',
-        mocker.MagicMock(),
+        DelayQueue(),
     )
 
     assert 'CQRS is received: pk = 1 (basic), correlation_id = None.' in caplog.text
@@ -585,6 +924,257 @@ def test_fail_message_invalid_model(mocker, caplog):
     assert 'Model for cqrs_id not_existing is not found.' in caplog.text
 
 
+def test_fail_message_blocks_instance(mocker):
+    mocker.patch.object(
+        BasicFieldsModelRef,
+        'get_cqrs_dependencies',
+        return_value=[('author', 5)],
+    )
+    payload = TransportPayload(SignalType.SAVE, 'basic', {'id': 1}, 1)
+    delay_queue = DelayQueue()
+
+    PublicRabbitMQTransport.fail_message(mocker.MagicMock(), 100, payload, None, delay_queue)
+
+    assert delay_queue.parking_lot.is_blocked(('basic', 1))
+    assert delay_queue.parking_lot.pop_dependants(('author', 5)) == {100}
+
+
+def _save_message(mocker, delivery_tag, pk, cqrs_id='basic'):
+    body = ujson.dumps(
+        {
+            'signal_type': SignalType.SAVE,
+            'cqrs_id': cqrs_id,
+            'instance_data': {'id': pk},
+            'instance_pk': pk,
+        },
+    )
+    return mocker.MagicMock(delivery_tag=delivery_tag), None, body
+
+
+def test_consume_message_parked_until_requeue(mocker, caplog):
+    caplog.set_level(logging.INFO)
+    consume_mock = mocker.patch(
+        'dj_cqrs.controller.consumer.consume',
+        side_effect=[None, True, True],
+    )
+    produce_mock = mocker.patch('dj_cqrs.transport.rabbit_mq.RabbitMQTransport.produce')
+    channel = mocker.MagicMock()
+    delay_queue = DelayQueue()
+
+    for delivery_tag, pk in ((1, 1), (2, 1), (3, 2), (4, 1)):
+        PublicRabbitMQTransport.consume_message(
+            channel,
+            *_save_message(mocker, delivery_tag, pk),
+            delay_queue,
+        )
+
+    assert [c[0][0].pk for c in consume_mock.call_args_list] == [1, 2]
+    assert delay_queue.parking_lot.size() == 2
+    assert 'CQRS is parked: pk = 1 (basic), correlation_id = None.' in caplog.text
+
+    delay_queue.release({1})
+    PublicRabbitMQTransport.process_delay_messages(channel, delay_queue)
+
+    assert not delay_queue.parking_lot.is_blocked(('basic', 1))
+    assert [c[0][0] for c in channel.basic_nack.call_args_list] == [1, 2, 4]
+    produced_payloads = [c[0][0] for c in produce_mock.call_args_list]
+    assert [(p.pk, p.retries, p.is_requeue) for p in produced_payloads] == [
+        (1, 1, True),
+        (1, 0, True),
+        (1, 0, True),
+    ]
+    assert 'CQRS is unparked: pk = 1 (basic), correlation_id = None.' in caplog.text
+
+
+def test_consume_message_releases_dependants(mocker):
+    mocker.patch('dj_cqrs.controller.consumer.consume', return_value=True)
+    delay_queue = DelayQueue()
+    delay_queue.put(
+        DelayMessage(
+            delivery_tag=1,
+            payload=TransportPayload(SignalType.SAVE, 'basic', {'id': 1}, 1),
+            eta=datetime.now(tz=timezone.utc) + timedelta(hours=1),
+        ),
+    )
+    delay_queue.parking_lot.block(('basic', 1), 1, dependencies=[('author', 5)])
+
+    PublicRabbitMQTransport.consume_message(
+        mocker.MagicMock(),
+        *_save_message(mocker, 2, 5, cqrs_id='author'),
+        delay_queue,
+    )
+
+    assert [m.delivery_tag for m in delay_queue.get_ready()] == [1]
+
+
+def test_delay_message_with_requeue_unparks(mocker):
+    produce_mock = mocker.patch('dj_cqrs.transport.rabbit_mq.RabbitMQTransport.produce')
+    channel = mocker.MagicMock()
+    payload = TransportPayload(SignalType.SAVE, 'basic', {'id': 1}, 1)
+    parked_payload = TransportPayload(SignalType.SAVE, 'basic', {'id': 1}, 1)
+
+    delay_queue = DelayQueue(max_size=1)
+    delay_queue.put(DelayMessage(1, payload, datetime.now(tz=timezone.utc)))
+    delay_queue.parking_lot.block(('basic', 1), 1)
+    delay_queue.parking_lot.park(('basic', 1), 2, parked_payload)
+
+    PublicRabbitMQTransport.delay_message(
+        channel,
+        3,
+        TransportPayload(SignalType.SAVE, 'basic', {'id': 2}, 2),
+        0,
+        delay_queue,
+    )
+
+    assert [c[0][0] for c in produce_mock.call_args_list] == [payload, parked_payload]
+    assert delay_queue.parking_lot.size() == 0
+
+
+def _revision_message(mocker, delivery_tag, revision):
+    body = ujson.dumps(
+        {
+            'signal_type': SignalType.SAVE,
+            'cqrs_id': 'basic',
+            'instance_data': {'id': 1, 'cqrs_revision': revision},
+            'instance_pk': 1,
+        },
+    )
+    return mocker.MagicMock(delivery_tag=delivery_tag), None, body
+
+
+def test_consume_message_reorders_revision_gaps(settings, mocker, caplog):
+    caplog.set_level(logging.INFO)
+    metrics.reset_counters()
+    settings.CQRS['replica']['CQRS_REORDER_WINDOW'] = 5
+    consume_mock = mocker.patch(
+        'dj_cqrs.controller.consumer.consume',
+        side_effect=[RevisionGapError('basic', 1, 3, 2), True, True],
+    )
+    channel = mocker.MagicMock()
+    delay_queue = DelayQueue()
+
+    PublicRabbitMQTransport.consume_message(channel, *_revision_message(mocker, 1, 3), delay_queue)
+
+    assert delay_queue.reorder_buffer.qsize() == 1
+    assert channel.basic_ack.call_count == 0
+    assert channel.basic_nack.call_count == 0
+    assert 'CQRS is buffered: pk = 1 (basic), correlation_id = None' in caplog.text
+
+    PublicRabbitMQTransport.consume_message(channel, *_revision_message(mocker, 2, 2), delay_queue)
+
+    assert [c[0][0].instance_data['cqrs_revision'] for c in consume_mock.call_args_list] == [
+        3,
+        2,
+        3,
+    ]
+    assert [c[0][0] for c in channel.basic_ack.call_args_list] == [2, 1]
+    assert delay_queue.reorder_buffer.qsize() == 0
+    assert metrics.get_counter(metrics.REPLICA_REORDER_BUFFERED) == 1
+    assert metrics.get_counter(metrics.REPLICA_REORDER_EXPIRED) == 0
+
+
+def test_consume_message_delete_drops_superseded_buffered_messages(settings, mocker, caplog):
+    caplog.set_level(logging.INFO)
+    settings.CQRS['replica']['CQRS_REORDER_WINDOW'] = 5
+    consume_mock = mocker.patch(
+        'dj_cqrs.controller.consumer.consume',
+        side_effect=[
+            RevisionGapError('basic', 1, 3, 2),
+            RevisionGapError('basic', 1, 5, 2),
+            True,
+            True,
+        ],
+    )
+    channel = mocker.MagicMock()
+    delay_queue = DelayQueue()
+
+    PublicRabbitMQTransport.consume_message(channel, *_revision_message(mocker, 1, 3), delay_queue)
+    PublicRabbitMQTransport.consume_message(channel, *_revision_message(mocker, 2, 5), delay_queue)
+    assert delay_queue.reorder_buffer.qsize() == 2
+
+    delete_body = ujson.dumps(
+        {
+            'signal_type': SignalType.DELETE,
+            'cqrs_id': 'basic',
+            'instance_data': {'id': 1, 'cqrs_revision': 4},
+            'instance_pk': 1,
+        },
+    )
+    PublicRabbitMQTransport.consume_message(
+        channel,
+        mocker.MagicMock(delivery_tag=3),
+        None,
+        delete_body,
+        delay_queue,
+    )
+
+    assert [c[0][0].signal_type for c in consume_mock.call_args_list] == [
+        SignalType.SAVE,
+        SignalType.SAVE,
+        SignalType.DELETE,
+        SignalType.SAVE,
+    ]
+    assert consume_mock.call_args[0][0].instance_data['cqrs_revision'] == 5
+    assert [c[0][0] for c in channel.basic_ack.call_args_list] == [3, 1, 2]
+    assert delay_queue.reorder_buffer.qsize() == 0
+    assert 'CQRS is superseded by delete: pk = 1 (basic), correlation_id = None' in caplog.text
+
+
+def test_consume_message_reorder_window_expired(settings, mocker):
+    metrics.reset_counters()
+    settings.CQRS['replica']['CQRS_REORDER_WINDOW'] = 5
+    buffering_flags = []
+
+    def consume(payload):
+        buffering_flags.append(is_buffering_revision_gaps())
+        if buffering_flags[-1]:
+            raise RevisionGapError('basic', 1, 3, 2)
+
+        return True
+
+    mocker.patch('dj_cqrs.controller.consumer.consume', side_effect=consume)
+    channel = mocker.MagicMock()
+    delay_queue = DelayQueue()
+
+    PublicRabbitMQTransport.consume_message(channel, *_revision_message(mocker, 1, 3), delay_queue)
+    PublicRabbitMQTransport.process_delay_messages(channel, delay_queue)
+    assert delay_queue.reorder_buffer.qsize() == 1
+
+    mocker.patch(
+        'django.utils.timezone.now',
+        return_value=datetime.now(tz=timezone.utc) + timedelta(seconds=10),
+    )
+    PublicRabbitMQTransport.process_delay_messages(channel, delay_queue)
+
+    assert buffering_flags == [True, False]
+    assert [c[0][0] for c in channel.basic_ack.call_args_list] == [1]
+    assert delay_queue.reorder_buffer.qsize() == 0
+    assert metrics.get_counter(metrics.REPLICA_REORDER_EXPIRED) == 1
+
+
+@pytest.mark.parametrize('window, buffer_size', ((0, 10), (5, 1)))
+def test_consume_message_without_reordering(settings, mocker, window, buffer_size):
+    settings.CQRS['replica']['CQRS_REORDER_WINDOW'] = window
+    buffering_flags = []
+    mocker.patch(
+        'dj_cqrs.controller.consumer.consume',
+        side_effect=lambda payload: buffering_flags.append(is_buffering_revision_gaps()) or True,
+    )
+    delay_queue = DelayQueue(reorder_buffer_size=buffer_size)
+    delay_queue.reorder_buffer.put(
+        ('basic', 2),
+        DelayMessage(10, None, datetime.now(tz=timezone.utc) + timedelta(hours=1)),
+    )
+
+    PublicRabbitMQTransport.consume_message(
+        mocker.MagicMock(),
+        *_revision_message(mocker, 1, 3),
+        delay_queue,
+    )
+
+    assert buffering_flags == [False]
+
+
 def test_get_produced_message_routing_key_dead_letter(settings):
     settings.CQRS['replica']['dead_letter_queue'] = 'dead_letter_replica'
     payload = TransportPayload(SignalType.SYNC, 'CQRS_ID', {}, None)
@@ -605,6 +1195,14 @@ def test_get_produced_message_routing_key_requeue(settings):
     assert routing_key == 'cqrs.replica.CQRS_ID'
 
 
+def test_get_produced_message_routing_key_resync():
+    payload = TransportPayload(SignalType.RESYNC, 'CQRS_ID', {'pks': [1]}, None, queue='replica')
+
+    routing_key = PublicRabbitMQTransport.get_produced_message_routing_key(payload)
+
+    assert routing_key == 'cqrs_resync.CQRS_ID'
+
+
 def test_process_delay_messages(mocker, caplog):
     channel = mocker.MagicMock()
     produce = mocker.patch('dj_cqrs.transport.rabbit_mq.RabbitMQTransport.produce')
@@ -14,12 +14,14 @@ from django.db import transaction
 
 from dj_cqrs.state import cqrs_state
 from dj_cqrs.utils import (
+    ConnectionsHealthCheck,
     apply_query_timeouts,
     bulk_relate_cqrs_serialization,
     get_delay_queue_max_size,
     get_json_valid_value,
     get_message_expiration_dt,
     get_messages_prefetch_count_per_worker,
+    supports_update_returning,
 )
 from tests.dj_master import models as master_models
 from tests.dj_replica import models
@@ -115,6 +117,78 @@ def test_apply_query_timeouts(settings, engine, p_count):
     assert p.call_count == p_count
 
 
+def test_apply_query_timeouts_once_per_connection(settings, mocker):
+    settings.CQRS['replica']['CQRS_QUERY_TIMEOUT'] = 1
+    conn = mocker.MagicMock(vendor='postgresql', in_atomic_block=False, _cqrs_query_timeout=None)
+    mocker.patch('dj_cqrs.utils.transaction.get_connection', return_value=conn)
+    capturer_mock = mocker.patch('dj_cqrs.utils.install_last_query_capturer')
+
+    apply_query_timeouts(models.BasicFieldsModelRef)
+    apply_query_timeouts(models.BasicFieldsModelRef)
+    assert conn.cursor.call_count == 1
+
+    conn.connection = mocker.MagicMock()
+    apply_query_timeouts(models.BasicFieldsModelRef)
+    assert conn.cursor.call_count == 2
+
+    settings.CQRS['replica']['CQRS_QUERY_TIMEOUT'] = 2
+    apply_query_timeouts(models.BasicFieldsModelRef)
+    assert conn.cursor.call_count == 3
+    assert capturer_mock.call_count == 3
+
+
+def test_apply_query_timeouts_in_atomic_block(settings, mocker):
+    settings.CQRS['replica']['CQRS_QUERY_TIMEOUT'] = 1
+    conn = mocker.MagicMock(vendor='mysql', in_atomic_block=True, _cqrs_query_timeout=None)
+    mocker.patch('dj_cqrs.utils.transaction.get_connection', return_value=conn)
+    mocker.patch('dj_cqrs.utils.install_last_query_capturer')
+
+    apply_query_timeouts(models.BasicFieldsModelRef)
+    apply_query_timeouts(models.BasicFieldsModelRef)
+
+    assert conn.cursor.call_count == 2
+
+
+def test_connections_health_check_by_messages(settings, mocker):
+    settings.CQRS['replica']['CQRS_CONNECTION_CHECK_MESSAGES'] = 3
+    close_mock = mocker.patch('dj_cqrs.utils.close_old_connections')
+    health_check = ConnectionsHealthCheck()
+
+    assert [health_check.check() for _ in range(5)] == [True, False, False, True, False]
+    assert close_mock.call_count == 2
+
+
+def test_connections_health_check_by_interval(settings, mocker):
+    settings.CQRS['replica']['CQRS_CONNECTION_CHECK_INTERVAL'] = 5
+    mocker.patch('dj_cqrs.utils.time.monotonic', side_effect=[0, 4, 5])
+    close_mock = mocker.patch('dj_cqrs.utils.close_old_connections')
+    health_check = ConnectionsHealthCheck()
+
+    assert [health_check.check() for _ in range(3)] == [True, False, True]
+    assert close_mock.call_count == 2
+
+
+def test_connections_health_check_invalidate(mocker):
+    close_mock = mocker.patch('dj_cqrs.utils.close_old_connections')
+    health_check = ConnectionsHealthCheck()
+
+    health_check.check()
+    health_check.invalidate()
+
+    assert health_check.check() is True
+    assert close_mock.call_count == 2
+
+
+@pytest.mark.parametrize('interval, messages', ((0, 100), (10, 0)))
+def test_connections_health_check_every_message(settings, mocker, interval, messages):
+    settings.CQRS['replica']['CQRS_CONNECTION_CHECK_INTERVAL'] = interval
+    settings.CQRS['replica']['CQRS_CONNECTION_CHECK_MESSAGES'] = messages
+    mocker.patch('dj_cqrs.utils.close_old_connections')
+    health_check = ConnectionsHealthCheck()
+
+    assert [health_check.check() for _ in range(3)] == [True, True, True]
+
+
 @pytest.mark.django_db(transaction=True)
 def test_bulk_relate_cqrs_serialization_simple_model(mocker):
     produce_mock = mocker.patch('dj_cqrs.controller.producer.produce')
@@ -237,3 +311,20 @@ def test_bulk_relate_cqrs_serialization_get_cached_instance(mocker, django_asser
             assert bulk_relate_cm.get_cached_instance(af) is None
 
     assert cqrs_state.bulk_relate_cm is None
+
+
+@pytest.mark.parametrize(
+    'vendor, sqlite_version, result',
+    (
+        ('postgresql', None, True),
+        ('mysql', None, False),
+        ('oracle', None, False),
+        ('sqlite', (3, 34, 1), False),
+        ('sqlite', (3, 35, 0), True),
+    ),
+)
+def test_supports_update_returning(mocker, vendor, sqlite_version, result):
+    connection = mocker.MagicMock(vendor=vendor)
+    connection.Database.sqlite_version_info = sqlite_version
+
+    assert supports_update_returning(connection) is result
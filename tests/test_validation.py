@@ -334,3 +334,29 @@ def test_replica_delay_queue_max_size_deprecated_parameter(cqrs_settings):
     validate_settings(cqrs_settings)
 
     assert cqrs_settings.CQRS['replica']['delay_queue_max_size'] == 200
+
+
+def test_replica_shard_router_from_string(cqrs_settings):
+    cqrs_settings.CQRS['replica'] = {'CQRS_SHARD_ROUTER': 'tests.utils.db_error'}
+
+    validate_settings(cqrs_settings)
+
+    assert callable(cqrs_settings.CQRS['replica']['CQRS_SHARD_ROUTER'])
+
+
+def test_replica_shard_router_is_non_importable_from_string(cqrs_settings):
+    cqrs_settings.CQRS['replica'] = {'CQRS_SHARD_ROUTER': 'random.stuff'}
+
+    with pytest.raises(AssertionError) as e:
+        validate_settings(cqrs_settings)
+
+    assert str(e.value) == 'CQRS replica CQRS_SHARD_ROUTER import error.'
+
+
+def test_replica_shard_router_is_not_callable(cqrs_settings):
+    cqrs_settings.CQRS['replica'] = {'CQRS_SHARD_ROUTER': 1}
+
+    with pytest.raises(AssertionError) as e:
+        validate_settings(cqrs_settings)
+
+    assert str(e.value) == 'CQRS replica CQRS_SHARD_ROUTER must be callable.'